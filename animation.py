@@ -0,0 +1,143 @@
+# animation.py
+from __future__ import annotations
+import os, time
+from typing import Callable, Optional
+
+from PySide6.QtCore import QEasingCurve, QObject, Qt, QTimer
+from PySide6.QtWidgets import QGraphicsOpacityEffect, QLabel, QWidget
+
+# ---------------- Tween ----------------
+
+class Tween:
+    def __init__(self, duration_ms: int, on_update: Callable[[float], None],
+                 on_finish: Optional[Callable[[], None]] = None,
+                 easing: QEasingCurve.Type = QEasingCurve.InOutCubic, key=None):
+        self.duration = max(1, duration_ms) / 1000
+        self.on_update = on_update
+        self.on_finish = on_finish
+        self.curve = QEasingCurve(easing)
+        self.key = key
+        self.start = 0.0
+
+    def step(self, now: float) -> bool:
+        """Fortschritt anwenden; True, wenn fertig."""
+        p = min(1.0, (now - self.start) / self.duration)
+        self.on_update(self.curve.valueForProgress(p))
+        if p >= 1.0:
+            self.finish(apply=False)
+            return True
+        return False
+
+    def finish(self, apply: bool = True):
+        if apply:
+            self.on_update(1.0)
+        if self.on_finish:
+            self.on_finish()
+
+# ---------------- Frame clock ----------------
+
+class FrameClock(QObject):
+    """Ein gemeinsamer Timer für alle laufenden Zähler und Überblendungen.
+
+    Läuft nur, solange Tweens aktiv sind – im Leerlauf gibt es keine Timer-Events.
+    Mit reduced_motion springen Tweens sofort auf den Endwert.
+    """
+
+    def __init__(self, interval_ms: int = 16, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.reduced_motion = os.getenv("DA_REDUCED_MOTION") == "1"
+        self._tweens: list[Tween] = []
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._tick)
+
+    def add(self, tween: Tween) -> Tween:
+        if tween.key is not None:
+            self.cancel(tween.key)
+        if self.reduced_motion:
+            self._safe(tween.finish)
+            return tween
+        tween.start = time.monotonic()
+        self._tweens.append(tween)
+        if not self._timer.isActive():
+            self._timer.start()
+        return tween
+
+    def cancel(self, key, finish: bool = False):
+        for t in [t for t in self._tweens if t.key == key]:
+            self._tweens.remove(t)
+            if finish:
+                self._safe(t.finish)
+        self._stop_if_idle()
+
+    def active(self) -> int:
+        return len(self._tweens)
+
+    def is_running(self) -> bool:
+        return self._timer.isActive()
+
+    @staticmethod
+    def _safe(fn, *args) -> bool:
+        try:
+            fn(*args)
+            return True
+        except RuntimeError:
+            # Ziel-Widget wurde inzwischen gelöscht
+            return False
+
+    def _tick(self):
+        now = time.monotonic()
+        for t in list(self._tweens):
+            done = True
+            try:
+                done = t.step(now)
+            except RuntimeError:
+                pass
+            if done and t in self._tweens:
+                self._tweens.remove(t)
+        self._stop_if_idle()
+
+    def _stop_if_idle(self):
+        if not self._tweens and self._timer.isActive():
+            self._timer.stop()
+
+
+_clock: Optional[FrameClock] = None
+
+def clock() -> FrameClock:
+    global _clock
+    if _clock is None:
+        _clock = FrameClock()
+    return _clock
+
+# ---------------- Helfer ----------------
+
+def animate_number(label: QLabel, target: int, duration_ms: int = 700) -> Tween:
+    try:
+        start = int(label.text())
+    except ValueError:
+        start = 0
+
+    def update(p: float):
+        label.setText(str(target if p >= 1.0 else int(start + (target - start) * p)))
+
+    return clock().add(Tween(duration_ms, update, easing=QEasingCurve.Linear, key=(id(label), "number")))
+
+def fade_in(widget: QWidget, duration_ms: int = 200) -> Optional[Tween]:
+    """Blendet ein Widget ein und entfernt den Opacity-Effekt danach wieder."""
+    key = (id(widget), "fade")
+    clock().cancel(key)
+    if clock().reduced_motion:
+        widget.setGraphicsEffect(None)
+        return None
+    eff = QGraphicsOpacityEffect(widget)
+    eff.setOpacity(0.0)
+    widget.setGraphicsEffect(eff)
+
+    def done():
+        # Ohne Effekt rendert das Widget wieder direkt statt über einen Offscreen-Puffer
+        if widget.graphicsEffect() is eff:
+            widget.setGraphicsEffect(None)
+
+    return clock().add(Tween(duration_ms, eff.setOpacity, on_finish=done, key=key))
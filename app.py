@@ -1,11 +1,23 @@
 # app.py (bereinigt, konsistente 4 Leerzeichen, QDialog.Accepted)
 import os
 import sys
+import time
 import ctypes
+import json
+import multiprocessing
 from pathlib import Path
 
-from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QIcon, QPixmap, QGuiApplication
+# Startup-Benchmark (bench_startup.py): Phasen-Zeitstempel ab Prozessstart
+_BENCH_OUT = os.getenv("DA_STARTUP_BENCH")     # Zieldatei oder "-" für stdout
+_marks = [("spawn", float(os.getenv("DA_STARTUP_T0") or time.time())), ("interpreter", time.time())]
+
+def _mark(phase: str):
+    # Nur der erste Durchlauf zählt (Re-Login erzeugt keine neuen Phasen)
+    if _BENCH_OUT and all(p != phase for p, _ in _marks):
+        _marks.append((phase, time.time()))
+
+from PySide6.QtCore import QEvent, QObject, Qt, QTimer, Signal
+from PySide6.QtGui import QIcon, QGuiApplication
 from PySide6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -16,29 +28,38 @@ from PySide6.QtWidgets import (
     QPushButton,
     QTabWidget,
     QGraphicsDropShadowEffect,
-    QSplashScreen,
     QMessageBox,
-    QDialog,
+    QSplashScreen,
 )
 
-from login_dialog import LoginDialog
+import tracing
+from tracing import span, traced
+import asset_cache
+import stall_watchdog
+from page_registry import PageRegistry
+from clients_page import ClientsPage
+from dashboard_page import DashboardPage
+from domains_page import DomainsPage
+from invoices_page import InvoicesPage
+from search_box import SearchBox
+from session import SessionManager
+from startup import Startup
+from theme import STUDIO_ACCENT, engine as theme_engine
+from data_store import data_store
+from workers import data_pool, submit
 from auth import (
     app_data_dir,
+    bootstrap_admin,
     load_config,
-    save_config,
-    load_users,
-    ensure_default_admin,
-    verify_token,
+    check_remember_token,
 )
 
+_mark("imports")
+
 APP_NAME = "Digitale Alchemy Studio"
 APP_DIR = Path(__file__).resolve().parent
 ASSETS = APP_DIR / "assets"
 
-ACCENT = "#A8FF00"
-ACCENT2 = "#21C7F7"
-BG_DARK = "#0E1116"
-
 
 def set_windows_appid(appid: str):
     try:
@@ -47,7 +68,16 @@ def set_windows_appid(appid: str):
         pass
 
 
+_app_icon = None
+
 def load_app_icon() -> QIcon:
+    global _app_icon
+    if _app_icon is None:
+        _app_icon = _build_app_icon()
+    return _app_icon
+
+
+def _build_app_icon() -> QIcon:
     ico = ASSETS / "app_icon.ico"
     if ico.exists():
         return QIcon(str(ico))
@@ -59,26 +89,10 @@ def load_app_icon() -> QIcon:
     return icon
 
 
-def stylesheet() -> str:
-    return f"""
-    QWidget {{
-        background: {BG_DARK};
-        color: #E8F0F2;
-        font-family: 'Segoe UI', 'Inter', 'Roboto', sans-serif;
-        font-size: 13px;
-    }}
-    QTabBar::tab {{ padding: 8px 14px; border-bottom: 2px solid transparent; color: #CFE6D4; }}
-    QTabBar::tab:selected {{ color: white; border-color: {ACCENT}; }}
-    QPushButton {{
-        background: qlineargradient(x1:0,y1:0,x2:1,y2:0, stop:0 {ACCENT}, stop:1 {ACCENT2});
-        border: none; color: #081015; padding: 10px 14px; border-radius: 8px; font-weight: 600;
-    }}
-    QPushButton:hover {{ filter: brightness(1.06); }}
-    QLineEdit, QComboBox, QTextEdit {{ background: #141923; border: 1px solid #243041; border-radius: 6px; padding: 8px 10px; }}
-    """
-
-
 class MainWindow(QMainWindow):
+    logoutRequested = Signal()
+
+    @traced("app.MainWindow.__init__")
     def __init__(self, username: str = "unbekannt"):
         super().__init__()
         self.username = username
@@ -96,11 +110,11 @@ class MainWindow(QMainWindow):
         fallback_plain = ASSETS / "logo_transparent.png"
 
         if banner_path.exists():
-            banner = QPixmap(str(banner_path))
+            banner = asset_cache.pixmap(banner_path.name)
         elif fallback_glow.exists():
-            banner = QPixmap(str(fallback_glow)).scaledToHeight(140, Qt.SmoothTransformation)
+            banner = asset_cache.pixmap(fallback_glow.name, 140)
         else:
-            banner = QPixmap(str(fallback_plain)).scaledToHeight(120, Qt.SmoothTransformation)
+            banner = asset_cache.pixmap(fallback_plain.name, 120)
 
         banner_label.setPixmap(banner)
         banner_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
@@ -109,6 +123,8 @@ class MainWindow(QMainWindow):
         banner_label.setGraphicsEffect(shadow)
 
         actions = QHBoxLayout()
+        self.search = SearchBox()
+        actions.addWidget(self.search)
         user_lbl = QLabel(f"Angemeldet: <b>{self.username}</b>")
         btn_logout = QPushButton("Logout")
         actions.addWidget(user_lbl)
@@ -121,10 +137,13 @@ class MainWindow(QMainWindow):
 
         # Tabs
         tabs = QTabWidget()
-        tabs.addTab(QWidget(), "Dashboard")
-        tabs.addTab(QWidget(), "Kunden")
-        tabs.addTab(QWidget(), "Rechnungen")
-        tabs.addTab(QWidget(), "Domains")
+        self.pages = PageRegistry(tabs, memory_budget_mb=load_config().get("page_memory_budget_mb"))
+        self.pages.register("Dashboard", DashboardPage, prefetch=True)
+        self.pages.register("Kunden", ClientsPage)
+        self.pages.register("Rechnungen", InvoicesPage, prefetch=True)
+        self.pages.register("Domains", DomainsPage, prefetch=True)
+        self.pages.show(0)
+        self.pages.prefetch_idle()
 
         root = QWidget()
         layout = QVBoxLayout(root)
@@ -134,23 +153,31 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(root)
         self.resize(1240, 780)
 
+        self._lookup = None
         btn_logout.clicked.connect(self.logout)
+        self.search.resultActivated.connect(self.open_search_result)
+
+    def open_search_result(self, kind: str, ref: int, title: str):
+        index = {"client": 1, "invoice": 2, "domain": 3}.get(kind)
+        if index is None:
+            return
+        page = self.pages.show(index)
+        if kind == "client" and isinstance(page, ClientsPage):
+            # Kd.-Nr. über die id statt aus dem Titel (kann leer sein)
+            self._lookup = submit(lambda: data_store().client_number(ref), pool=data_pool(),
+                                  on_done=lambda number: number and page.filter.setText(number))
 
     def logout(self):
-        cfg = load_config()
-        cfg.pop("remember_user", None)
-        cfg.pop("remember_token", None)
-        save_config(cfg)
-        QMessageBox.information(self, "Logout", "Du wurdest abgemeldet. Die App wird neu gestartet.")
-        python = sys.executable
-        os.execl(python, python, *sys.argv)
+        # Abbau + neuer Login im selben Prozess (session.SessionManager)
+        self.logoutRequested.emit()
 
 
+@traced("app.show_splash")
 def show_splash():
     splash_img = ASSETS / "logo_glow.png"
     if not splash_img.exists():
         return None
-    pix = QPixmap(str(splash_img)).scaledToHeight(260, Qt.SmoothTransformation)
+    pix = asset_cache.pixmap(splash_img.name, 260)
     splash = QSplashScreen(pix, Qt.WindowStaysOnTopHint)
     splash.setMask(pix.mask())
     splash.showMessage("Lade Module …", Qt.AlignHCenter | Qt.AlignBottom, Qt.white)
@@ -158,6 +185,7 @@ def show_splash():
     return splash
 
 
+@traced("app.try_auto_login")
 def try_auto_login() -> str | None:
     if os.getenv("DA_DEV") == "1":
         return "dev"
@@ -166,45 +194,133 @@ def try_auto_login() -> str | None:
     t = cfg.get("remember_token")
     if not u or not t:
         return None
-    users = ensure_default_admin(load_users())
-    return u if verify_token(users, u, t) else None
+    return u if check_remember_token(u, t) else None
+
+
+def _write_startup_report(relogin_ms: list):
+    """Bench-Modus: Phasendauern als JSON ausgeben und sofort beenden."""
+    phases = {name: round((t - _marks[i][1]) * 1000, 2) for i, (name, t) in enumerate(_marks[1:])}
+    report = {"phases_ms": phases, "total_ms": round((_marks[-1][1] - _marks[0][1]) * 1000, 2),
+              "relogin_ms": relogin_ms, "frozen": bool(getattr(sys, "frozen", False)), "pid": os.getpid()}
+    data = json.dumps(report)
+    if _BENCH_OUT == "-":
+        print(data, flush=True)
+    else:
+        Path(_BENCH_OUT).write_text(data, encoding="utf-8")
+    # Teardown gehört nicht zur Messung
+    os._exit(0)
+
+
+class _StartupBench(QObject):
+    """Bench-Modus: erster Paint jedes Hauptfensters, danach optional
+    DA_BENCH_RELOGIN Logout/Login-Zyklen (Logout -> erster Paint)."""
+
+    def __init__(self, session: SessionManager):
+        super().__init__(session)
+        self.session = session
+        self.cycles = int(os.getenv("DA_BENCH_RELOGIN") or 0)
+        self.relogin_ms: list[float] = []
+        self._t0: float | None = None
+        session.windowShown.connect(lambda win: win.installEventFilter(self))
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            if self._t0 is None:
+                _mark("first_paint")
+            else:
+                self.relogin_ms.append(round((time.time() - self._t0) * 1000, 2))
+            QTimer.singleShot(0, self._next)
+        return False
+
+    def _next(self):
+        if len(self.relogin_ms) < self.cycles:
+            self._t0 = time.time()
+            self.session.logout()
+        else:
+            _write_startup_report(self.relogin_ms)
 
 
 def main():
-    QGuiApplication.setHighDpiScaleFactorRoundingPolicy(
-        Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
-    )
-    QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
-    QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
-    set_windows_appid("de.digitalealchemie.studio")
-
-    app = QApplication(sys.argv)
-    app.setApplicationName(APP_NAME)
-    app.setWindowIcon(load_app_icon())
-    app.setStyleSheet(stylesheet())
-
-    splash = show_splash()
-
-    # --- Login-Flow ---
-    username = try_auto_login()
-    if not username:
-        dlg = LoginDialog()
-        # Splash sichtbar lassen, aber darunter
-        if dlg.exec() != QDialog.Accepted:
-            # Abbruch -> App beenden
-            sys.exit(0)
-        username = getattr(dlg, "username", "unbekannt")
-
-    win = MainWindow(username=username)
-
-    def _show():
-        if splash:
-            splash.finish(win)
-        win.show()
-
-    QTimer.singleShot(300, _show)
+    tracing.init_from_env(sys.argv)
+    with span("app.main"):
+        # Unabhängige Schritte laufen im Hintergrund an, während Qt initialisiert
+        startup = Startup()
+        startup.run("config", load_config)
+        startup.run("store", bootstrap_admin)       # Store öffnen, ggf. Admin anlegen (KDF)
+        startup.run("login", try_auto_login, after=("config", "store"))
+        startup.run("assets", asset_cache.decode)   # Logos rendern + dekodieren
+
+        QGuiApplication.setHighDpiScaleFactorRoundingPolicy(
+            Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
+        )
+        QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
+        QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
+        set_windows_appid("de.digitalealchemie.studio")
+
+        with span("app.qapplication"):
+            app = QApplication(sys.argv)
+            app.setApplicationName(APP_NAME)
+            app.setWindowIcon(load_app_icon())
+            theme_engine.apply(app, accent=STUDIO_ACCENT, variant="studio")
+        # Opt-in: meldet blockierte Event-Loops samt Stack (DA_WATCHDOG=1).
+        # Startet, sobald config.json gelesen ist – ohne im GUI-Thread darauf zu warten
+        stalls_log = app_data_dir() / "stalls.log"
+        startup.when_ready(("config",), lambda cfg: stall_watchdog.start_from_config(cfg, stalls_log),
+                           on_error=lambda _step, _exc: stall_watchdog.start_from_config({}, stalls_log))
+        _mark("qapplication")
+
+        splash = show_splash()
+        _mark("splash")
+        # DPRs der tatsächlichen Screens nachziehen (nur QImage, threadsicher)
+        submit(asset_cache.prerender, asset_cache.screen_dprs())
+        # Renderings veralteter Logo-Stände einmal pro Start aufräumen
+        submit(asset_cache.prune)
+
+        def _make_window(username: str) -> MainWindow:
+            win = MainWindow(username=username)
+            _mark("window")
+            return win
+
+        # Login, Hauptfenster und Logout laufen im selben Prozess
+        session = SessionManager(app, _make_window, auto_login=try_auto_login)
+        if _BENCH_OUT:
+            _StartupBench(session)
+
+        def _first_window(win):
+            session.windowShown.disconnect(_first_window)
+            # Erst nach show(): finish() wartet sonst bis zu 1 s auf das Fenster
+            if splash:
+                splash.finish(win)
+
+        session.windowShown.connect(_first_window)
+
+        def _open(username, _decoded):
+            _mark("auto_login")
+            startup.shutdown()
+            # Splash bleibt bei Bedarf unter dem Login-Dialog sichtbar
+            with span("app.show_window"):
+                session.start(username)
+
+        def _failed(step, exc):
+            if step == "assets":
+                # Logos werden dann bei Bedarf im GUI-Thread gerendert
+                _open(startup.result("login"), None)
+                return
+            # Gesperrte DB, kaputte users.json/config.json: melden, dann normaler Login
+            startup.shutdown()
+            if splash:
+                splash.close()
+            QMessageBox.warning(None, APP_NAME, f"Beim Start ist ein Fehler aufgetreten ({step}):\n{exc}\n\n"
+                                                "Bitte manuell anmelden.")
+            session.start(None)
+
+        # Fenster, sobald Login-Ergebnis und Logos bereitstehen – keine feste Wartezeit
+        startup.when_ready(("login", "assets"), _open, on_error=_failed)
     sys.exit(app.exec())
 
 
 if __name__ == "__main__":
+    # Prozess-Pool der Rechnungs-PDFs startet Kindprozesse (spawn) auch aus der exe
+    multiprocessing.freeze_support()
     main()
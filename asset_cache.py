@@ -0,0 +1,174 @@
+# asset_cache.py
+from __future__ import annotations
+import hashlib, json, os, threading
+from pathlib import Path
+from typing import Iterable, Optional
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QGuiApplication, QImage, QPixmap, QPixmapCache
+
+from auth import APP_NAME, app_data_dir
+from tracing import span
+
+ASSETS = Path(__file__).resolve().parent / "assets"
+
+def _cache_root() -> Path:
+    # Vorgerenderte Bilder sind rechnerspezifisch -> lokales statt Roaming-Profil
+    local = os.getenv("LOCALAPPDATA")
+    root = (Path(local) / APP_NAME) if local else app_data_dir()
+    p = root / "asset_cache"
+    p.mkdir(parents=True, exist_ok=True)
+    return p
+
+CACHE_DIR = _cache_root()
+MANIFEST = CACHE_DIR / "manifest.json"
+
+# (Datei, logische Höhe) – alle Stellen, an denen die App Logos skaliert anzeigt.
+# None = Originalgröße.
+USAGES = [
+    ("logo_glow.png", 260),             # Splash
+    ("logo_header_160.png", None),      # Header-Banner
+    ("logo_glow.png", 140),             # Banner-Fallback
+    ("logo_transparent.png", 120),      # Banner-Fallback 2
+]
+
+_lock = threading.Lock()
+_manifest: Optional[dict] = None
+_decoded: dict = {}     # (Datei, Höhe, DPR) -> im Hintergrund dekodiertes QImage
+
+# ---------------- Quell-Hashes ----------------
+
+def _load_manifest() -> dict:
+    global _manifest
+    if _manifest is None:
+        try:
+            _manifest = json.loads(MANIFEST.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            _manifest = {}
+    return _manifest
+
+def source_hash(name: str) -> Optional[str]:
+    """Inhalts-Hash einer Quelldatei; neu berechnet nur bei geänderter mtime/Größe."""
+    src = ASSETS / name
+    try:
+        st = src.stat()
+    except FileNotFoundError:
+        return None
+    with _lock:
+        man = _load_manifest()
+        e = man.get(name)
+        if e and e["mtime_ns"] == st.st_mtime_ns and e["size"] == st.st_size:
+            return e["sha1"]
+        sha = hashlib.sha1(src.read_bytes()).hexdigest()
+        man[name] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha1": sha}
+        tmp = MANIFEST.with_name(MANIFEST.name + ".tmp")
+        tmp.write_text(json.dumps(man, indent=2), encoding="utf-8")
+        os.replace(tmp, MANIFEST)
+        return sha
+
+def cache_file(name: str, height: Optional[int], dpr: float) -> Optional[Path]:
+    if not height:
+        dpr = 1.0   # Originalgröße wird nicht skaliert
+    sha = source_hash(name)
+    if sha is None:
+        return None
+    return CACHE_DIR / f"{Path(name).stem}_{sha[:16]}_h{height or 0}_dpr{dpr:g}.png"
+
+# ---------------- Rendern ----------------
+
+def cached_dprs() -> list[float]:
+    """DPRs, für die schon gerendert wurde – brauchbar, bevor es Screens gibt."""
+    dprs = {1.0}
+    for f in CACHE_DIR.glob("*_h*_dpr*.png"):
+        try:
+            dprs.add(float(f.stem.rsplit("_dpr", 1)[1]))
+        except ValueError:
+            pass
+    return sorted(dprs)
+
+def screen_dprs() -> list[float]:
+    dprs = {1.0}
+    app = QGuiApplication.instance()
+    if app is not None:
+        dprs.update(round(s.devicePixelRatio(), 2) for s in app.screens())
+    return sorted(dprs)
+
+def render(name: str, height: Optional[int], dpr: float) -> Optional[Path]:
+    """Rendert eine Größe in den Platten-Cache (nur QImage -> auch im Worker-Thread nutzbar)."""
+    target = cache_file(name, height, dpr)
+    if target is None or target.exists():
+        return target
+    with span("assets.render", asset=name, height=height, dpr=dpr):
+        img = QImage(str(ASSETS / name))
+        if img.isNull():
+            return None
+        if height:
+            img = img.scaledToHeight(round(height * dpr), Qt.SmoothTransformation)
+        tmp = target.with_name(target.stem + f".{os.getpid()}.{threading.get_ident()}.tmp.png")
+        img.save(str(tmp), "PNG")
+        os.replace(tmp, target)
+    return target
+
+def prerender(dprs: Optional[Iterable[float]] = None, usages=USAGES) -> int:
+    n = 0
+    for dpr in (dprs or screen_dprs()):
+        for name, height in usages:
+            f = cache_file(name, height, dpr)
+            if f is not None and not f.exists():
+                render(name, height, dpr)
+                n += 1
+    return n
+
+def decode(dprs: Optional[Iterable[float]] = None, usages=USAGES) -> int:
+    """Rendert fehlende Größen und dekodiert sie vorab zu QImage (Worker-Thread).
+
+    pixmap() wandelt die Bilder dann nur noch in QPixmaps um.
+    """
+    n = 0
+    for dpr in (dprs or cached_dprs()):
+        for name, height in usages:
+            path = render(name, height, dpr)
+            if path is None:
+                continue
+            img = QImage(str(path))
+            if not img.isNull():
+                with _lock:
+                    _decoded[(name, height, path.name)] = img
+                n += 1
+    return n
+
+def prune() -> int:
+    """Cache-Dateien zu nicht mehr aktuellen Quellständen löschen."""
+    hashes = (source_hash(name) for name in {name for name, _ in USAGES})
+    current = {sha[:16] for sha in hashes if sha}
+    removed = 0
+    for f in CACHE_DIR.glob("*_h*_dpr*.png"):
+        parts = f.stem.rsplit("_", 3)
+        if len(parts) == 4 and parts[1] not in current:
+            f.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+# ---------------- Abruf (GUI-Thread) ----------------
+
+def pixmap(name: str, height: Optional[int] = None, dpr: Optional[float] = None) -> QPixmap:
+    """Vorgerendertes Pixmap in logischer Höhe height für das gegebene DPR."""
+    if dpr is None:
+        screen = QGuiApplication.primaryScreen()
+        dpr = round(screen.devicePixelRatio(), 2) if screen else 1.0
+    sha = source_hash(name)
+    key = f"da:{name}:{sha}:{height}:{dpr:g}"
+    pix = QPixmapCache.find(key)
+    if pix is not None and not pix.isNull():
+        return pix
+    path = render(name, height, dpr)
+    with _lock:
+        img = _decoded.pop((name, height, path.name), None) if path else None
+    if img is not None:
+        pix = QPixmap.fromImage(img)
+    else:
+        pix = QPixmap(str(path)) if path else QPixmap()
+    if not pix.isNull() and height:
+        pix.setDevicePixelRatio(dpr)
+    QPixmapCache.insert(key, pix)
+    return pix
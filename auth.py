@@ -1,12 +1,18 @@
 # auth.py
 from __future__ import annotations
-import json, os, secrets, string, time, hashlib
-from dataclasses import dataclass, asdict
+import csv, json, logging, os, secrets, string, time, hashlib, hmac, platform, threading, sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional
+
+from ratelimit import LoginLimiter
+from tracing import span, traced
 
 APP_NAME = "DigitaleAlchemyStudio"
 
+log = logging.getLogger("da.auth")
+
 def app_data_dir() -> Path:
     # Windows: %APPDATA%\DigitaleAlchemyStudio
     appdata = os.getenv("APPDATA")
@@ -20,29 +26,170 @@ def app_data_dir() -> Path:
 
 DATA_DIR = app_data_dir()
 USERS_FILE = DATA_DIR / "users.json"
+USERS_DB = DATA_DIR / "users.db"
+TOKENS_FILE = DATA_DIR / "tokens.json"
+ATTEMPTS_FILE = DATA_DIR / "login_attempts.log"
 CONFIG_FILE = DATA_DIR / "config.json"
 
-# ---------------- Password hashing (PBKDF2) ----------------
+def set_data_dir(path: Path):
+    """Datenverzeichnis umbiegen (Benchmarks, Tests) und alle Caches verwerfen."""
+    global DATA_DIR, USERS_FILE, USERS_DB, TOKENS_FILE, ATTEMPTS_FILE, CONFIG_FILE
+    global _store, _tokens, _limiter
+    with _singletons_lock:
+        if isinstance(_store, SqliteUserStore):
+            _store.close()
+        DATA_DIR = Path(path)
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        USERS_FILE = DATA_DIR / "users.json"
+        USERS_DB = DATA_DIR / "users.db"
+        TOKENS_FILE = DATA_DIR / "tokens.json"
+        ATTEMPTS_FILE = DATA_DIR / "login_attempts.log"
+        CONFIG_FILE = DATA_DIR / "config.json"
+        _store = _tokens = _limiter = None
+
+# ---------------- Password hashing (KDF registry) ----------------
+
+DEFAULT_KDF = {"algo": "pbkdf2_sha256", "iters": 130_000}
+KDF_TARGET_MS = 250
+
+# Untergrenzen – auch auf langsamen Rechnern nicht schwächer hashen
+MIN_PBKDF2_ITERS = 100_000
+MIN_SCRYPT_N = 2 ** 14
+MAX_SCRYPT_N = 2 ** 17              # 128 MiB bei r=8
 
 def _pbkdf2(password: str, salt: bytes, iterations: int = 130_000) -> str:
     dk = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
     return dk.hex()
 
-def hash_password(password: str, salt: Optional[bytes] = None) -> Dict[str, str]:
+def _scrypt(password: str, salt: bytes, n: int, r: int = 8, p: int = 1) -> str:
+    maxmem = 128 * r * (n + p + 2) + (1 << 20)
+    dk = hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p, maxmem=maxmem, dklen=32)
+    return dk.hex()
+
+# algo -> (Kostenparameter, Ableitungsfunktion)
+KDFS = {
+    "pbkdf2_sha256": (("iters",), lambda pw, salt, prm: _pbkdf2(pw, salt, int(prm["iters"]))),
+    "scrypt": (("n", "r", "p"), lambda pw, salt, prm: _scrypt(pw, salt, int(prm["n"]), int(prm["r"]), int(prm["p"]))),
+}
+
+def _host_kdf(cfg: dict) -> dict:
+    # config.json kann per Roaming-Profil wandern – Ergebnisse daher je Rechner
+    return ((cfg.get("kdf") or {}).get("hosts") or {}).get(platform.node()) or {}
+
+def kdf_params() -> dict:
+    # Kalibrierte Parameter dieses Rechners, sonst der historische Standard
+    params = _host_kdf(load_config()).get("params")
+    if params and params.get("algo") in KDFS:
+        return params
+    return dict(DEFAULT_KDF)
+
+def hash_password(password: str, salt: Optional[bytes] = None, params: Optional[dict] = None) -> Dict[str, str]:
+    params = params or kdf_params()
+    names, derive = KDFS[params["algo"]]
     salt = salt or secrets.token_bytes(16)
-    return {
-        "algo": "pbkdf2_sha256",
-        "iters": 130_000,
-        "salt": salt.hex(),
-        "hash": _pbkdf2(password, salt)
-    }
+    rec = {"algo": params["algo"]}
+    rec.update({k: int(params[k]) for k in names})
+    rec["salt"] = salt.hex()
+    rec["hash"] = derive(password, salt, rec)
+    return rec
 
 def verify_password(password: str, rec: Dict[str, str]) -> bool:
-    if rec.get("algo") != "pbkdf2_sha256":
+    kdf = KDFS.get(rec.get("algo"))
+    if kdf is None:
         return False
+    if rec["algo"] == "pbkdf2_sha256" and "iters" not in rec:
+        rec = dict(rec, iters=130_000)
     salt = bytes.fromhex(rec["salt"])
-    iters = int(rec.get("iters", 130_000))
-    return _pbkdf2(password, salt, iters) == rec["hash"]
+    with span("auth.kdf", algo=rec["algo"]):
+        return hmac.compare_digest(kdf[1](password, salt, rec), rec["hash"])
+
+def needs_rehash(rec: Dict[str, str], params: Optional[dict] = None) -> bool:
+    # Nur nach oben: ein langsamerer Rechner darf vorhandene Hashes nicht abschwächen
+    params = params or kdf_params()
+    if rec.get("algo") != params["algo"]:
+        return True
+    names = KDFS[params["algo"]][0]
+    return any(int(rec.get(k, 0)) < int(params[k]) for k in names)
+
+def _time_kdf(params: dict, rounds: int = 3) -> float:
+    # Median in Millisekunden
+    names, derive = KDFS[params["algo"]]
+    salt = secrets.token_bytes(16)
+    times = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        derive("calibration", salt, params)
+        times.append((time.perf_counter() - t0) * 1000)
+    return sorted(times)[len(times) // 2]
+
+def _calibrate_pbkdf2(target_ms: float) -> dict:
+    probe = {"algo": "pbkdf2_sha256", "iters": 20_000}
+    ms = _time_kdf(probe)
+    iters = int(probe["iters"] * target_ms / max(ms, 1e-3)) // 1000 * 1000
+    return {"algo": "pbkdf2_sha256", "iters": max(MIN_PBKDF2_ITERS, iters)}
+
+def _calibrate_scrypt(target_ms: float) -> dict:
+    params = {"algo": "scrypt", "n": MIN_SCRYPT_N, "r": 8, "p": 1}
+    # Kosten wachsen linear mit n: verdoppeln, solange das Ziel deutlich verfehlt wird
+    while params["n"] < MAX_SCRYPT_N and _time_kdf(params, rounds=1) * 1.5 < target_ms:
+        params["n"] *= 2
+    return params
+
+_CALIBRATE = {"pbkdf2_sha256": _calibrate_pbkdf2, "scrypt": _calibrate_scrypt}
+
+def calibrate_kdf(target_ms: float = KDF_TARGET_MS, algo: str = "pbkdf2_sha256", save: bool = True) -> dict:
+    """Wählt KDF-Kosten, die auf diesem Rechner ca. target_ms pro Prüfung brauchen.
+
+    Gemessen wird nur algo – scrypt belegt bis zu MAX_SCRYPT_N (128 MiB).
+    """
+    params = _CALIBRATE[algo](target_ms)
+    result = {
+        "params": params,
+        "target_ms": target_ms,
+        "measured_ms": round(_time_kdf(params), 1),
+        "calibrated_at": time.time(),
+    }
+    if save:
+        cfg = load_config()
+        hosts = (cfg.get("kdf") or {}).get("hosts") or {}
+        hosts[platform.node()] = result
+        cfg["kdf"] = {"algo": algo, "target_ms": target_ms, "hosts": hosts}
+        save_config(cfg)
+    return result
+
+def kdf_calibrated() -> bool:
+    return bool(_host_kdf(load_config()).get("params"))
+
+def ensure_kdf_calibrated() -> dict:
+    """Kalibriert einmal pro Rechner (blockiert – nur CLI, Installation, Stapel-Jobs)."""
+    cfg = load_config()
+    entry = _host_kdf(cfg)
+    if entry.get("params"):
+        return entry
+    kdf = cfg.get("kdf") or {}
+    algo = kdf.get("algo") or DEFAULT_KDF["algo"]
+    return calibrate_kdf(kdf.get("target_ms", KDF_TARGET_MS), algo)
+
+_calibrating = threading.Lock()
+
+def calibrate_in_background() -> bool:
+    """Startet die Kalibrierung in einem Daemon-Thread, falls dieser Rechner noch keine hat.
+
+    Bis sie fertig ist, gelten die bisherigen Parameter; gerehasht wird erst
+    beim nächsten Login.
+    """
+    if kdf_calibrated() or not _calibrating.acquire(blocking=False):
+        return False
+
+    def run():
+        try:
+            ensure_kdf_calibrated()
+        except Exception as e:
+            log.warning("KDF-Kalibrierung fehlgeschlagen: %s", e)
+        finally:
+            _calibrating.release()
+    threading.Thread(target=run, name="kdf-calibrate", daemon=True).start()
+    return True
 
 # ---------------- Data models ----------------
 
@@ -62,21 +209,278 @@ class User:
             d["tokens"] = []
         return d
 
+# ---------------- User store (in-process cache) ----------------
+
+class UserStore:
+    """Hält die geparste users.json im Speicher.
+
+    Der Cache wird gegen mtime/Größe der Datei revalidiert, damit Änderungen
+    anderer Prozesse sichtbar werden. Innerhalb von transaction() werden alle
+    Änderungen gesammelt und am Ende genau einmal geschrieben.
+    """
+
+    backend = "json"
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._users: Optional[Dict[str, User]] = None
+        self._sig = None
+        self._depth = 0
+        self._dirty = False
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def _stat(self):
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def users(self) -> Dict[str, User]:
+        with self._lock:
+            # In einer Transaktion gilt der Stand vom Transaktionsbeginn
+            if self._users is not None and (self._depth or self._stat() == self._sig):
+                self.hits += 1
+                return self._users
+            self.misses += 1
+            sig = self._stat()
+            users: Dict[str, User] = {}
+            if sig is not None:
+                with span("users.json.read", bytes=sig[1]):
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        raw = json.load(f)
+                    for name, ud in raw.items():
+                        users[name] = User(**ud)
+            self._users, self._sig = users, sig
+            return users
+
+    def get(self, username: str) -> Optional[User]:
+        return self.users().get(username)
+
+    def put(self, user: User):
+        with self._lock:
+            self.users()[user.username] = user
+            self.save()
+
+    def put_many(self, users: list):
+        with self.transaction():
+            for u in users:
+                self.put(u)
+
+    def update_lockout(self, username: str, failed: int, lock_until: float):
+        with self._lock:
+            u = self.users()[username]
+            u.failed, u.lock_until = failed, lock_until
+            self.save()
+
+    def set_tokens(self, username: str, tokens: list):
+        with self._lock:
+            self.users()[username].tokens = tokens
+            self.save()
+
+    def save(self, users: Optional[Dict[str, User]] = None):
+        with self._lock:
+            if users is not None:
+                self._users = users
+            if self._depth:
+                self._dirty = True
+                return
+            self._write()
+
+    def _write(self):
+        users = self._users or {}
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with span("users.json.write", users=len(users)):
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({k: u.to_dict() for k, u in users.items()}, f, indent=2, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        self._sig = self._stat()
+        self._dirty = False
+        self.writes += 1
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            self.users()
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._depth -= 1
+                if not self._depth:
+                    # Halbfertige Änderungen verwerfen, nächster Zugriff liest neu
+                    self._users, self._sig, self._dirty = None, None, False
+                raise
+            self._depth -= 1
+            if not self._depth and self._dirty:
+                self._write()
+
+    def invalidate(self):
+        with self._lock:
+            self._users, self._sig = None, None
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "writes": self.writes}
+
+# ---------------- User store (SQLite, optional) ----------------
+
+_USERS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username       TEXT PRIMARY KEY,
+    password       TEXT NOT NULL,
+    roles          TEXT NOT NULL,
+    must_change_pw INTEGER NOT NULL DEFAULT 0,
+    tokens         TEXT NOT NULL DEFAULT '[]',
+    failed         INTEGER NOT NULL DEFAULT 0,
+    lock_until     REAL NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+"""
+
+class SqliteUserStore:
+    """Gleiche Schnittstelle wie UserStore, aber zeilenweise in SQLite (WAL).
+
+    Lookup über den Primärschlüssel, Lockout-Zähler und Tokens werden als
+    einzelne UPDATEs geschrieben – Kosten unabhängig von der Benutzerzahl.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._db = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_USERS_SCHEMA)
+        self.reads = 0
+        self.writes = 0
+
+    @staticmethod
+    def _row_to_user(row) -> User:
+        name, pw, roles, must, tokens, failed, lock_until = row
+        return User(username=name, password=json.loads(pw), roles=json.loads(roles),
+                    must_change_pw=bool(must), tokens=json.loads(tokens),
+                    failed=failed, lock_until=lock_until)
+
+    @staticmethod
+    def _user_to_row(u: User) -> tuple:
+        return (u.username, json.dumps(u.password), json.dumps(u.roles), int(bool(u.must_change_pw)),
+                json.dumps(u.tokens or []), int(u.failed or 0), float(u.lock_until or 0))
+
+    def users(self) -> Dict[str, User]:
+        # Nur für Kompatibilität (load_users) – lädt alle Zeilen
+        with self._lock:
+            self.reads += 1
+            rows = self._db.execute("SELECT * FROM users").fetchall()
+        return {r[0]: self._row_to_user(r) for r in rows}
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def get(self, username: str) -> Optional[User]:
+        with self._lock:
+            self.reads += 1
+            row = self._db.execute("SELECT * FROM users WHERE username = ?", (username,)).fetchone()
+        return self._row_to_user(row) if row else None
+
+    def put(self, user: User):
+        self.put_many([user])
+
+    def put_many(self, users: list):
+        with self.transaction():
+            self._db.executemany("INSERT OR REPLACE INTO users VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                 [self._user_to_row(u) for u in users])
+            self.writes += 1
+
+    def update_lockout(self, username: str, failed: int, lock_until: float):
+        with self._lock:
+            self._db.execute("UPDATE users SET failed = ?, lock_until = ? WHERE username = ?",
+                             (int(failed), float(lock_until), username))
+            self.writes += 1
+
+    def set_tokens(self, username: str, tokens: list):
+        with self._lock:
+            self._db.execute("UPDATE users SET tokens = ? WHERE username = ?",
+                             (json.dumps(tokens), username))
+            self.writes += 1
+
+    def save(self, users: Optional[Dict[str, User]] = None):
+        # Zeilen werden sofort geschrieben; save() übernimmt nur übergebene Maps
+        if users is not None:
+            self.put_many(list(users.values()))
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            if not self._depth:
+                self._db.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._depth -= 1
+                if not self._depth:
+                    self._db.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if not self._depth:
+                self._db.execute("COMMIT")
+
+    def invalidate(self):
+        pass
+
+    def migrate_from_json(self, json_path: Path) -> int:
+        """Einmalige Übernahme einer bestehenden users.json (wird umbenannt)."""
+        if not json_path.exists() or self.count():
+            return 0
+        users = UserStore(json_path).users()
+        self.put_many(list(users.values()))
+        json_path.replace(json_path.with_name(json_path.name + ".migrated"))
+        return len(users)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def stats(self) -> dict:
+        return {"reads": self.reads, "writes": self.writes}
+
+
+_store = None
+# Startup-Pool, Auth-Pool und GUI-Thread holen die Singletons parallel; RLock,
+# weil token_index() beim ersten Mal user_store() braucht
+_singletons_lock = threading.RLock()
+
+def user_backend() -> str:
+    # DA_USER_BACKEND überschreibt config.json ("json" | "sqlite")
+    return os.getenv("DA_USER_BACKEND") or load_config().get("user_backend", "json")
+
+def user_store():
+    global _store
+    with _singletons_lock:
+        if _store is None:
+            if user_backend() == "sqlite":
+                _store = SqliteUserStore(USERS_DB)
+                _store.migrate_from_json(USERS_FILE)
+            else:
+                _store = UserStore(USERS_FILE)
+        return _store
+
 # ---------------- Storage helpers ----------------
 
 def load_users() -> Dict[str, User]:
-    if not USERS_FILE.exists():
-        return {}
-    with open(USERS_FILE, "r", encoding="utf-8") as f:
-        raw = json.load(f)
-    users: Dict[str, User] = {}
-    for name, ud in raw.items():
-        users[name] = User(**ud)
-    return users
+    # Liefert die gecachte Map – Änderungen mit save_users() persistieren
+    with span("auth.load_users"):
+        return user_store().users()
 
 def save_users(users: Dict[str, User]):
-    with open(USERS_FILE, "w", encoding="utf-8") as f:
-        json.dump({k: u.to_dict() for k, u in users.items()}, f, indent=2, ensure_ascii=False)
+    with span("auth.save_users", users=len(users)):
+        user_store().save(users)
 
 def load_config() -> dict:
     if not CONFIG_FILE.exists():
@@ -90,20 +494,40 @@ def save_config(cfg: dict):
 
 # ---------------- Bootstrap (first run) ----------------
 
-def ensure_default_admin(users: Dict[str, User]) -> Dict[str, User]:
-    if "admin" in users:
-        return users
+def _default_admin() -> User:
     pwd = "admin"  # bewusst einfach für Erststart; erfordert Passwortwechsel
-    users["admin"] = User(
+    return User(
         username="admin",
         password=hash_password(pwd),
         roles=["admin"],
         must_change_pw=True,
         tokens=[]
     )
+
+def ensure_default_admin(users: Dict[str, User]) -> Dict[str, User]:
+    if "admin" in users:
+        return users
+    users["admin"] = _default_admin()
     save_users(users)
     return users
 
+def bootstrap_admin() -> User:
+    # Zeilenbasierte Variante von ensure_default_admin (kein Volladen)
+    store = user_store()
+    admin = store.get("admin")
+    if admin is not None:
+        return admin
+    fresh = _default_admin()        # KDF vor der Schreibsperre
+    with store.transaction():
+        admin = store.get("admin")
+        if admin is None:
+            admin = fresh
+            store.put(admin)
+    return admin
+
+def get_user(username: str) -> Optional[User]:
+    return user_store().get(username)
+
 # ---------------- Remember-me tokens ----------------
 
 def new_remember_token() -> str:
@@ -113,69 +537,239 @@ def new_remember_token() -> str:
 def token_hash(token: str) -> str:
     return hashlib.sha256(token.encode("utf-8")).hexdigest()
 
+TOKEN_DAYS = 30
+MAX_TOKENS_PER_USER = 5
+
+class TokenIndex:
+    """token_hash -> {"user", "issued", "expires"} in einer eigenen kleinen Datei.
+
+    Prüfen ist ein Dict-Lookup; abgelaufene Einträge werden beim Zugriff bzw.
+    beim nächsten Schreiben entfernt. Die Benutzerdatenbank wird nicht gelesen.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._entries: Optional[Dict[str, dict]] = None
+        self._sig = None
+        self._lock = threading.RLock()
+
+    def _stat(self):
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _load(self) -> Dict[str, dict]:
+        sig = self._stat()
+        if self._entries is None or sig != self._sig:
+            entries = {}
+            if sig is not None:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+            self._entries, self._sig = entries, sig
+        return self._entries
+
+    def _write(self):
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+        self._sig = self._stat()
+
+    def _prune(self, now: float) -> int:
+        entries = self._load()
+        expired = [th for th, e in entries.items() if e["expires"] <= now]
+        for th in expired:
+            del entries[th]
+        return len(expired)
+
+    def issue(self, username: str, token: str, ttl_days: float = TOKEN_DAYS, now: Optional[float] = None):
+        now = now or time.time()
+        with self._lock:
+            entries = self._load()
+            self._prune(now)
+            entries[token_hash(token)] = {"user": username, "issued": now, "expires": now + ttl_days * 86400}
+            # max 5 gültige Tokens pro User – älteste fliegen raus
+            mine = sorted((e["issued"], th) for th, e in entries.items() if e["user"] == username)
+            for _, th in mine[:-MAX_TOKENS_PER_USER]:
+                del entries[th]
+            self._write()
+
+    def verify(self, username: str, token: str, now: Optional[float] = None) -> bool:
+        now = now or time.time()
+        th = token_hash(token)
+        with self._lock:
+            e = self._load().get(th)
+            if not e or e["user"] != username:
+                return False
+            if e["expires"] <= now:
+                del self._entries[th]
+                self._write()
+                return False
+            return True
+
+    def revoke(self, token: str) -> bool:
+        with self._lock:
+            if self._load().pop(token_hash(token), None) is None:
+                return False
+            self._write()
+            return True
+
+    def revoke_user(self, username: str) -> int:
+        with self._lock:
+            entries = self._load()
+            mine = [th for th, e in entries.items() if e["user"] == username]
+            for th in mine:
+                del entries[th]
+            if mine:
+                self._write()
+            return len(mine)
+
+    def prune(self) -> int:
+        with self._lock:
+            n = self._prune(time.time())
+            if n:
+                self._write()
+            return n
+
+    def migrate_from_users(self, store) -> int:
+        """Einmalig: Tokens aus User.tokens (altes Format) in den Index übernehmen."""
+        with self._lock:
+            entries = self._load()
+            now = time.time()
+            n = 0
+            with store.transaction():
+                for name, u in store.users().items():
+                    if not u.tokens:
+                        continue
+                    for th in u.tokens[-MAX_TOKENS_PER_USER:]:
+                        entries[th] = {"user": name, "issued": now, "expires": now + TOKEN_DAYS * 86400}
+                        n += 1
+                    store.set_tokens(name, [])
+            self._write()
+            return n
+
+
+_tokens: Optional[TokenIndex] = None
+
+def token_index() -> TokenIndex:
+    global _tokens
+    with _singletons_lock:
+        if _tokens is None:
+            tokens = TokenIndex(TOKENS_FILE)
+            if not tokens.exists():
+                tokens.migrate_from_users(user_store())
+            _tokens = tokens    # erst nach der Migration für andere Threads sichtbar
+        return _tokens
+
 def attach_token(users: Dict[str, User], username: str, token: str):
-    u = users[username]
-    th = token_hash(token)
-    if u.tokens is None:
-        u.tokens = []
-    # max 5 gültige Tokens pro User
-    u.tokens = (u.tokens + [th])[-5:]
-    save_users(users)
+    # Kompatibilität: Tokens liegen im TokenIndex, nicht mehr in users
+    token_index().issue(username, token)
 
 def verify_token(users: Dict[str, User], username: str, token: str) -> bool:
-    u = users.get(username)
-    if not u or not u.tokens:
-        return False
-    return token_hash(token) in u.tokens
+    return token_index().verify(username, token)
+
+def issue_remember_token(username: str) -> str:
+    if get_user(username) is None:
+        raise KeyError(username)
+    token = new_remember_token()
+    token_index().issue(username, token)
+    return token
+
+def check_remember_token(username: str, token: str) -> bool:
+    return token_index().verify(username, token)
+
+def revoke_remember_token(token: str) -> bool:
+    return token_index().revoke(token)
 
 # ---------------- Auth flow ----------------
 
 LOCK_MINUTES = 5
 MAX_FAILED = 5
 
+_limiter: Optional[LoginLimiter] = None
+
+def login_limiter() -> LoginLimiter:
+    # Fehlversuche landen im Journal statt in users.json
+    global _limiter
+    with _singletons_lock:
+        if _limiter is None:
+            _limiter = LoginLimiter(ATTEMPTS_FILE, MAX_FAILED, LOCK_MINUTES)
+        return _limiter
+
+@traced("auth.authenticate")
 def authenticate(username: str, password: str) -> tuple[bool, str]:
-    users = load_users()
-    users = ensure_default_admin(users)
+    # KDF läuft ohne Schreibsperre; nur Lockout-Reset und Rehash schreiben kurz
+    store = user_store()
+    limiter = login_limiter()
+    bootstrap_admin()
 
-    u = users.get(username)
+    u = store.get(username)
     now = time.time()
     if not u:
         return False, "Unbekannter Benutzer."
 
-    # Lockout
+    # Lockout (Altbestand aus users.json, sonst Journal) + Drosselung
     if u.lock_until and now < u.lock_until:
         mins = int((u.lock_until - now) // 60) + 1
         return False, f"Konto gesperrt. Bitte in {mins} Min. erneut versuchen."
-
-    ok = verify_password(password, u.password)
-    if ok:
-        u.failed = 0
-        u.lock_until = 0
-        save_users(users)
-        return True, ""
-    else:
-        u.failed = (u.failed or 0) + 1
-        if u.failed >= MAX_FAILED:
-            u.lock_until = now + LOCK_MINUTES * 60
-            u.failed = 0
-        save_users(users)
+    allowed, msg = limiter.check(username, now)
+    if not allowed:
+        return False, msg
+
+    rec = u.password
+    ok = verify_password(password, rec)
+    limiter.record(username, ok, now)
+    if not ok:
         return False, "Passwort falsch."
 
+    # Veraltete Hash-Parameter transparent mit dem Klartext erneuern;
+    # kalibriert wird nie im Login selbst
+    params = kdf_params()
+    calibrate_in_background()
+    new_rec = hash_password(password, params=params) if needs_rehash(rec, params) else None
+    if new_rec or u.failed or u.lock_until:
+        with store.transaction():
+            cur = store.get(username)
+            if cur is None:
+                return False, "Unbekannter Benutzer."
+            if cur.failed or cur.lock_until:
+                store.update_lockout(username, 0, 0)
+            # Zwischenzeitlich geändertes Passwort nicht überschreiben
+            if new_rec and cur.password == rec:
+                cur.password = new_rec
+                cur.failed, cur.lock_until = 0, 0
+                store.put(cur)
+    return True, ""
+
+@traced("auth.change_password")
 def change_password(username: str, old_password: str, new_password: str) -> tuple[bool, str]:
-    users = load_users()
-    u = users.get(username)
+    store = user_store()
+    u = store.get(username)
     if not u:
         return False, "Benutzer existiert nicht."
 
-    if not verify_password(old_password, u.password):
+    rec = u.password
+    if not verify_password(old_password, rec):
         return False, "Altes Passwort stimmt nicht."
 
     if not validate_new_password(new_password):
         return False, "Neues Passwort erfüllt die Mindestanforderungen nicht."
 
-    u.password = hash_password(new_password)
-    u.must_change_pw = False
-    save_users(users)
+    new_rec = hash_password(new_password)
+    with store.transaction():
+        cur = store.get(username)
+        if cur is None:
+            return False, "Benutzer existiert nicht."
+        if cur.password != rec:
+            return False, "Passwort wurde zwischenzeitlich geändert. Bitte erneut versuchen."
+        cur.password = new_rec
+        cur.must_change_pw = False
+        store.put(cur)
     return True, "Passwort geändert."
 
 def validate_new_password(pw: str) -> bool:
@@ -187,3 +781,150 @@ def validate_new_password(pw: str) -> bool:
              any(ch.isdigit() for ch in pw),
              any(ch in "!@#$%^&*()-_=+[]{};:,.<>?/\\|" for ch in pw)]
     return sum(1 for c in csets if c) >= 3
+
+
+# ---------------- Bulk provisioning (CSV) ----------------
+
+@dataclass
+class ProvisionReport:
+    created: int = 0
+    errors: list = field(default_factory=list)      # (Zeile, Meldung)
+    generated: dict = field(default_factory=dict)   # Benutzer -> Startpasswort
+    seconds: float = 0.0
+
+    @property
+    def users_per_s(self) -> float:
+        return self.created / self.seconds if self.seconds else 0.0
+
+def _hash_job(job: tuple) -> Dict[str, str]:
+    # Läuft im Worker-Prozess (muss auf Modulebene liegen, damit es pickelbar ist)
+    password, params = job
+    return hash_password(password, params=params)
+
+def _read_user_csv(path: Path) -> Iterator[tuple[int, dict]]:
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        try:
+            dialect = csv.Sniffer().sniff(f.read(4096), delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        f.seek(0)
+        reader = csv.DictReader(f, dialect=dialect)
+        for row in reader:
+            yield reader.line_num, {(k or "").strip().lower(): (v or "").strip() for k, v in row.items()}
+
+def provision_from_csv(path: Path, default_roles=("user",), workers: Optional[int] = None,
+                       overwrite: bool = False, chunk: int = 256) -> ProvisionReport:
+    """Legt Benutzer aus einer CSV an (Spalten: username, password, roles, must_change_pw).
+
+    Passwörter werden in einem Prozesspool gehasht, alle Datensätze am Ende in
+    einem einzigen Commit geschrieben. Leeres Passwort -> zufälliges Startpasswort
+    mit Wechselpflicht.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    report = ProvisionReport()
+    t0 = time.perf_counter()
+    params = ensure_kdf_calibrated()["params"]
+    store = user_store()
+    seen = set()
+    new_users: list = []        # (Zeile, User)
+
+    def flush(batch, pool, workers: int):
+        results = pool.map(_hash_job, [(pw, params) for _, _, pw in batch], chunksize=max(1, len(batch) // (4 * workers)))
+        for (line, u, _), rec in zip(batch, results):
+            u.password = rec
+            new_users.append((line, u))
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        batch = []
+        for line, row in _read_user_csv(path):
+            name = row.get("username", "")
+            if not name:
+                report.errors.append((line, "Benutzername fehlt."))
+                continue
+            if name in seen:
+                report.errors.append((line, f"{name}: doppelt in der Datei."))
+                continue
+            seen.add(name)
+            if not overwrite and store.get(name) is not None:
+                report.errors.append((line, f"{name}: existiert bereits."))
+                continue
+            roles = [r.strip() for r in row.get("roles", "").replace(",", ";").split(";") if r.strip()]
+            pw = row.get("password", "")
+            must_change = row.get("must_change_pw", "").lower() in ("1", "true", "ja", "yes")
+            if not pw:
+                pw = secrets.token_urlsafe(12)
+                report.generated[name] = pw
+                must_change = True
+            elif not validate_new_password(pw):
+                must_change = True
+            u = User(username=name, password={}, roles=roles or list(default_roles),
+                     must_change_pw=must_change, tokens=[])
+            batch.append((line, u, pw))
+            if len(batch) >= chunk:
+                flush(batch, pool, workers)
+                batch = []
+        if batch:
+            flush(batch, pool, workers)
+
+    if new_users:
+        with store.transaction():
+            if not overwrite:
+                # Erneut in der Schreibtransaktion: ein paralleler Lauf kann inzwischen angelegt haben
+                fresh = []
+                for line, u in new_users:
+                    if store.get(u.username) is None:
+                        fresh.append((line, u))
+                    else:
+                        report.errors.append((line, f"{u.username}: existiert bereits."))
+                        report.generated.pop(u.username, None)
+                new_users = fresh
+                report.errors.sort()
+            store.put_many([u for _, u in new_users])
+    report.created = len(new_users)
+    report.seconds = time.perf_counter() - t0
+    return report
+
+# ---------------- CLI ----------------
+
+def _cli(argv=None) -> int:
+    import argparse
+    ap = argparse.ArgumentParser(prog="auth.py", description="Benutzerverwaltung Digitale Alchemy Studio")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("migrate-sqlite", help="users.json einmalig nach users.db übernehmen und SQLite aktivieren")
+    cal = sub.add_parser("calibrate", help="KDF-Kosten für diesen Rechner bestimmen")
+    cal.add_argument("--target-ms", type=float, default=KDF_TARGET_MS)
+    cal.add_argument("--algo", choices=sorted(KDFS), default="pbkdf2_sha256")
+    prov = sub.add_parser("provision", help="Benutzer aus CSV anlegen (username,password,roles,must_change_pw)")
+    prov.add_argument("csv", type=Path)
+    prov.add_argument("--roles", default="user", help="Standardrollen, ';'-getrennt")
+    prov.add_argument("--workers", type=int, default=None)
+    prov.add_argument("--overwrite", action="store_true", help="vorhandene Benutzer ersetzen")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "migrate-sqlite":
+        store = SqliteUserStore(USERS_DB)
+        n = store.migrate_from_json(USERS_FILE)
+        store.close()
+        cfg = load_config()
+        cfg["user_backend"] = "sqlite"
+        save_config(cfg)
+        print(f"{n} Benutzer übernommen, Backend: sqlite ({USERS_DB})")
+    elif args.cmd == "calibrate":
+        res = calibrate_kdf(args.target_ms, args.algo)
+        print(f"{args.algo:14} {res['measured_ms']:8.1f} ms  {res['params']}")
+    elif args.cmd == "provision":
+        rep = provision_from_csv(args.csv, default_roles=args.roles.split(";"),
+                                 workers=args.workers, overwrite=args.overwrite)
+        for line, msg in rep.errors:
+            print(f"Zeile {line}: {msg}")
+        for name, pw in rep.generated.items():
+            print(f"{name}: Startpasswort {pw}")
+        print(f"{rep.created} Benutzer angelegt, {len(rep.errors)} Fehler, "
+              f"{rep.seconds:.1f} s ({rep.users_per_s:.1f} Benutzer/s)")
+        return 1 if rep.errors else 0
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(_cli())
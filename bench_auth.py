@@ -0,0 +1,175 @@
+# bench_auth.py
+"""Headless-Benchmark für auth.py (kein Qt-Import).
+
+Erzeugt synthetische Benutzerdatenbanken in einem Temp-Verzeichnis und misst
+Latenz-Perzentile sowie gelesene/geschriebene Bytes je Operation.
+
+    python bench_auth.py --sizes 10 1000 100000 --out bench_results.json
+    python bench_auth.py --baseline bench_baseline.json --threshold 0.25
+    python bench_auth.py --baseline bench_baseline.json --update-baseline
+"""
+from __future__ import annotations
+import argparse, json, platform, statistics, sys, tempfile, time
+from pathlib import Path
+
+import auth
+from ratelimit import LoginLimiter
+
+BENCH_PASSWORDS = ("Bench-Pass-1", "Bench-Pass-2")
+
+# ---------------- I/O-Zähler ----------------
+
+def _io_counters():
+    # (gelesen, geschrieben) in Bytes für den ganzen Prozess, falls verfügbar
+    try:
+        import psutil
+        io = psutil.Process().io_counters()
+        return getattr(io, "read_chars", io.read_bytes), getattr(io, "write_chars", io.write_bytes)
+    except Exception:
+        pass
+    try:
+        with open("/proc/self/io", "r") as f:
+            vals = dict(line.split(": ") for line in f.read().splitlines())
+        return int(vals["rchar"]), int(vals["wchar"])
+    except Exception:
+        return None
+
+# ---------------- Synthetische Datenbank ----------------
+
+def build_db(data_dir: Path, backend: str, size: int, kdf_iters: int):
+    auth.set_data_dir(data_dir)
+    params = {"algo": "pbkdf2_sha256", "iters": kdf_iters}
+    auth.save_config({
+        "user_backend": backend,
+        # Kalibrierung vorwegnehmen, damit authenticate weder kalibriert noch rehasht
+        "kdf": {"hosts": {platform.node(): {"params": params, "target_ms": 0}}},
+    })
+    rec = auth.hash_password(BENCH_PASSWORDS[0], params=params)
+    users = [auth.User(f"user{i:06d}", dict(rec), ["user"], tokens=[]) for i in range(size)]
+    # Admin vorab anlegen, sonst schreibt der erste authenticate-Aufruf die ganze Datei
+    users.append(auth.User("admin", dict(rec), ["admin"], tokens=[]))
+    store = auth.user_store()
+    if backend == "sqlite":
+        store.put_many(users)
+    else:
+        store.save({u.username: u for u in users})
+    # Token-Index mit einem Eintrag pro Benutzer füllen
+    now = time.time()
+    idx = auth.token_index()
+    idx._entries = {auth.token_hash(f"tok{i}"): {"user": u.username, "issued": now, "expires": now + 86400}
+                    for i, u in enumerate(users)}
+    idx._write()
+    # Limiter ohne Drosselung/Sperre, sonst misst man nur die Kurzschlüsse
+    auth._limiter = LoginLimiter(auth.ATTEMPTS_FILE, max_failed=10 ** 9, lock_minutes=0,
+                                 user_rate=(1e9, 1e9), process_rate=(1e9, 1e9))
+
+# ---------------- Messung ----------------
+
+def _measure(fn, repeat: int, before=None) -> dict:
+    times, read, written = [], 0, 0
+    has_io = _io_counters() is not None
+    for i in range(repeat):
+        if before:
+            before(i)
+        io0 = _io_counters()
+        t0 = time.perf_counter()
+        fn(i)
+        times.append((time.perf_counter() - t0) * 1000)
+        io1 = _io_counters()
+        if io0 and io1:
+            read += io1[0] - io0[0]
+            written += io1[1] - io0[1]
+    times.sort()
+    pct = lambda q: times[min(len(times) - 1, int(q * len(times)))]
+    return {
+        "n": repeat,
+        "mean_ms": round(statistics.fmean(times), 4),
+        "p50_ms": round(pct(0.50), 4),
+        "p95_ms": round(pct(0.95), 4),
+        "p99_ms": round(pct(0.99), 4),
+        "read_bytes_per_op": read // repeat if has_io else None,
+        "written_bytes_per_op": written // repeat if has_io else None,
+    }
+
+def run_size(backend: str, size: int, repeat: int, kdf_iters: int) -> dict:
+    res = {}
+    with tempfile.TemporaryDirectory(prefix="da_bench_") as tmp:
+        build_db(Path(tmp), backend, size, kdf_iters)
+        store = auth.user_store()
+        names = [f"user{i % size:06d}" for i in range(repeat)]
+        heavy = max(3, min(repeat, 10)) if size >= 100_000 else repeat
+
+        res["authenticate_ok"] = _measure(lambda i: auth.authenticate(names[i], BENCH_PASSWORDS[0]), repeat)
+        res["authenticate_fail"] = _measure(lambda i: auth.authenticate(names[i], "falsch"), repeat)
+        res["verify_token"] = _measure(lambda i: auth.check_remember_token(names[i], f"tok{i % size}"), repeat)
+        res["load_users"] = _measure(lambda i: auth.load_users(), heavy, before=lambda i: store.invalidate())
+        users = auth.load_users()
+        res["save_users"] = _measure(lambda i: auth.save_users(users), heavy)
+        pw = list(BENCH_PASSWORDS)
+        res["change_password"] = _measure(
+            lambda i: auth.change_password("user000000", pw[i % 2], pw[(i + 1) % 2]), repeat)
+        auth.set_data_dir(Path(tmp) / "_closed")
+    return res
+
+def run(sizes, backends, repeat: int, kdf_iters: int) -> dict:
+    results = {}
+    for backend in backends:
+        for size in sizes:
+            print(f"[bench] {backend:6} {size:>7} Benutzer …", file=sys.stderr)
+            for op, r in run_size(backend, size, repeat, kdf_iters).items():
+                results[f"{backend}/{size}/{op}"] = r
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "kdf_iters": kdf_iters,
+            "repeat": repeat,
+            "created": time.time(),
+        },
+        "results": results,
+    }
+
+def compare(current: dict, baseline: dict, threshold: float, metric: str = "p50_ms") -> list:
+    regressions = []
+    for key, base in baseline.get("results", {}).items():
+        cur = current["results"].get(key)
+        if not cur or not base.get(metric):
+            continue
+        ratio = cur[metric] / base[metric]
+        if ratio > 1 + threshold:
+            regressions.append((key, base[metric], cur[metric], ratio))
+    return regressions
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 100_000])
+    ap.add_argument("--backends", nargs="+", choices=["json", "sqlite"], default=["json", "sqlite"])
+    ap.add_argument("--repeat", type=int, default=30)
+    ap.add_argument("--kdf-iters", type=int, default=auth.DEFAULT_KDF["iters"],
+                    help="PBKDF2-Iterationen der synthetischen Benutzer")
+    ap.add_argument("--out", type=Path, default=Path("bench_results.json"))
+    ap.add_argument("--baseline", type=Path)
+    ap.add_argument("--threshold", type=float, default=0.25, help="erlaubter relativer p50-Anstieg")
+    ap.add_argument("--update-baseline", action="store_true")
+    args = ap.parse_args(argv)
+
+    current = run(args.sizes, args.backends, args.repeat, args.kdf_iters)
+    args.out.write_text(json.dumps(current, indent=2), encoding="utf-8")
+
+    for key, r in current["results"].items():
+        io = f"  r={r['read_bytes_per_op']} w={r['written_bytes_per_op']}" if r.get("read_bytes_per_op") is not None else ""
+        print(f"{key:40} p50={r['p50_ms']:9.3f} ms  p95={r['p95_ms']:9.3f} ms{io}")
+
+    if args.baseline and args.update_baseline:
+        args.baseline.write_text(json.dumps(current, indent=2), encoding="utf-8")
+        print(f"Baseline aktualisiert: {args.baseline}")
+    elif args.baseline and args.baseline.exists():
+        regressions = compare(current, json.loads(args.baseline.read_text(encoding="utf-8")), args.threshold)
+        for key, base, cur, ratio in regressions:
+            print(f"REGRESSION {key}: {base:.3f} -> {cur:.3f} ms ({ratio:.2f}x)")
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
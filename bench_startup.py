@@ -0,0 +1,165 @@
+# bench_startup.py
+"""Startup-Benchmark (Time-to-first-frame) für app.py und das PyInstaller-Bundle.
+
+Startet die App wiederholt headless (QT_QPA_PLATFORM=offscreen, DA_DEV=1) im
+Bench-Modus: app.py schreibt beim ersten Paint des Hauptfensters die Phasen
+(interpreter, imports, qapplication, splash, auto_login, window,
+first_paint) als JSON und beendet sich. Mit --relogin N meldet sie sich
+vorher N-mal im selben Prozess ab und wieder an (Logout -> erster Paint);
+verglichen wird mit dem warmen Gesamtstart, den früher jeder Logout per
+os.execl bezahlt hat.
+
+cold = frisches APPDATA/LOCALAPPDATA (Konfig, Asset-Cache) und leerer
+       Bytecode-Cache (PYTHONPYCACHEPREFIX); der OS-Dateicache bleibt warm.
+warm = gemeinsame Verzeichnisse nach einem ungezählten Vorlauf.
+
+    python bench_startup.py --runs 10 --out startup_results.json
+    python bench_startup.py --targets source --modes warm --relogin 20
+    python bench_startup.py --exe "dist/Digitale Alchemy Studio/Digitale Alchemy Studio.exe"
+    python bench_startup.py --baseline startup_baseline.json --threshold 0.2
+"""
+from __future__ import annotations
+import argparse, json, os, platform, shutil, statistics, subprocess, sys, tempfile, time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent
+DEFAULT_EXE = APP_DIR / "dist" / "Digitale Alchemy Studio" / (
+    "Digitale Alchemy Studio.exe" if sys.platform == "win32" else "Digitale Alchemy Studio")
+
+# ---------------- Ein Lauf ----------------
+
+def _env(state_dir: Path, report: Path, extra: dict) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "QT_QPA_PLATFORM": "offscreen",
+        "DA_DEV": "1",
+        "APPDATA": str(state_dir / "roaming"),
+        "LOCALAPPDATA": str(state_dir / "local"),
+        "PYTHONPYCACHEPREFIX": str(state_dir / "pycache"),
+        "DA_STARTUP_BENCH": str(report),
+    })
+    env.pop("DA_TRACE", None)
+    env.update(extra)
+    return env
+
+def run_once(cmd: list, state_dir: Path, timeout: float, extra_env: dict) -> dict:
+    report = state_dir / f"startup_{time.time_ns()}.json"
+    env = _env(state_dir, report, extra_env)
+    env["DA_STARTUP_T0"] = repr(time.time())
+    t0 = time.perf_counter()
+    proc = subprocess.run(cmd, env=env, cwd=APP_DIR, timeout=timeout,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    wall_ms = (time.perf_counter() - t0) * 1000
+    if not report.exists():
+        raise RuntimeError(f"kein Bericht (exit {proc.returncode}): {proc.stderr.decode(errors='replace')[-500:]}")
+    r = json.loads(report.read_text(encoding="utf-8"))
+    report.unlink()
+    r["wall_ms"] = round(wall_ms, 2)
+    return r
+
+# ---------------- Serien ----------------
+
+def _summary(runs: list) -> dict:
+    def stats(vals):
+        vals = sorted(vals)
+        return {"median": round(statistics.median(vals), 2), "min": round(vals[0], 2),
+                "max": round(vals[-1], 2)}
+    phases = {name: stats([r["phases_ms"][name] for r in runs]) for name in runs[0]["phases_ms"]}
+    out = {"runs": len(runs), "phases_ms": phases,
+           "total_ms": stats([r["total_ms"] for r in runs]),
+           "wall_ms": stats([r["wall_ms"] for r in runs])}
+    relogin = [ms for r in runs for ms in r.get("relogin_ms", [])]
+    if relogin:
+        out["relogin_ms"] = stats(relogin)
+    return out
+
+def run_series(cmd: list, mode: str, runs: int, timeout: float, extra_env: dict) -> dict:
+    results = []
+    if mode == "warm":
+        with tempfile.TemporaryDirectory(prefix="da_startup_") as tmp:
+            run_once(cmd, Path(tmp), timeout, extra_env)     # Vorlauf: Caches füllen
+            for _ in range(runs):
+                results.append(run_once(cmd, Path(tmp), timeout, extra_env))
+    else:
+        for _ in range(runs):
+            tmp = Path(tempfile.mkdtemp(prefix="da_startup_"))
+            try:
+                results.append(run_once(cmd, tmp, timeout, extra_env))
+            finally:
+                shutil.rmtree(tmp, ignore_errors=True)
+    return _summary(results)
+
+def run(targets: dict, modes, runs: int, timeout: float, extra_env: dict) -> dict:
+    out = {"meta": {"python": platform.python_version(), "platform": platform.platform(),
+                    "host": platform.node(), "runs": runs,
+                    "created": time.strftime("%Y-%m-%d %H:%M:%S")},
+           "results": {}}
+    for target, cmd in targets.items():
+        for mode in modes:
+            out["results"][f"{target}/{mode}"] = run_series(cmd, mode, runs, timeout, extra_env)
+    return out
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Serien, deren Median-Gesamtzeit um mehr als threshold gestiegen ist."""
+    regressions = []
+    for key, cur in current["results"].items():
+        base = baseline.get("results", {}).get(key)
+        if base:
+            b, c = base["total_ms"]["median"], cur["total_ms"]["median"]
+            if b > 0 and c / b > 1 + threshold:
+                regressions.append((key, b, c, c / b))
+    return regressions
+
+# ---------------- CLI ----------------
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--modes", nargs="+", choices=["cold", "warm"], default=["cold", "warm"])
+    ap.add_argument("--targets", nargs="+", choices=["source", "frozen"], default=["source", "frozen"])
+    ap.add_argument("--exe", type=Path, default=DEFAULT_EXE, help="PyInstaller-Bundle (frozen)")
+    ap.add_argument("--timeout", type=float, default=60.0, help="Sekunden pro Lauf")
+    ap.add_argument("--relogin", type=int, default=0, help="Logout/Login-Zyklen pro Lauf")
+    ap.add_argument("--env", nargs="*", default=[], metavar="KEY=VALUE",
+                    help="zusätzliche Umgebungsvariablen für die App")
+    ap.add_argument("--out", type=Path, default=Path("startup_results.json"))
+    ap.add_argument("--baseline", type=Path)
+    ap.add_argument("--threshold", type=float, default=0.2, help="erlaubter relativer Anstieg der Median-Gesamtzeit")
+    ap.add_argument("--update-baseline", action="store_true")
+    args = ap.parse_args(argv)
+
+    targets = {}
+    if "source" in args.targets:
+        targets["source"] = [sys.executable, str(APP_DIR / "app.py")]
+    if "frozen" in args.targets:
+        if args.exe.exists():
+            targets["frozen"] = [str(args.exe)]
+        else:
+            print(f"Bundle nicht gefunden, übersprungen: {args.exe}")
+    extra_env = dict(kv.split("=", 1) for kv in args.env)
+    if args.relogin:
+        extra_env["DA_BENCH_RELOGIN"] = str(args.relogin)
+
+    current = run(targets, args.modes, args.runs, args.timeout, extra_env)
+    args.out.write_text(json.dumps(current, indent=2), encoding="utf-8")
+
+    for key, r in current["results"].items():
+        phases = "  ".join(f"{name}={s['median']:.0f}" for name, s in r["phases_ms"].items())
+        print(f"{key:14} total={r['total_ms']['median']:8.1f} ms  wall={r['wall_ms']['median']:8.1f} ms  {phases}")
+        if "relogin_ms" in r:
+            print(f"{'':14} relogin={r['relogin_ms']['median']:.1f} ms (in-process)  "
+                  f"vs. Neustart per os.execl ≈ {r['total_ms']['median']:.1f} ms")
+
+    if args.baseline and args.update_baseline:
+        args.baseline.write_text(json.dumps(current, indent=2), encoding="utf-8")
+        print(f"Baseline aktualisiert: {args.baseline}")
+    elif args.baseline and args.baseline.exists():
+        regressions = compare(current, json.loads(args.baseline.read_text(encoding="utf-8")), args.threshold)
+        for key, base, cur, ratio in regressions:
+            print(f"REGRESSION {key}: {base:.1f} -> {cur:.1f} ms ({ratio:.2f}x)")
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
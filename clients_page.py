@@ -0,0 +1,227 @@
+# clients_page.py
+from __future__ import annotations
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer, Signal
+from PySide6.QtWidgets import (
+    QAbstractItemView, QHeaderView, QHBoxLayout, QLabel, QLineEdit, QPushButton, QTableView, QVBoxLayout, QWidget,
+)
+
+from data_store import CLIENT_COLUMNS, CLIENT_SORTABLE, data_store
+from export_dialog import ExportDialog
+from import_dialog import ImportDialog
+from workers import submit
+
+# ---------------- Model ----------------
+
+class ClientTableModel(QAbstractTableModel):
+    """Kundenliste über SQLite – virtualisiert und seitenweise nachgeladen.
+
+    fetchMore() hängt per Keyset-Paging die nächste Seite an. Gehalten werden
+    nur MAX_PAGES Seiten (LRU); verdrängte Seiten werden beim erneuten
+    Anzeigen über den gemerkten Seitenanfang nachgeladen. Sortierung und
+    Filter laufen in SQL, alle Abfragen im Worker-Pool.
+    """
+
+    PAGE = 200
+    MAX_PAGES = 50
+    HEADERS = ("Kd.-Nr.", "Name", "Ort", "E-Mail", "Geändert")
+
+    countChanged = Signal(int)              # Treffer für den aktuellen Filter
+    pageLoaded = Signal(int, float)         # Seite, Latenz in ms
+    loadFailed = Signal(str)                # Fehlermeldung einer Abfrage
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._text = ""
+        self._sort = "name"
+        self._desc = False
+        self._gen = 0
+        self._rows = 0
+        self._total: Optional[int] = None
+        self._bounds: list[tuple] = []      # (Sortwert, id) der letzten Zeile je Seite
+        self._pages: OrderedDict[int, list] = OrderedDict()
+        self._loading: set[int] = set()
+        self._tasks = []
+        self._exhausted = False
+        self._error: Optional[str] = None   # bis zum nächsten reload() kein Nachladen mehr
+
+    # ----- Abfragen -----
+
+    def reload(self):
+        for t in self._tasks:
+            t.cancel()
+        self._tasks.clear()
+        self.beginResetModel()
+        self._gen += 1
+        self._rows = 0
+        self._total = None
+        self._bounds.clear()
+        self._pages.clear()
+        self._loading.clear()
+        self._exhausted = False
+        self._error = None
+        self.endResetModel()
+        gen, text = self._gen, self._text
+        self._tasks.append(submit(lambda: data_store().count_clients(text),
+                                  on_done=lambda n: self._counted(gen, n),
+                                  on_error=lambda msg: self._failed(gen, None, msg)))
+        self._load(0)
+
+    def _load(self, page: int):
+        if page in self._loading or page > len(self._bounds) or self._error:
+            return
+        self._loading.add(page)
+        gen, text, sort, desc = self._gen, self._text, self._sort, self._desc
+        after = self._bounds[page - 1] if page else None
+        t0 = time.perf_counter()
+
+        def query():
+            return data_store().client_page(text, sort, desc, after, self.PAGE)
+
+        self._tasks = [t for t in self._tasks if not t.done]
+        self._tasks.append(submit(query, on_done=lambda rows: self._loaded(gen, page, rows, t0),
+                                  on_error=lambda msg: self._failed(gen, page, msg)))
+
+    def _counted(self, gen: int, n: int):
+        if gen == self._gen:
+            self._total = n
+            if not self._error:     # Fehlermeldung nicht überschreiben
+                self.countChanged.emit(n)
+
+    def _failed(self, gen: int, page: Optional[int], msg: str):
+        if gen != self._gen:
+            return
+        self._loading.discard(page)
+        self._error = msg or "Unbekannter Fehler"
+        self.loadFailed.emit(self._error)
+
+    def _loaded(self, gen: int, page: int, rows: list, t0: float):
+        if gen != self._gen:
+            return
+        self._loading.discard(page)
+        self._pages[page] = rows
+        self._pages.move_to_end(page)
+        while len(self._pages) > self.MAX_PAGES:
+            self._pages.popitem(last=False)
+        if page == len(self._bounds):
+            # Neue Seite am Ende
+            if len(rows) < self.PAGE:
+                self._exhausted = True
+            if rows:
+                key = CLIENT_COLUMNS.index(self._sort) + 1
+                self._bounds.append((rows[-1][key], rows[-1][0]))
+                self.beginInsertRows(QModelIndex(), self._rows, self._rows + len(rows) - 1)
+                self._rows += len(rows)
+                self.endInsertRows()
+        else:
+            # Verdrängte Seite neu geladen
+            first = page * self.PAGE
+            self.dataChanged.emit(self.index(first, 0), self.index(first + len(rows) - 1, len(CLIENT_COLUMNS) - 1))
+        self.pageLoaded.emit(page, (time.perf_counter() - t0) * 1000)
+
+    # ----- Filter / Sortierung -----
+
+    def set_filter(self, text: str):
+        if text.strip() != self._text:
+            self._text = text.strip()
+            self.reload()
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.AscendingOrder):
+        field = CLIENT_COLUMNS[column]
+        desc = order == Qt.DescendingOrder
+        if field not in CLIENT_SORTABLE or (field, desc) == (self._sort, self._desc):
+            return
+        self._sort, self._desc = field, desc
+        self.reload()
+
+    def total(self) -> Optional[int]:
+        return self._total
+
+    def cached_rows(self) -> int:
+        return sum(len(p) for p in self._pages.values())
+
+    # ----- QAbstractTableModel -----
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(CLIENT_COLUMNS)
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return (not parent.isValid() and not self._exhausted and not self._error
+                and len(self._bounds) not in self._loading)
+
+    def fetchMore(self, parent=QModelIndex()):
+        self._load(len(self._bounds))
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        page, offset = divmod(index.row(), self.PAGE)
+        rows = self._pages.get(page)
+        if rows is None:
+            self._load(page)
+            return "…"
+        self._pages.move_to_end(page)
+        if offset >= len(rows):
+            return None
+        value = rows[offset][index.column() + 1]
+        if CLIENT_COLUMNS[index.column()] == "updated_at":
+            return time.strftime("%d.%m.%Y", time.localtime(value))
+        return value
+
+# ---------------- Page ----------------
+
+class ClientsPage(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        lay = QVBoxLayout(self); lay.setContentsMargins(0, 0, 0, 0); lay.setSpacing(8)
+        top = QHBoxLayout()
+        header = QLabel("Kunden"); header.setObjectName("PageHeader"); top.addWidget(header); top.addStretch(1)
+        self.status = QLabel("Lade …"); self.status.setObjectName("PanelTitle"); top.addWidget(self.status)
+        self.btnImport = QPushButton("Importieren …"); top.addWidget(self.btnImport)
+        self.btnExport = QPushButton("Exportieren …"); top.addWidget(self.btnExport)
+        lay.addLayout(top)
+        self.filter = QLineEdit(); self.filter.setObjectName("FilterEdit")
+        self.filter.setPlaceholderText("Filtern nach Name, Kd.-Nr. oder Ort …"); self.filter.setClearButtonEnabled(True)
+        lay.addWidget(self.filter)
+
+        self.model = ClientTableModel(self)
+        self.table = QTableView(); self.table.setObjectName("DataTable")
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setWordWrap(False)
+        vh = self.table.verticalHeader()
+        vh.hide(); vh.setSectionResizeMode(QHeaderView.Fixed); vh.setDefaultSectionSize(28)
+        hh = self.table.horizontalHeader()
+        hh.setSectionResizeMode(QHeaderView.Interactive); hh.setStretchLastSection(True)
+        for col, width in enumerate((110, 300, 160, 260)):
+            self.table.setColumnWidth(col, width)
+        hh.setSortIndicator(CLIENT_COLUMNS.index("name"), Qt.AscendingOrder)
+        self.table.setSortingEnabled(True)
+        lay.addWidget(self.table, 1)
+
+        # Tippen entprellen: eine Abfrage pro Pause statt pro Taste
+        self._debounce = QTimer(self); self._debounce.setSingleShot(True); self._debounce.setInterval(200)
+        self._debounce.timeout.connect(lambda: self.model.set_filter(self.filter.text()))
+        self.filter.textChanged.connect(self._debounce.start)
+        self.model.countChanged.connect(lambda n: self.status.setText(f"{n:,} Kunden".replace(",", ".")))
+        self.model.loadFailed.connect(lambda msg: self.status.setText(f"Fehler beim Laden: {msg}"))
+        self.btnImport.clicked.connect(self.open_import)
+        self.btnExport.clicked.connect(lambda: ExportDialog("clients", self, text=self.filter.text()).show())
+        self.model.reload()
+
+    def open_import(self):
+        dlg = ImportDialog("clients", self)
+        dlg.imported.connect(lambda _st: self.model.reload())
+        dlg.show()
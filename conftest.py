@@ -0,0 +1,19 @@
+# conftest.py
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# auth legt DATA_DIR beim Import an – nie im echten Profil
+os.environ["APPDATA"] = tempfile.mkdtemp(prefix="da-tests-")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    import auth
+    auth.set_data_dir(tmp_path)
+    yield tmp_path
@@ -0,0 +1,92 @@
+# dashboard_page.py
+from __future__ import annotations
+import time
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QFrame, QHBoxLayout, QLabel, QSizePolicy, QVBoxLayout, QWidget
+
+import animation
+from data_provider import provider
+from data_store import data_store
+from theme import ACCENT, ERROR, SUCCESS, WARN
+
+class StatsCard(QFrame):
+    def __init__(self, title: str, value: int|str = "—", color: str = ACCENT, parent=None):
+        super().__init__(parent)
+        self.setObjectName("StatsCard")
+        self.titleLabel = QLabel(title); self.titleLabel.setObjectName("CardTitle")
+        self.valueLabel = QLabel(str(value)); self.valueLabel.setObjectName("CardValue")
+        lay = QVBoxLayout(self); lay.setContentsMargins(16, 16, 16, 16); lay.setSpacing(6)
+        lay.addWidget(self.titleLabel); lay.addWidget(self.valueLabel, 0, Qt.AlignLeft|Qt.AlignVCenter)
+        self._loaded = False
+
+    def animate_to(self, target_value: int, duration_ms: int = 700):
+        # Läuft über die gemeinsame FrameClock statt über einen eigenen Timer
+        self._loaded = True
+        self.setToolTip("")
+        animation.animate_number(self.valueLabel, target_value, duration_ms)
+
+    def show_error(self, msg: str):
+        # Ein älterer Wert bleibt stehen, der Fehler steht dann im Tooltip
+        if not self._loaded:
+            self.valueLabel.setText("Fehler")
+        self.setToolTip(f"Laden fehlgeschlagen: {msg}")
+
+
+class DashboardPage(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        wrapper = QVBoxLayout(self); wrapper.setContentsMargins(0, 0, 0, 0); wrapper.setSpacing(12)
+        header = QLabel("Dashboard"); header.setObjectName("PageHeader")
+        row = QHBoxLayout(); row.setSpacing(12)
+        self.cardClients = StatsCard("KUNDEN", 0, ACCENT)
+        self.cardInvoicesOpen = StatsCard("OFFENE KUNDENRECHNUNGEN", 0, WARN)
+        self.cardOwnOpen = StatsCard("EIGENE OFFENE RECHNUNGEN", 0, ERROR)
+        self.cardDomains = StatsCard("VERFÜGBARE DOMAINS", "—", SUCCESS)
+        self.cards = (self.cardClients, self.cardInvoicesOpen, self.cardOwnOpen, self.cardDomains)
+        for c in self.cards: c.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        row.addWidget(self.cardClients); row.addWidget(self.cardInvoicesOpen); row.addWidget(self.cardOwnOpen); row.addWidget(self.cardDomains)
+        wrapper.addWidget(header); rowWidget = QWidget(); rowWidget.setLayout(row); wrapper.addWidget(rowWidget)
+        placeholder = QFrame(); placeholder.setObjectName("Placeholder"); placeholder.setMinimumHeight(280)
+        phLay = QVBoxLayout(placeholder); phLay.setContentsMargins(16, 16, 16, 16)
+        phTitle = QLabel("Kürzlich aktualisiert"); phTitle.setObjectName("PanelTitle")
+        self.recentLabel = QLabel("Lade …"); self.recentLabel.setObjectName("PageBody"); self.recentLabel.setTextFormat(Qt.PlainText)
+        phLay.addWidget(phTitle); phLay.addWidget(self.recentLabel); phLay.addStretch(1); wrapper.addWidget(placeholder)
+        self._has_recent = False
+        # Loader je Karte/Panel; Werte kommen aus dem Cache, Nachladen im Worker
+        prov = provider()
+        prov.register("dashboard.counters", lambda: data_store().counters(), ttl=5.0)
+        prov.register("dashboard.recent", lambda: data_store().recent_changes(8), ttl=30.0)
+
+    def showEvent(self, e):
+        super().showEvent(e)
+        self.refresh()
+
+    def refresh(self):
+        prov = provider()
+        prov.get("dashboard.counters", self._show_counters, on_error=self._counters_failed)
+        prov.get("dashboard.recent", self._show_recent, on_error=self._recent_failed)
+
+    def _show_counters(self, c: dict):
+        # Materialisierte Zähler (data_store.COUNTERS): ein SELECT, unabhängig von der Datenmenge
+        self.cardClients.animate_to(c.get("clients", 0))
+        self.cardInvoicesOpen.animate_to(c.get("invoices_open_client", 0))
+        self.cardOwnOpen.animate_to(c.get("invoices_open_own", 0))
+        self.cardDomains.animate_to(c.get("domains_available", 0))
+
+    def _counters_failed(self, msg: str):
+        for c in self.cards:
+            c.show_error(msg)
+
+    def _show_recent(self, rows: list):
+        self._has_recent = True
+        self.recentLabel.setToolTip("")
+        self.recentLabel.setText("\n".join(
+            f"{time.strftime('%d.%m.%Y %H:%M', time.localtime(ts))}   {kind:<9} {label}" for ts, kind, label in rows)
+            or "Noch keine Daten")
+
+    def _recent_failed(self, msg: str):
+        if self._has_recent:
+            self.recentLabel.setToolTip(f"Laden fehlgeschlagen: {msg}")
+        else:
+            self.recentLabel.setText(f"Laden fehlgeschlagen: {msg}")
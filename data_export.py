@@ -0,0 +1,365 @@
+# data_export.py
+"""Export von Kunden und Rechnungen als CSV oder XLSX – gestreamt.
+
+Zeilen kommen seitenweise (Keyset) aus dem Store und gehen direkt in die
+Datei; XLSX wird ohne Zusatzpaket als Zip mit Inline-Strings geschrieben.
+Der Speicherbedarf hängt nicht von der Zeilenzahl ab.
+
+    python data_export.py clients /tmp/kunden.xlsx --columns number,name,city
+    python data_export.py invoices /tmp/rechnungen.csv --from 2025-01 --to 2025-12 --status open
+"""
+from __future__ import annotations
+import csv, os, re, threading, time, zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+from xml.sax.saxutils import escape
+
+from PySide6.QtCore import QObject, Signal
+
+from data_store import DataStore, data_store
+from tracing import span
+from workers import submit
+
+# ---------------- Spalten / Filter ----------------
+
+# Schlüssel -> (Überschrift, SQL-Ausdruck, Typ); Typen: text, date, money
+DATASETS = {
+    "clients": {
+        "title": "Kunden",
+        "from": "clients",
+        "id": "id",
+        "columns": {
+            "number":     ("Kd.-Nr.", "number", "text"),
+            "name":       ("Name", "name", "text"),
+            "city":       ("Ort", "city", "text"),
+            "email":      ("E-Mail", "email", "text"),
+            "created_at": ("Angelegt", "created_at", "date"),
+            "updated_at": ("Geändert", "updated_at", "date"),
+        },
+    },
+    "invoices": {
+        "title": "Rechnungen",
+        "from": "invoices i LEFT JOIN clients c ON c.id = i.client_id",
+        "id": "i.id",
+        "columns": {
+            "number":        ("Rechnungsnr.", "i.number", "text"),
+            "client_number": ("Kd.-Nr.", "c.number", "text"),
+            "client_name":   ("Kunde", "c.name", "text"),
+            "kind":          ("Art", "CASE i.kind WHEN 'own' THEN 'Eigen' ELSE 'Kunde' END", "text"),
+            "status":        ("Status", "CASE i.status WHEN 'paid' THEN 'bezahlt' WHEN 'cancelled' "
+                                        "THEN 'storniert' ELSE 'offen' END", "text"),
+            "amount":        ("Betrag (EUR)", "i.amount_cents", "money"),
+            "issued_at":     ("Datum", "i.issued_at", "date"),
+            "due_at":        ("Fällig am", "i.due_at", "date"),
+            "updated_at":    ("Geändert", "i.updated_at", "date"),
+        },
+    },
+}
+
+def _month_start(month: str, offset: int = 0) -> float:
+    y, m = map(int, month.split("-"))
+    y, m = divmod(y * 12 + m - 1 + offset, 12)
+    return time.mktime((y, m + 1, 1, 0, 0, 0, 0, 0, -1))
+
+def build_filter(dataset: str, filters: dict) -> tuple[str, list]:
+    """filters: clients {text}; invoices {month_from, month_to ("JJJJ-MM"), status, kind}."""
+    if dataset == "clients":
+        return DataStore._client_filter(filters.get("text", ""))
+    conds, params = [], []
+    if filters.get("month_from"):
+        conds.append("i.issued_at >= ?"); params.append(_month_start(filters["month_from"]))
+    if filters.get("month_to"):
+        conds.append("i.issued_at < ?"); params.append(_month_start(filters["month_to"], 1))
+    for key in ("status", "kind"):
+        if filters.get(key):
+            conds.append(f"i.{key} = ?"); params.append(filters[key])
+    return " AND ".join(conds), params
+
+def count_rows(dataset: str, filters: dict) -> int:
+    ds = DATASETS[dataset]
+    where, params = build_filter(dataset, filters)
+    return data_store().query(f"SELECT COUNT(*) FROM {ds['from']}" + (f" WHERE {where}" if where else ""), params)[0][0]
+
+def iter_rows(dataset: str, columns: list[str], filters: dict, page: int = 2000) -> Iterator[tuple]:
+    """Zeilen als Tupel (Reihenfolge wie columns), seitenweise nach id."""
+    ds = DATASETS[dataset]
+    exprs = ", ".join(ds["columns"][c][1] for c in columns)
+    where, params = build_filter(dataset, filters)
+    sql = (f"SELECT {ds['id']}, {exprs} FROM {ds['from']} WHERE "
+           + (f"{where} AND " if where else "") + f"{ds['id']} > ? ORDER BY {ds['id']} LIMIT ?")
+    last = 0
+    while True:
+        rows = data_store().query(sql, params + [last, page])
+        for r in rows:
+            yield r[1:]
+        if len(rows) < page:
+            return
+        last = rows[-1][0]
+
+# ---------------- Writer ----------------
+
+# Zellen mit diesen Anfängen wertet Excel beim Öffnen einer CSV als Formel aus
+_FORMULA_START = ("=", "+", "-", "@", "\t", "\r")
+
+def _text_cell(v) -> str:
+    if v is None:
+        return ""
+    v = str(v)
+    return "'" + v if v.startswith(_FORMULA_START) else v
+
+class CsvWriter:
+    """Semikolon, UTF-8 mit BOM, deutsche Zahlen/Daten – so öffnet Excel die Datei direkt.
+
+    Texte, die wie Formeln beginnen (importierte Namen wie »=HYPERLINK(…)«),
+    bekommen ein führendes Apostroph.
+    """
+
+    def __init__(self, path: Path, headers: list[str], types: list[str]):
+        self.f = open(path, "w", encoding="utf-8-sig", newline="")
+        self.w = csv.writer(self.f, delimiter=";")
+        self.types = types
+        self.w.writerow(headers)
+
+    def write(self, rows: list[tuple]):
+        fmt = [(lambda v: "" if v is None else time.strftime("%d.%m.%Y", time.localtime(v))) if t == "date"
+               else (lambda v: "" if v is None else f"{v / 100:.2f}".replace(".", ",")) if t == "money"
+               else _text_cell if t == "text" else (lambda v: "" if v is None else v) for t in self.types]
+        self.w.writerows([f(v) for f, v in zip(fmt, row)] for row in rows)
+
+    def close(self):
+        self.f.close()
+
+
+_ILLEGAL_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+class XlsxWriter:
+    """Minimaler Write-only-XLSX-Writer: Zeilen gehen sofort in den Zip-Stream.
+
+    Inline-Strings statt Shared-Strings-Tabelle (die müsste bis zum Ende im
+    Speicher bleiben). Mehr als MAX_ROWS Zeilen landen auf Folgeblättern.
+    """
+
+    MAX_ROWS = 1_048_576
+    # Stil-Index in cellXfs: 0 Standard, 1 Datum, 2 Betrag, 3 Überschrift
+    _STYLES = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+               '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+               '<numFmts count="1"><numFmt numFmtId="164" formatCode="#,##0.00"/></numFmts>'
+               '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+               '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+               '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+               '<fill><patternFill patternType="gray125"/></fill></fills>'
+               '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+               '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+               '<cellXfs count="4"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+               '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+               '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+               '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+               '</styleSheet>')
+
+    def __init__(self, path: Path, headers: list[str], types: list[str], sheet_title: str = "Export"):
+        self.zip = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=5)
+        self.headers = headers
+        self.types = types
+        self.title = sheet_title[:25]
+        self.sheets = 0
+        self.rows_in_sheet = 0
+        self.sheet = None
+        self._header_xml = ("<row>" + "".join(f'<c t="inlineStr" s="3"><is><t>{escape(h)}</t></is></c>'
+                                              for h in headers) + "</row>").encode()
+        self._new_sheet()
+
+    def _new_sheet(self):
+        if self.sheet:
+            self.sheet.write(b"</sheetData></worksheet>"); self.sheet.close()
+        self.sheets += 1
+        self.sheet = self.zip.open(f"xl/worksheets/sheet{self.sheets}.xml", "w", force_zip64=True)
+        self.sheet.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                         b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                         b'<sheetViews><sheetView workbookViewId="0"><pane ySplit="1" topLeftCell="A2" '
+                         b'activePane="bottomLeft" state="frozen"/></sheetView></sheetViews><sheetData>')
+        self.sheet.write(self._header_xml)
+        self.rows_in_sheet = 1
+
+    def _cell(self, t: str, v) -> str:
+        if v is None or v == "":
+            return "<c/>"
+        if t == "date":
+            # Excel-Seriennummer in Ortszeit
+            return f'<c s="1"><v>{(v + time.localtime(v).tm_gmtoff) / 86400 + 25569:.6f}</v></c>'
+        if t == "money":
+            return f'<c s="2"><v>{v / 100:.2f}</v></c>'
+        if isinstance(v, (int, float)):
+            return f"<c><v>{v}</v></c>"
+        return f'<c t="inlineStr"><is><t xml:space="preserve">{escape(_ILLEGAL_XML.sub("", str(v)))}</t></is></c>'
+
+    def write(self, rows: list[tuple]):
+        types = self.types
+        while rows:
+            room = self.MAX_ROWS - self.rows_in_sheet
+            if room <= 0:
+                self._new_sheet()
+                continue
+            part, rows = rows[:room], rows[room:]
+            self.sheet.write("".join("<row>" + "".join(self._cell(t, v) for t, v in zip(types, r)) + "</row>"
+                                     for r in part).encode())
+            self.rows_in_sheet += len(part)
+
+    def close(self):
+        self.sheet.write(b"</sheetData></worksheet>"); self.sheet.close()
+        n = self.sheets
+        names = [self.title if n == 1 else f"{self.title} {i}" for i in range(1, n + 1)]
+        ns = 'xmlns="http://schemas.openxmlformats.org/package/2006/'
+        head = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        self.zip.writestr("[Content_Types].xml", head + f'<Types {ns}content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            + "".join(f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+                      f'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                      for i in range(1, n + 1)) + "</Types>")
+        self.zip.writestr("_rels/.rels", head + f'<Relationships {ns}relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/'
+            'officeDocument" Target="xl/workbook.xml"/></Relationships>')
+        self.zip.writestr("xl/workbook.xml", head +
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>'
+            + "".join(f'<sheet name="{escape(name)}" sheetId="{i}" r:id="rId{i}"/>'
+                      for i, name in enumerate(names, 1)) + "</sheets></workbook>")
+        self.zip.writestr("xl/_rels/workbook.xml.rels", head + f'<Relationships {ns}relationships">'
+            + "".join(f'<Relationship Id="rId{i}" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+                      f'relationships/worksheet" Target="worksheets/sheet{i}.xml"/>' for i in range(1, n + 1))
+            + f'<Relationship Id="rId{n + 1}" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+              'relationships/styles" Target="styles.xml"/></Relationships>')
+        self.zip.writestr("xl/styles.xml", self._STYLES)
+        self.zip.close()
+
+
+WRITERS = {".csv": CsvWriter, ".xlsx": XlsxWriter}
+
+# ---------------- Export ----------------
+
+@dataclass
+class ExportStats:
+    rows: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+    cancelled: bool = False
+    path: str = ""
+
+    @property
+    def per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class Exporter:
+    """Store -> Generator -> Writer, blockweise. Geschrieben wird in eine
+    .part-Datei, die erst am Ende umbenannt wird (Abbruch hinterlässt nichts)."""
+
+    def __init__(self, dataset: str, path: Path, columns: Optional[list[str]] = None,
+                 filters: Optional[dict] = None, block: int = 2000):
+        ds = DATASETS[dataset]
+        self.dataset = dataset
+        self.path = Path(path)
+        if self.path.suffix.lower() not in WRITERS:
+            raise ValueError(f"Format nicht unterstützt: {self.path.suffix} (CSV oder XLSX)")
+        self.columns = columns or list(ds["columns"])
+        unknown = [c for c in self.columns if c not in ds["columns"]]
+        if unknown:
+            raise ValueError(f"Unbekannte Spalten: {', '.join(unknown)}")
+        self.filters = filters or {}
+        self.block = block
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self, progress: Optional[Callable[[int, int, float], None]] = None) -> ExportStats:
+        """progress(Zeilen, gesamt, Zeilen/s) nach jedem Block."""
+        ds = DATASETS[self.dataset]
+        total = count_rows(self.dataset, self.filters)
+        headers = [ds["columns"][c][0] for c in self.columns]
+        types = [ds["columns"][c][2] for c in self.columns]
+        tmp = self.path.with_name(self.path.name + ".part")
+        cls = WRITERS[self.path.suffix.lower()]
+        stats = ExportStats(path=str(self.path))
+        t0 = time.perf_counter()
+        writer = cls(tmp, headers, types, ds["title"]) if cls is XlsxWriter else cls(tmp, headers, types)
+        try:
+            try:
+                with span("export.run", dataset=self.dataset, format=self.path.suffix):
+                    rows = iter_rows(self.dataset, self.columns, self.filters, self.block)
+                    while not self._cancel.is_set():
+                        chunk = [r for _, r in zip(range(self.block), rows)]
+                        if not chunk:
+                            break
+                        writer.write(chunk)
+                        stats.rows += len(chunk)
+                        if progress:
+                            elapsed = time.perf_counter() - t0
+                            progress(stats.rows, total, stats.rows / elapsed if elapsed else 0.0)
+            finally:
+                writer.close()
+        except BaseException:
+            tmp.unlink(missing_ok=True)     # erst nach close(), sonst scheitert es unter Windows
+            raise
+        stats.seconds = time.perf_counter() - t0
+        stats.cancelled = self._cancel.is_set()
+        if stats.cancelled:
+            tmp.unlink(missing_ok=True)
+        else:
+            os.replace(tmp, self.path)
+            stats.bytes = self.path.stat().st_size
+        return stats
+
+
+class ExportJob(QObject):
+    """Export im Worker-Thread; Fortschritt per Signal an den GUI-Thread."""
+
+    progress = Signal(int, int, float)      # Zeilen, gesamt, Zeilen/s
+    finished = Signal(object)               # ExportStats
+    failed = Signal(str)
+
+    def __init__(self, exporter: Exporter, parent=None):
+        super().__init__(parent)
+        self.exporter = exporter
+        self.task = None
+
+    def start(self):
+        self.task = submit(lambda: self.exporter.run(self.progress.emit),
+                           on_done=self.finished.emit, on_error=self.failed.emit)
+
+    def cancel(self):
+        self.exporter.cancel()
+
+# ---------------- CLI ----------------
+
+def _cli(argv=None) -> int:
+    import argparse
+    ap = argparse.ArgumentParser(prog="data_export.py", description="Kunden/Rechnungen als CSV oder XLSX exportieren")
+    ap.add_argument("dataset", choices=sorted(DATASETS))
+    ap.add_argument("out", type=Path, help="Zieldatei (.csv oder .xlsx)")
+    ap.add_argument("--columns", help="Spalten, kommagetrennt (Standard: alle)")
+    ap.add_argument("--filter", dest="text", help="Kunden: Präfix auf Name, Kd.-Nr. oder Ort")
+    ap.add_argument("--from", dest="month_from", help="Rechnungen ab Monat JJJJ-MM")
+    ap.add_argument("--to", dest="month_to", help="Rechnungen bis einschließlich Monat JJJJ-MM")
+    ap.add_argument("--status", choices=("open", "paid", "cancelled"))
+    ap.add_argument("--kind", choices=("client", "own"))
+    args = ap.parse_args(argv)
+
+    filters = {k: v for k, v in vars(args).items()
+               if k in ("text", "month_from", "month_to", "status", "kind") and v}
+    exp = Exporter(args.dataset, args.out, args.columns.split(",") if args.columns else None, filters)
+
+    def report(done, total, rate):
+        print(f"\r{done}/{total}  {rate:,.0f} Zeilen/s", end="", flush=True)
+
+    st = exp.run(report)
+    print(f"\n{st.rows} Zeilen, {st.bytes / 1e6:.1f} MB in {st.seconds:.1f} s ({st.per_second:,.0f}/s) -> {st.path}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(_cli())
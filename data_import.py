@@ -0,0 +1,399 @@
+# data_import.py
+"""Import von Kunden und Rechnungen aus CSV- und DATEV-Dateien (EXTF).
+
+Die Datei wird zeilenweise gelesen, Blöcke werden in Worker-Threads
+geprüft und je Block in einer Transaktion geschrieben. Nach jedem Block
+wird ein Prüfpunkt (Byte-Position) gespeichert; ein abgebrochener Import
+setzt dort wieder auf. Der Speicherbedarf hängt nur von der Blockgröße ab.
+
+    python data_import.py sample --clients 500000 --invoices 500000 /tmp/import
+    python data_import.py clients /tmp/import/kunden.csv
+    python data_import.py invoices /tmp/import/rechnungen.csv
+"""
+from __future__ import annotations
+import csv, hashlib, json, os, re, threading, time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from PySide6.QtCore import QObject, Signal
+
+import auth
+from data_store import data_store
+from tracing import span
+from workers import submit
+
+# ---------------- Spalten ----------------
+
+# Feld -> akzeptierte Spaltenüberschriften (klein geschrieben), inkl. DATEV-Bezeichnungen
+FIELDS = {
+    "clients": {
+        "number": ("kundennummer", "kundennr", "kd.-nr.", "kd-nr", "konto", "debitor", "number", "nummer"),
+        "name": ("name", "firma", "unternehmen", "name (adressatentyp unternehmen)", "kunde"),
+        "city": ("ort", "stadt", "city"),
+        "email": ("e-mail", "email", "mail", "e-mail-adresse"),
+    },
+    "invoices": {
+        "number": ("rechnungsnummer", "rechnungsnr", "rechnungsnr.", "rechnung", "belegfeld 1", "number"),
+        "client": ("kundennummer", "kundennr", "kd.-nr.", "konto", "debitor", "kunde", "client"),
+        "amount": ("betrag", "brutto", "bruttobetrag", "umsatz (ohne soll/haben-kz)", "umsatz", "amount"),
+        "issued_at": ("rechnungsdatum", "datum", "belegdatum", "issued_at"),
+        "due_at": ("fällig am", "fällig", "faellig", "fälligkeit", "due_at"),
+        "status": ("status",),
+        "kind": ("art", "kind"),
+    },
+}
+REQUIRED = {"clients": ("number", "name"), "invoices": ("number", "client", "amount", "issued_at")}
+STATUS = {"offen": "open", "open": "open", "bezahlt": "paid", "paid": "paid",
+          "storniert": "cancelled", "cancelled": "cancelled", "": "open"}
+KIND = {"": "client", "kunde": "client", "client": "client", "ausgang": "client",
+        "eigen": "own", "eigene": "own", "own": "own", "eingang": "own"}
+
+def map_header(kind: str, header: list[str]) -> dict[str, int]:
+    """Feld -> Spaltenindex; wirft ValueError, wenn Pflichtfelder fehlen."""
+    names = [h.strip().strip('"').lower() for h in header]
+    out = {}
+    for field_, aliases in FIELDS[kind].items():
+        for i, n in enumerate(names):
+            if n in aliases and i not in out.values():
+                out[field_] = i
+                break
+    missing = [f for f in REQUIRED[kind] if f not in out]
+    if missing:
+        raise ValueError(f"Spalten fehlen: {', '.join(missing)} (gefunden: {', '.join(names)})")
+    return out
+
+# ---------------- Werte ----------------
+
+_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+_NUMBER = re.compile(r"[+-]?\d+(\.\d+)?")
+_THOUSANDS = re.compile(r"[+-]?\d{1,3}(\.\d{3})+")
+
+def parse_amount(text: str) -> int:
+    """'1.234,56' / '1.500' / '1234.56' / '1234,5 €' -> Cent.
+
+    Punkte in Dreiergruppen ohne Komma sind Tausenderpunkte ('1.500' = 1500 €).
+    """
+    t = text.replace("€", "").replace("EUR", "").replace(" ", "").replace("\xa0", "").strip()
+    if not t:
+        raise ValueError("Betrag fehlt")
+    if "," in t and t.rfind(".") > t.rfind(","):
+        t = t.replace(",", "")                      # englisch: 1,234.56
+    elif "," in t:
+        t = t.replace(".", "").replace(",", ".")
+    elif _THOUSANDS.fullmatch(t):
+        t = t.replace(".", "")
+    # Nur Ziffern: kein 'inf', 'nan', '1e400'
+    if not _NUMBER.fullmatch(t):
+        raise ValueError(f"Betrag nicht lesbar: {text!r}")
+    return int((Decimal(t) * 100).quantize(Decimal(1), ROUND_HALF_UP))
+
+def parse_date(text: str) -> float:
+    t = text.strip()
+    for fmt in ("%d.%m.%Y", "%Y-%m-%d", "%d.%m.%y", "%d%m%Y"):
+        try:
+            return time.mktime(time.strptime(t, fmt))
+        except ValueError:
+            pass
+    raise ValueError(f"Datum nicht lesbar: {text!r}")
+
+def validate(kind: str, cols: dict[str, int], rows: list[tuple[int, list[str]]]) -> tuple[list[dict], list[tuple]]:
+    """Prüft einen Block (läuft im Worker-Thread): (gültige Datensätze, [(Zeile, Fehler)])."""
+    ok, errors = [], []
+    for line, raw in rows:
+        get = lambda f: raw[cols[f]].strip() if f in cols and cols[f] < len(raw) else ""
+        try:
+            if kind == "clients":
+                rec = {"number": get("number"), "name": get("name"), "city": get("city"), "email": get("email")}
+                if not rec["number"] or not rec["name"]:
+                    raise ValueError("Kd.-Nr. und Name sind Pflicht")
+                if len(rec["number"]) > 32:
+                    raise ValueError("Kd.-Nr. zu lang")
+                if rec["email"] and not _EMAIL.match(rec["email"]):
+                    raise ValueError(f"E-Mail ungültig: {rec['email']!r}")
+            else:
+                status, kind_ = get("status").lower(), get("kind").lower()
+                if status not in STATUS:
+                    raise ValueError(f"Status unbekannt: {status!r}")
+                if kind_ not in KIND:
+                    raise ValueError(f"Art unbekannt: {kind_!r}")
+                rec = {"number": get("number"), "client": get("client"), "amount_cents": parse_amount(get("amount")),
+                       "issued_at": parse_date(get("issued_at")),
+                       "due_at": parse_date(get("due_at")) if get("due_at") else None,
+                       "status": STATUS[status], "kind": KIND[kind_]}
+                if not rec["number"] or not rec["client"]:
+                    raise ValueError("Rechnungs- und Kd.-Nr. sind Pflicht")
+        except (ValueError, OverflowError) as e:      # OverflowError: mktime bei Jahr 0001 u. ä.
+            errors.append((line, str(e)))
+            continue
+        rec["_line"] = line
+        ok.append(rec)
+    return ok, errors
+
+# ---------------- Datei ----------------
+
+class CsvSource:
+    """Liest eine CSV-/DATEV-Datei blockweise ab einer Byte-Position.
+
+    Kodierung (UTF-8 oder Windows-1252) und Trennzeichen werden aus dem
+    Dateianfang bestimmt; eine DATEV-Kopfzeile ("EXTF") wird übersprungen.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.size = self.path.stat().st_size
+        with open(self.path, "rb") as f:
+            head = f.read(65536)
+        try:
+            head.decode("utf-8")
+            self.encoding = "utf-8-sig"
+        except UnicodeDecodeError as e:
+            # Abgeschnittenes Mehrbyte-Zeichen am Pufferende ist kein Fehler
+            self.encoding = "utf-8-sig" if e.start >= len(head) - 3 else "cp1252"
+        text = head.decode(self.encoding, errors="ignore")
+        first = text.split("\n", 1)[0]
+        self.datev = first.lstrip('"').startswith("EXTF")
+        sample = text.split("\n", 2)[1] if self.datev and "\n" in text else first
+        self.delimiter = max(";,\t|", key=sample.count)
+
+    def read_header(self) -> tuple[list[str], int, int]:
+        """(Spaltenüberschriften, Byte-Position dahinter, Zeilennummer dahinter)."""
+        with open(self.path, "r", encoding=self.encoding, newline="") as f:
+            line = 0
+            if self.datev:
+                f.readline(); line += 1
+            header = next(csv.reader([f.readline()], delimiter=self.delimiter)); line += 1
+            return header, f.tell(), line
+
+    def chunks(self, offset: int, line: int, size: int = 5000) -> Iterator[tuple[list, int, int]]:
+        """Blöcke ([(Zeile, Felder)], Byte-Position danach, Zeilennummer danach)."""
+        with open(self.path, "r", encoding=self.encoding, newline="") as f:
+            f.seek(offset)
+            # readline() statt Iteration: sonst ist f.tell() gesperrt
+            reader = csv.reader(iter(f.readline, ""), delimiter=self.delimiter)
+            block = []
+            for raw in reader:
+                if not any(v.strip() for v in raw):
+                    continue
+                block.append((line + reader.line_num, raw))
+                if len(block) >= size:
+                    yield block, f.tell(), line + reader.line_num
+                    block = []
+            if block:
+                yield block, f.tell(), line + reader.line_num
+
+# ---------------- Import ----------------
+
+def _checkpoint_path(path: Path, kind: str) -> Path:
+    key = hashlib.sha1(f"{kind}:{Path(path).resolve()}".encode()).hexdigest()[:16]
+    return auth.DATA_DIR / "imports" / f"{key}.json"
+
+@dataclass
+class ImportStats:
+    rows: int = 0               # gelesene Datenzeilen (inkl. fehlerhafter)
+    imported: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    cancelled: bool = False
+    resumed_at: int = 0         # Zeile, ab der fortgesetzt wurde (0 = von vorn)
+    resumed_rows: int = 0       # davon schon vor der Fortsetzung gelesen
+    error_file: str = ""
+
+    @property
+    def per_second(self) -> float:
+        # Nur die in diesem Lauf gelesenen Zeilen zählen für die Rate
+        return (self.rows - self.resumed_rows) / self.seconds if self.seconds else 0.0
+
+
+class Importer:
+    """Pipeline: Parser (Generator) -> Prüfung im Thread-Pool -> Schreiben je Block.
+
+    Höchstens workers + 1 Blöcke sind gleichzeitig unterwegs. Geschrieben
+    wird in Dateireihenfolge, damit der Prüfpunkt immer hinter dem letzten
+    vollständig gespeicherten Block liegt. Ein Block, der nach dem Commit,
+    aber vor dem Prüfpunkt abbricht, wird erneut importiert – harmlos, da
+    per Nummer upsertet wird.
+    """
+
+    def __init__(self, kind: str, path: Path, chunk: int = 5000, workers: int = 2):
+        if kind not in FIELDS:
+            raise ValueError(f"Unbekannte Art: {kind}")
+        self.kind = kind
+        self.path = Path(path)
+        self.source = CsvSource(self.path)
+        self.chunk = chunk
+        self.workers = workers
+        self.checkpoint_file = _checkpoint_path(self.path, kind)
+        self.error_file = self.path.with_name(self.path.stem + ".fehler.csv")
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def checkpoint(self) -> Optional[dict]:
+        """Gespeicherter Prüfpunkt, falls er zu genau dieser Datei gehört."""
+        try:
+            cp = json.loads(self.checkpoint_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        st = self.path.stat()
+        return cp if (cp.get("size"), cp.get("mtime")) == (st.st_size, st.st_mtime) else None
+
+    def reset(self):
+        self.checkpoint_file.unlink(missing_ok=True)
+
+    def _save_checkpoint(self, offset: int, line: int, stats: ImportStats):
+        st = self.path.stat()
+        self.checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.checkpoint_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"size": st.st_size, "mtime": st.st_mtime, "offset": offset, "line": line,
+                                   "rows": stats.rows, "imported": stats.imported, "errors": stats.errors}),
+                       encoding="utf-8")
+        os.replace(tmp, self.checkpoint_file)
+
+    def _write(self, records: list[dict]) -> list[tuple]:
+        store = data_store()
+        if self.kind == "clients":
+            store.upsert_clients([{k: v for k, v in r.items() if k != "_line"} for r in records])
+            return []
+        ids = store.client_ids(sorted({r["client"] for r in records}))
+        rows, errors = [], []
+        for r in records:
+            cid = ids.get(r["client"])
+            if cid is None:
+                errors.append((r["_line"], f"Kunde unbekannt: {r['client']!r}"))
+            else:
+                rows.append({k: v for k, v in r.items() if k not in ("_line", "client")} | {"client_id": cid})
+        store.upsert_invoices(rows)
+        return errors
+
+    def run(self, progress: Optional[Callable[[int, int, int, int, float], None]] = None,
+            resume: bool = True) -> ImportStats:
+        """progress(Byte-Position, Dateigröße, importiert, Fehler, Zeilen/s) nach jedem Block."""
+        header, offset, line = self.source.read_header()
+        cols = map_header(self.kind, header)
+        stats = ImportStats(error_file=str(self.error_file))
+        cp = self.checkpoint() if resume else None
+        if cp:
+            offset, line = cp["offset"], cp["line"]
+            stats.imported, stats.errors, stats.resumed_at = cp["imported"], cp["errors"], cp["line"]
+            stats.rows = stats.resumed_rows = cp["rows"]
+        t0 = time.perf_counter()
+        with span("import.run", kind=self.kind), ThreadPoolExecutor(self.workers) as pool, \
+                open(self.error_file, "a" if cp else "w", encoding="utf-8", newline="") as ef:
+            errw = csv.writer(ef, delimiter=";")
+            if not cp:
+                errw.writerow(["Zeile", "Fehler"])
+            pending: deque = deque()
+
+            def commit():
+                fut, n, end, end_line = pending.popleft()
+                records, errors = fut.result()
+                with data_store().transaction():
+                    errors += self._write(records)
+                stats.rows += n
+                stats.imported += len(records) - sum(1 for e in errors if e[1].startswith("Kunde unbekannt"))
+                stats.errors += len(errors)
+                errw.writerows(sorted(errors)); ef.flush()
+                self._save_checkpoint(end, end_line, stats)
+                if progress:
+                    elapsed = time.perf_counter() - t0
+                    progress(end, self.source.size, stats.imported, stats.errors,
+                             (stats.rows - stats.resumed_rows) / elapsed if elapsed else 0.0)
+
+            for block, end, end_line in self.source.chunks(offset, line, self.chunk):
+                pending.append((pool.submit(validate, self.kind, cols, block), len(block), end, end_line))
+                if len(pending) > self.workers:
+                    commit()
+                if self._cancel.is_set():
+                    break
+            while pending:
+                commit()
+        stats.seconds = time.perf_counter() - t0
+        stats.cancelled = self._cancel.is_set()
+        if not stats.cancelled:
+            self.reset()
+        return stats
+
+
+class ImportJob(QObject):
+    """Import im Worker-Thread; Fortschritt per Signal an den GUI-Thread."""
+
+    progress = Signal(int, int, int, int, float)    # Position, Größe, importiert, Fehler, Zeilen/s
+    finished = Signal(object)                       # ImportStats
+    failed = Signal(str)
+
+    def __init__(self, importer: Importer, resume: bool = True, parent=None):
+        super().__init__(parent)
+        self.importer = importer
+        self.resume = resume
+        self.task = None
+
+    def start(self):
+        self.task = submit(lambda: self.importer.run(self.progress.emit, self.resume),
+                           on_done=self.finished.emit, on_error=self.failed.emit)
+
+    def cancel(self):
+        self.importer.cancel()
+
+# ---------------- Beispieldateien / CLI ----------------
+
+def write_sample(out_dir: Path, clients: int, invoices: int, bad_every: int = 1000) -> tuple[Path, Path]:
+    """Kunden (UTF-8, ';') und Rechnungen (DATEV-Kopf, Windows-1252) mit eingestreuten Fehlern."""
+    import random
+    rnd = random.Random(3)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cpath, ipath = out_dir / "kunden.csv", out_dir / "rechnungen.csv"
+    with open(cpath, "w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f, delimiter=";")
+        w.writerow(["Kundennummer", "Firma", "Ort", "E-Mail"])
+        for i in range(1, clients + 1):
+            mail = "kaputt" if i % bad_every == 0 else f"kontakt{i}@beispiel.de"
+            w.writerow([f"I{i:07d}", f"Import {rnd.choice(('Müller', 'Schäfer', 'Weiß'))} {i} GmbH",
+                        rnd.choice(("Köln", "Görlitz", "Lübeck")), mail])
+    with open(ipath, "w", encoding="cp1252", newline="") as f:
+        f.write('"EXTF";700;21;"Buchungsstapel";13;;;;;;;;;;;;;;;;;;;\r\n')
+        w = csv.writer(f, delimiter=";")
+        w.writerow(["Belegfeld 1", "Konto", "Umsatz (ohne Soll/Haben-Kz)", "Belegdatum", "Fällig am", "Status"])
+        for i in range(1, invoices + 1):
+            amount = f"{rnd.randint(50, 5000)},{rnd.randint(0, 99):02d}" if i % bad_every else "zwölf"
+            w.writerow([f"IR{i:08d}", f"I{rnd.randint(1, max(clients, 1)):07d}", amount,
+                        f"{rnd.randint(1, 28):02d}.{rnd.randint(1, 12):02d}.2025", "",
+                        rnd.choice(("offen", "bezahlt"))])
+    return cpath, ipath
+
+def _cli(argv=None) -> int:
+    import argparse
+    ap = argparse.ArgumentParser(prog="data_import.py", description="CSV-/DATEV-Import")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    for kind in ("clients", "invoices"):
+        p = sub.add_parser(kind, help=f"{'Kunden' if kind == 'clients' else 'Rechnungen'} importieren")
+        p.add_argument("file", type=Path)
+        p.add_argument("--restart", action="store_true", help="Prüfpunkt ignorieren")
+        p.add_argument("--chunk", type=int, default=5000)
+    sp = sub.add_parser("sample", help="Beispieldateien erzeugen")
+    sp.add_argument("out", type=Path)
+    sp.add_argument("--clients", type=int, default=100_000)
+    sp.add_argument("--invoices", type=int, default=100_000)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "sample":
+        for p in write_sample(args.out, args.clients, args.invoices):
+            print(f"{p} ({p.stat().st_size / 1e6:.1f} MB)")
+        return 0
+    imp = Importer(args.cmd, args.file, args.chunk)
+
+    def report(pos, size, imported, errors, rate):
+        print(f"\r{pos / size:6.1%}  {imported} importiert, {errors} Fehler, {rate:,.0f} Zeilen/s", end="", flush=True)
+
+    st = imp.run(report, resume=not args.restart)
+    print(f"\n{st.imported} importiert, {st.errors} Fehler ({st.error_file}) in {st.seconds:.1f} s"
+          + (f", fortgesetzt ab Zeile {st.resumed_at}" if st.resumed_at else ""))
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(_cli())
@@ -0,0 +1,146 @@
+# data_provider.py
+from __future__ import annotations
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from PySide6.QtCore import QObject, Signal
+
+from tracing import span
+from workers import data_pool, submit
+
+# ---------------- Data provider ----------------
+
+@dataclass
+class _Source:
+    loader: Callable
+    ttl: float
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    loads: int = 0
+    errors: int = 0
+    load_ms: float = 0.0
+    last_load_ms: float = 0.0
+
+@dataclass
+class _Entry:
+    value: object = None
+    loaded_at: float = 0.0
+    has_value: bool = False
+    waiting: list = field(default_factory=list)     # (callback, on_error) bis zum nächsten Ergebnis
+    task: object = None
+
+
+class DataProvider(QObject):
+    """Karten und Panels deklarieren Loader; get() liefert sofort den Cache
+    (auch abgelaufen) und lädt im Worker-Pool nach (stale-while-revalidate).
+
+    Parallele Anfragen für denselben Schlüssel teilen sich einen Ladevorgang.
+    Aller Zustand lebt im GUI-Thread, nur der Loader läuft im Worker.
+    """
+
+    updated = Signal(str, object)       # Schlüssel, neuer Wert
+    failed = Signal(str, str)           # Schlüssel, Fehlermeldung
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._sources: dict[str, _Source] = {}
+        self._entries: dict[tuple, _Entry] = {}
+
+    def register(self, name: str, loader: Callable, ttl: float = 30.0):
+        if name not in self._sources:
+            self._sources[name] = _Source(loader, ttl)
+
+    def get(self, name: str, callback: Optional[Callable] = None, *args, force: bool = False,
+            on_error: Optional[Callable[[str], None]] = None):
+        """Gecachten Wert sofort an callback, frischen Wert nach dem Laden erneut.
+
+        Schlägt das Laden fehl, bekommt on_error die Fehlermeldung. Liefert den
+        gecachten Wert (oder None) auch direkt zurück.
+        """
+        src = self._sources[name]
+        key = (name, args)
+        e = self._entries.setdefault(key, _Entry())
+        fresh = e.has_value and time.monotonic() - e.loaded_at < src.ttl and not force
+        if e.has_value:
+            if fresh:
+                src.hits += 1
+            else:
+                src.stale += 1
+            if callback:
+                callback(e.value)
+        else:
+            src.misses += 1
+        if not fresh:
+            if callback or on_error:
+                e.waiting.append((callback, on_error))
+            self._revalidate(name, key, e, args)
+        return e.value
+
+    def _revalidate(self, name: str, key: tuple, e: _Entry, args: tuple):
+        if e.task is not None:
+            return      # läuft schon – Anfrage wird mitbedient
+        src = self._sources[name]
+        t0 = time.perf_counter()
+
+        def load():
+            with span("provider.load", source=name):
+                return src.loader(*args)
+
+        e.task = submit(load, pool=data_pool(),
+                        on_done=lambda v: self._done(name, key, v, t0),
+                        on_error=lambda msg: self._failed(name, key, msg))
+
+    def _done(self, name: str, key: tuple, value, t0: float):
+        src, e = self._sources[name], self._entries[key]
+        src.loads += 1
+        src.last_load_ms = (time.perf_counter() - t0) * 1000
+        src.load_ms += src.last_load_ms
+        e.value, e.loaded_at, e.has_value, e.task = value, time.monotonic(), True, None
+        waiting, e.waiting = e.waiting, []
+        self._deliver(waiting, 0, value)
+        self.updated.emit(name, value)
+
+    def _failed(self, name: str, key: tuple, msg: str):
+        # Alter Wert bleibt stehen; nächster get() versucht es erneut
+        self._sources[name].errors += 1
+        e = self._entries[key]
+        waiting, e.task, e.waiting = e.waiting, None, []
+        self._deliver(waiting, 1, msg)
+        self.failed.emit(name, msg)
+
+    @staticmethod
+    def _deliver(waiting: list, slot: int, arg):
+        for callbacks in waiting:
+            cb = callbacks[slot]
+            if cb is None:
+                continue
+            try:
+                cb(arg)
+            except RuntimeError:
+                pass    # Empfänger-Widget wurde inzwischen gelöscht
+
+    def invalidate(self, prefix: str = ""):
+        for (name, _), e in self._entries.items():
+            if name.startswith(prefix):
+                e.loaded_at = 0.0
+
+    def stats(self) -> dict:
+        out = {}
+        for name, s in self._sources.items():
+            requests = s.hits + s.stale + s.misses
+            out[name] = {"requests": requests, "hit_rate": round(s.hits / requests, 3) if requests else None,
+                         "stale": s.stale, "misses": s.misses, "loads": s.loads, "errors": s.errors,
+                         "avg_load_ms": round(s.load_ms / s.loads, 2) if s.loads else None,
+                         "last_load_ms": round(s.last_load_ms, 2)}
+        return out
+
+
+_provider: Optional[DataProvider] = None
+
+def provider() -> DataProvider:
+    global _provider
+    if _provider is None:
+        _provider = DataProvider()
+    return _provider
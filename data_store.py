@@ -0,0 +1,613 @@
+# data_store.py
+"""Geschäftsdaten (Kunden, Rechnungen, Domains, Verträge) in SQLite.
+
+Jeder Thread bekommt eine eigene Verbindung (WAL: Leser blockieren den
+Schreiber nicht). Listenabfragen laufen per Keyset-Paging über Indizes –
+die Kosten einer Seite hängen nicht von der Tabellengröße ab.
+
+    python data_store.py seed --clients 1000000
+    python data_store.py bench
+    python data_store.py search "nova berlin"
+"""
+from __future__ import annotations
+import random, sqlite3, threading, time, unicodedata, weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+import auth
+from tracing import span
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clients (
+    id         INTEGER PRIMARY KEY,
+    number     TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    name       TEXT NOT NULL COLLATE NOCASE,
+    city       TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    email      TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS clients_name ON clients(name);
+CREATE INDEX IF NOT EXISTS clients_city ON clients(city);
+CREATE INDEX IF NOT EXISTS clients_updated ON clients(updated_at);
+
+CREATE TABLE IF NOT EXISTS invoices (
+    id           INTEGER PRIMARY KEY,
+    number       TEXT NOT NULL UNIQUE,
+    client_id    INTEGER REFERENCES clients(id) ON DELETE CASCADE,
+    kind         TEXT NOT NULL DEFAULT 'client' CHECK (kind IN ('client', 'own')),
+    status       TEXT NOT NULL DEFAULT 'open' CHECK (status IN ('open', 'paid', 'cancelled')),
+    amount_cents INTEGER NOT NULL DEFAULT 0,
+    issued_at    REAL NOT NULL,
+    due_at       REAL,
+    updated_at   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS invoices_client ON invoices(client_id);
+CREATE INDEX IF NOT EXISTS invoices_updated ON invoices(updated_at);
+
+CREATE TABLE IF NOT EXISTS domains (
+    id         INTEGER PRIMARY KEY,
+    name       TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    client_id  INTEGER REFERENCES clients(id) ON DELETE SET NULL,
+    status     TEXT NOT NULL DEFAULT 'unknown',
+    checked_at REAL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS domains_updated ON domains(updated_at);
+
+-- Cache des Domain-Checkers: beliebige geprüfte Namen, getrennt von den eigenen Domains
+CREATE TABLE IF NOT EXISTS domain_checks (
+    name       TEXT PRIMARY KEY COLLATE NOCASE,
+    status     TEXT NOT NULL,
+    checked_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS domain_checks_at ON domain_checks(checked_at);
+
+CREATE TABLE IF NOT EXISTS contracts (
+    id         INTEGER PRIMARY KEY,
+    client_id  INTEGER REFERENCES clients(id) ON DELETE CASCADE,
+    title      TEXT NOT NULL,
+    starts_at  REAL,
+    ends_at    REAL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS contracts_client ON contracts(client_id);
+"""
+
+# ---------------- Materialisierte Zähler ----------------
+#
+# Name -> (Tabelle, Bedingung, Wert je Zeile). Trigger halten die Zähler bei
+# jedem INSERT/UPDATE/DELETE aktuell; das Dashboard liest nur noch die
+# Tabelle counters (O(1) statt COUNT(*) über alle Rechnungen).
+COUNTERS = {
+    "clients":              ("clients",  "1", "1"),
+    "invoices_open_client": ("invoices", "{r}.kind = 'client' AND {r}.status = 'open'", "1"),
+    "invoices_open_client_cents": ("invoices", "{r}.kind = 'client' AND {r}.status = 'open'", "{r}.amount_cents"),
+    "invoices_open_own":    ("invoices", "{r}.kind = 'own' AND {r}.status = 'open'", "1"),
+    # Freie Namen aus den Prüfergebnissen des Domain-Checkers (nicht nur eigene Domains)
+    "domains_available":    ("domain_checks", "{r}.status = 'available'", "1"),
+}
+
+def _counter_sql() -> str:
+    parts = ["CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL) WITHOUT ROWID;"]
+    # Vorgänger zählten domains_available auf der Tabelle domains
+    parts += [f"DROP TRIGGER IF EXISTS domains_cnt_{op};" for op in ("ins", "upd", "del")]
+    for table in sorted({t for t, _, _ in COUNTERS.values()}):
+        def delta(r, op, only_conditional=False):
+            return " ".join(
+                f"UPDATE counters SET value = value {op} (CASE WHEN {cond.format(r=r)} THEN {val.format(r=r)} ELSE 0 END) "
+                f"WHERE name = '{name}';"
+                for name, (t, cond, val) in COUNTERS.items()
+                if t == table and not (only_conditional and cond == "1"))
+        parts.append(f"CREATE TRIGGER IF NOT EXISTS {table}_cnt_ins AFTER INSERT ON {table} BEGIN "
+                     f"{delta('NEW', '+')} END;")
+        parts.append(f"CREATE TRIGGER IF NOT EXISTS {table}_cnt_del AFTER DELETE ON {table} BEGIN "
+                     f"{delta('OLD', '-')} END;")
+        # Reine Zeilenzähler ändern sich bei UPDATE nicht
+        if delta("OLD", "-", True):
+            parts.append(f"CREATE TRIGGER IF NOT EXISTS {table}_cnt_upd AFTER UPDATE ON {table} BEGIN "
+                         f"{delta('OLD', '-', True)} {delta('NEW', '+', True)} END;")
+    return "\n".join(parts)
+
+# ---------------- Volltextsuche ----------------
+#
+# Ein FTS5-Index über alle Geschäftsdaten. rowid = id * 4 + Art.
+# Trigger schreiben nur die geänderten rowids in search_queue; der Index
+# wird beim Commit in einem Rutsch nachgezogen (sync_search). FTS5 direkt
+# aus Zeilen-Triggern zu beschreiben ist bei Massenimporten ~4x langsamer,
+# weil jede Trigger-Ausführung die Puffer von FTS5 leert.
+# search_title indiziert nur die Titel (Inhalt aus search); Titeltreffer
+# kommen zuerst, siehe DataStore.search.
+SEARCH_KINDS = {
+    # Art: (Code, Tabelle, Titel, Zusatz)
+    "client":   (0, "clients",   "{r}.number || ' ' || {r}.name", "{r}.city || ' ' || {r}.email"),
+    "invoice":  (1, "invoices",  "{r}.number", "{r}.status"),
+    "domain":   (2, "domains",   "{r}.name", "{r}.status"),
+    "contract": (3, "contracts", "{r}.title", "''"),
+}
+_SEARCH_BY_CODE = {code: kind for kind, (code, *_) in SEARCH_KINDS.items()}
+
+def _search_sql() -> str:
+    parts = ["CREATE VIRTUAL TABLE IF NOT EXISTS search USING fts5("
+             "title, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3 4');",
+             # Nur Titel, Inhalt kommt aus search: Titelstufen kosten so nur Titeltreffer
+             "CREATE VIRTUAL TABLE IF NOT EXISTS search_title USING fts5("
+             "title, content = 'search', tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3 4');",
+             # Ohne Eindeutigkeit: INSERT OR IGNORE im Trigger würde von UPSERTs überstimmt
+             "CREATE TABLE IF NOT EXISTS search_queue (ref INTEGER NOT NULL);"]
+    for kind, (code, table, title, body) in SEARCH_KINDS.items():
+        # Vorgänger schrieben direkt in den Index
+        parts += [f"DROP TRIGGER IF EXISTS {table}_fts_{op};" for op in ("ins", "upd", "del")]
+        # ids ändern sich nie, bei UPDATE genügt NEW
+        for op, event, refs in (("ins", "INSERT", ("NEW",)), ("del", "DELETE", ("OLD",)),
+                                ("upd", "UPDATE", ("NEW",))):
+            values = ", ".join(f"({r}.id * 4 + {code})" for r in refs)
+            parts.append(f"CREATE TRIGGER IF NOT EXISTS {table}_ftsq_{op} AFTER {event} ON {table} BEGIN "
+                         f"INSERT INTO search_queue VALUES {values}; END;")
+    return "\n".join(parts)
+
+def _words(text: str) -> list[str]:
+    # Wie der unicode61-Tokenizer: Kleinschreibung, ohne Diakritika
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c if c.isalnum() else " " for c in text if not unicodedata.combining(c)).split()
+
+def fts_query(text: str, prefix: bool = True) -> str:
+    """Nutzereingabe -> FTS5-Ausdruck: jedes Wort (als Präfix), alle müssen passen."""
+    return " ".join(f'"{w}"*' if prefix else f'"{w}"' for w in _words(text))
+
+def _score(words: list[str], title: str, body: str) -> float:
+    # Ersatzrangfolge für sehr breite Stufen (siehe DataStore.search): alle
+    # Kandidaten enthalten jedes Wort, der IDF-Anteil von bm25 ist für sie
+    # also gleich. Übrig bleibt: Spalte (Titel x10), ganzes Wort vor Präfix,
+    # kürzere Titel vor längeren.
+    score = 0.0
+    for weight, tokens in ((10.0, _words(title)), (1.0, _words(body))):
+        for w in words:
+            hit = max((1.0 if t == w else 0.5 if t.startswith(w) else 0.0) for t in tokens) if tokens else 0.0
+            score += weight * hit / (0.25 + 0.75 * len(tokens) / 3)
+    return score
+
+# Sortierbare Kundenspalten (Whitelist, alle indiziert) – Reihenfolge = Tabellenspalten
+CLIENT_COLUMNS = ("number", "name", "city", "email", "updated_at")
+CLIENT_SORTABLE = {"number", "name", "city", "updated_at"}
+
+# ---------------- Store ----------------
+
+class _Lease:
+    """Verbindung eines Python-Threadzustands samt Transaktionstiefe."""
+    __slots__ = ("db", "depth", "__weakref__")
+
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+        self.depth = 0
+
+
+class DataStore:
+    # So viele freie Verbindungen bleiben offen, der Rest wird geschlossen
+    IDLE_CONNECTIONS = 4
+
+    def __init__(self, path: Path):
+        self.path = path
+        # Verbindung je Threadzustand (threading.local). Pool-Threads von Qt
+        # bekommen je Task einen neuen Zustand; endet er, geht die Verbindung
+        # per Finalizer zurück in einen kleinen Pool statt offen zu bleiben.
+        self._local = threading.local()
+        self._idle: list[sqlite3.Connection] = []
+        self._open: set[sqlite3.Connection] = set()
+        self._lock = threading.RLock()      # Finalizer können in jedem Thread laufen
+        fresh_index = not self.query("SELECT 1 FROM sqlite_master WHERE name = 'search'")
+        fresh_titles = not self.query("SELECT 1 FROM sqlite_master WHERE name = 'search_title'")
+        old_counters = bool(self.query("SELECT 1 FROM sqlite_master WHERE name = 'domains_cnt_ins'"))
+        self.conn().executescript(SCHEMA + _counter_sql() + _search_sql())
+        if old_counters or len(self.query("SELECT name FROM counters")) < len(COUNTERS):
+            self.rebuild_counters()
+        if fresh_index:
+            self.rebuild_search()
+        elif fresh_titles:
+            with span("data.rebuild_search_title"), self.transaction() as db:
+                db.execute("INSERT INTO search_title (rowid, title) SELECT rowid, title FROM search")
+        else:
+            with self.transaction():
+                pass    # Reste aus Schreibzugriffen ohne transaction() nachziehen
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("PRAGMA foreign_keys=ON")
+        db.execute("PRAGMA busy_timeout=5000")
+        return db
+
+    def _lease(self) -> _Lease:
+        lease = getattr(self._local, "lease", None)
+        if lease is None:
+            with self._lock:
+                db = self._idle.pop() if self._idle else None
+            if db is None:
+                db = self._connect()
+                with self._lock:
+                    self._open.add(db)
+            lease = self._local.lease = _Lease(db)
+            weakref.finalize(lease, self._release, db)
+        return lease
+
+    def _release(self, db: sqlite3.Connection):
+        # Läuft beim Abbau des Threadzustands (auch in fremden Threads)
+        with self._lock:
+            if db not in self._open:
+                return                      # schon von close() geschlossen
+            if not db.in_transaction and len(self._idle) < self.IDLE_CONNECTIONS:
+                self._idle.append(db)
+                return
+            self._open.discard(db)
+        db.close()                          # offene Transaktion wird dabei verworfen
+
+    def conn(self) -> sqlite3.Connection:
+        return self._lease().db
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        lease = self._lease()
+        db = lease.db
+        if not lease.depth:
+            db.execute("BEGIN IMMEDIATE")
+        lease.depth += 1
+        try:
+            yield db
+        except BaseException:
+            lease.depth -= 1
+            if not lease.depth:
+                db.execute("ROLLBACK")
+            raise
+        lease.depth -= 1
+        if not lease.depth:
+            try:
+                self.sync_search(db)
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+
+    def connections(self) -> int:
+        return len(self._open)
+
+    def query(self, sql: str, params=()) -> list:
+        return self.conn().execute(sql, params).fetchall()
+
+    def close(self):
+        with self._lock:
+            for db in self._open:
+                db.close()
+            self._open.clear()
+            self._idle.clear()
+        self._local = threading.local()
+
+    # ----- Zähler -----
+
+    def counters(self) -> dict:
+        return dict(self.query("SELECT name, value FROM counters"))
+
+    def rebuild_counters(self, fix: bool = True) -> dict:
+        """Zähler per Vollscan nachzählen; liefert Abweichungen {name: (gespeichert, echt)}."""
+        diff = {}
+        with span("data.rebuild_counters"), self.transaction() as db:
+            stored = dict(db.execute("SELECT name, value FROM counters").fetchall())
+            for name, (table, cond, val) in COUNTERS.items():
+                actual = db.execute(f"SELECT COALESCE(SUM(CASE WHEN {cond.format(r=table)} "
+                                    f"THEN {val.format(r=table)} ELSE 0 END), 0) FROM {table}").fetchone()[0]
+                if stored.get(name) != actual:
+                    diff[name] = (stored.get(name), actual)
+                    if fix:
+                        db.execute("INSERT OR REPLACE INTO counters VALUES (?, ?)", (name, actual))
+        return diff
+
+    # ----- Volltextsuche -----
+
+    def sync_search(self, db: sqlite3.Connection):
+        """Vorgemerkte Änderungen in den Index übernehmen (innerhalb der laufenden Transaktion)."""
+        if not db.execute("SELECT EXISTS (SELECT 1 FROM search_queue)").fetchone()[0]:
+            return
+        with span("data.sync_search"):
+            # search_title braucht zum Löschen die alten Titel – also vor search
+            db.execute("INSERT INTO search_title (search_title, rowid, title) SELECT 'delete', rowid, title "
+                       "FROM search WHERE rowid IN (SELECT ref FROM search_queue)")
+            db.execute("DELETE FROM search WHERE rowid IN (SELECT ref FROM search_queue)")
+            for kind, (code, table, title, body) in SEARCH_KINDS.items():
+                db.execute(f"INSERT INTO search (rowid, title, body) SELECT q.ref, {title.format(r='t')}, "
+                           f"{body.format(r='t')} FROM (SELECT DISTINCT ref FROM search_queue) q "
+                           f"JOIN {table} t ON t.id = q.ref / 4 WHERE q.ref % 4 = {code}")
+            db.execute("INSERT INTO search_title (rowid, title) SELECT rowid, title "
+                       "FROM search WHERE rowid IN (SELECT ref FROM search_queue)")
+            db.execute("DELETE FROM search_queue")
+
+    def rebuild_search(self) -> int:
+        """Suchindex komplett neu aufbauen (nur nötig für Altbestände); liefert Einträge."""
+        with span("data.rebuild_search"), self.transaction() as db:
+            db.execute("DELETE FROM search")
+            db.execute("DELETE FROM search_queue")
+            for kind, (code, table, title, body) in SEARCH_KINDS.items():
+                db.execute(f"INSERT INTO search (rowid, title, body) SELECT id * 4 + {code}, "
+                           f"{title.format(r=table)}, {body.format(r=table)} FROM {table}")
+            db.execute("INSERT INTO search (search) VALUES ('optimize')")
+            # 'rebuild' kann nicht aus einer FTS5-Tabelle lesen – daher von Hand
+            db.execute("INSERT INTO search_title (search_title) VALUES ('delete-all')")
+            db.execute("INSERT INTO search_title (rowid, title) SELECT rowid, title FROM search")
+            return db.execute("SELECT COUNT(*) FROM search").fetchone()[0]
+
+    # Bis zu so vielen Treffern je Stufe wird exakt per bm25 sortiert (~2 µs pro Treffer)
+    RANK_LIMIT = 5_000
+
+    def search(self, text: str, limit: int = 20, scan: int = 1000) -> list[tuple]:
+        """Beste Treffer zuerst: (Art, id, Titel, Zusatz).
+
+        Drei Stufen: ganze Wörter im Titel, Präfixe im Titel (beide über
+        search_title), Präfixe in Titel oder Zusatz mit bm25(search, 10, 1).
+        Hat eine Stufe mehr als RANK_LIMIT Treffer (»gmbh«, »ber«), müsste
+        ORDER BY alle lesen; dann werden nur scan Kandidaten per _score bewertet.
+        """
+        words = _words(text)
+        if not words:
+            return []
+        stages = (("search_title", "bm25(search_title)", fts_query(text, prefix=False)),
+                  ("search_title", "bm25(search_title)", fts_query(text)),
+                  ("search", "bm25(search, 10, 1)", fts_query(text)))
+        found, seen = [], set()
+        with span("data.search"):
+            for table, rank, expr in stages:
+                n = self.query(f"SELECT COUNT(*) FROM (SELECT 1 FROM {table} WHERE {table} MATCH ? LIMIT ?)",
+                               (expr, self.RANK_LIMIT + 1))[0][0]
+                if not n:
+                    continue
+                if n <= self.RANK_LIMIT:
+                    refs = [r for r, in self.query(f"SELECT rowid FROM {table} WHERE {table} MATCH ? "
+                                                   f"ORDER BY {rank} LIMIT ?", (expr, limit + len(seen)))]
+                else:
+                    cand = self._search_rows([r for r, in self.query(
+                        f"SELECT rowid FROM {table} WHERE {table} MATCH ? LIMIT ?", (expr, scan))])
+                    refs = sorted(cand, key=lambda r: (-_score(words, *cand[r]), r))
+                refs = [r for r in refs if r not in seen][:limit - len(found)]
+                seen.update(refs)
+                found += refs
+                if len(found) >= limit:
+                    break
+            rows = self._search_rows(found)
+        return [(_SEARCH_BY_CODE[ref % 4], ref // 4, *rows[ref]) for ref in found if ref in rows]
+
+    def _search_rows(self, refs: list[int]) -> dict:
+        # rowid -> (Titel, Zusatz); IN-Liste in Blöcken unter dem Variablenlimit
+        rows = {}
+        for i in range(0, len(refs), 500):
+            part = refs[i:i + 500]
+            rows.update((r, (t, b)) for r, t, b in self.query(
+                f"SELECT rowid, title, body FROM search WHERE rowid IN ({','.join('?' * len(part))})", part))
+        return rows
+
+    # ----- Letzte Änderungen -----
+
+    def recent_changes(self, limit: int = 8) -> list[tuple]:
+        """(Zeitpunkt, Art, Bezeichnung) der zuletzt geänderten Datensätze (über updated_at-Indizes)."""
+        rows = []
+        for kind, sql in (
+                ("Kunde", "SELECT updated_at, number || ' · ' || name FROM clients ORDER BY updated_at DESC LIMIT ?"),
+                ("Rechnung", "SELECT updated_at, number || ' · ' || status FROM invoices ORDER BY updated_at DESC LIMIT ?"),
+                ("Domain", "SELECT updated_at, name || ' · ' || status FROM domains ORDER BY updated_at DESC LIMIT ?")):
+            rows += [(ts, kind, label) for ts, label in self.query(sql, (limit,))]
+        rows.sort(reverse=True)
+        return rows[:limit]
+
+    # ----- Domains -----
+
+    def domain_checks(self, names: list[str]) -> dict[str, tuple[str, float]]:
+        """Letztes Prüfergebnis je Name aus dem Cache: {Name: (Status, checked_at)}."""
+        out = {}
+        for i in range(0, len(names), 500):
+            chunk = names[i:i + 500]
+            out.update((n, (st, at)) for n, st, at in self.query(
+                f"SELECT name, status, checked_at FROM domain_checks "
+                f"WHERE name IN ({','.join('?' * len(chunk))})", chunk))
+        return out
+
+    def save_domain_checks(self, results: dict[str, str], checked_at: float, expire_before: float = 0.0):
+        """Ergebnisse cachen; nur bereits vorhandene Domains übernehmen den Status.
+
+        Einträge mit checked_at < expire_before werden dabei gelöscht.
+        """
+        rows = [(n, st, checked_at) for n, st in results.items()]
+        with self.transaction() as db:
+            # UPSERT statt INSERT OR REPLACE: REPLACE löst keine DELETE-Trigger aus (Zähler)
+            db.executemany("INSERT INTO domain_checks VALUES (?, ?, ?) ON CONFLICT(name) DO UPDATE "
+                           "SET status = excluded.status, checked_at = excluded.checked_at", rows)
+            # updated_at nur bei echter Änderung – sonst füllt jeder Check »Kürzlich aktualisiert«
+            db.executemany("UPDATE domains SET status = ?2, checked_at = ?3, "
+                           "updated_at = CASE WHEN status = ?2 THEN updated_at ELSE ?3 END WHERE name = ?1", rows)
+            if expire_before:
+                db.execute("DELETE FROM domain_checks WHERE checked_at < ?", (expire_before,))
+
+    # ----- Kunden -----
+
+    @staticmethod
+    def _client_filter(text: str) -> tuple[str, list]:
+        text = (text or "").strip()
+        if not text:
+            return "", []
+        # Präfixsuche: nutzt die NOCASE-Indizes (LIKE 'x%')
+        pat = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        return "(name LIKE ? ESCAPE '\\' OR number LIKE ? ESCAPE '\\' OR city LIKE ? ESCAPE '\\')", [pat, pat, pat]
+
+    def count_clients(self, text: str = "") -> int:
+        where, params = self._client_filter(text)
+        sql = "SELECT COUNT(*) FROM clients" + (f" WHERE {where}" if where else "")
+        with span("data.count_clients", filtered=bool(where)):
+            return self.query(sql, params)[0][0]
+
+    def client_page(self, text: str = "", sort: str = "name", descending: bool = False,
+                    after: Optional[tuple] = None, limit: int = 200) -> list:
+        """Eine Seite Kunden nach (sort, id); after = (Sortwert, id) der letzten Zeile davor."""
+        if sort not in CLIENT_SORTABLE:
+            raise ValueError(f"Spalte nicht sortierbar: {sort}")
+        where, params = self._client_filter(text)
+        conds = [where] if where else []
+        if after is not None:
+            conds.append(f"({sort}, id) {'<' if descending else '>'} (?, ?)")
+            params += list(after)
+        direction = "DESC" if descending else "ASC"
+        sql = (f"SELECT id, {', '.join(CLIENT_COLUMNS)} FROM clients"
+               + (f" WHERE {' AND '.join(conds)}" if conds else "")
+               + f" ORDER BY {sort} {direction}, id {direction} LIMIT ?")
+        with span("data.client_page", sort=sort, filtered=bool(where)):
+            return self.query(sql, params + [limit])
+
+    def upsert_clients(self, rows: list[dict]) -> int:
+        now = time.time()
+        with self.transaction() as db:
+            db.executemany(
+                "INSERT INTO clients (number, name, city, email, created_at, updated_at) "
+                "VALUES (:number, :name, :city, :email, :now, :now) "
+                "ON CONFLICT(number) DO UPDATE SET name = excluded.name, city = excluded.city, "
+                "email = excluded.email, updated_at = excluded.updated_at",
+                [{"city": "", "email": "", **r, "now": now} for r in rows])
+        return len(rows)
+
+    def client_number(self, client_id: int) -> Optional[str]:
+        rows = self.query("SELECT number FROM clients WHERE id = ?", (client_id,))
+        return rows[0][0] if rows else None
+
+    # ----- Rechnungen -----
+
+    def client_ids(self, numbers: list[str]) -> dict[str, int]:
+        """Kd.-Nr. -> id (ohne Groß-/Kleinschreibung, Schlüssel wie übergeben)."""
+        out = {}
+        for i in range(0, len(numbers), 500):
+            chunk = numbers[i:i + 500]
+            found = {n.lower(): cid for cid, n in self.query(
+                f"SELECT id, number FROM clients WHERE number IN ({','.join('?' * len(chunk))})", chunk)}
+            out.update((n, found[n.lower()]) for n in chunk if n.lower() in found)
+        return out
+
+    def upsert_invoices(self, rows: list[dict]) -> int:
+        """rows: number, client_id, amount_cents, issued_at, optional due_at/status/kind."""
+        now = time.time()
+        with self.transaction() as db:
+            db.executemany(
+                "INSERT INTO invoices (number, client_id, kind, status, amount_cents, issued_at, due_at, updated_at) "
+                "VALUES (:number, :client_id, :kind, :status, :amount_cents, :issued_at, :due_at, :now) "
+                "ON CONFLICT(number) DO UPDATE SET client_id = excluded.client_id, kind = excluded.kind, "
+                "status = excluded.status, amount_cents = excluded.amount_cents, issued_at = excluded.issued_at, "
+                "due_at = excluded.due_at, updated_at = excluded.updated_at",
+                [{"kind": "client", "status": "open", "due_at": None, **r, "now": now} for r in rows])
+        return len(rows)
+
+
+_store: Optional[DataStore] = None
+_store_lock = threading.Lock()
+
+def data_store() -> DataStore:
+    global _store
+    with _store_lock:
+        if _store is None or _store.path != auth.DATA_DIR / "studio.db":
+            _store = DataStore(auth.DATA_DIR / "studio.db")
+        return _store
+
+# ---------------- Demo-Daten / Messung ----------------
+
+_CITIES = ("Berlin", "Hamburg", "München", "Köln", "Frankfurt", "Stuttgart", "Düsseldorf",
+           "Leipzig", "Dortmund", "Essen", "Bremen", "Dresden", "Hannover", "Nürnberg")
+_PARTS = ("Alpha", "Nova", "Licht", "Nord", "Werk", "Stern", "Blau", "Kraft", "Feld", "Haus",
+          "Berg", "Quelle", "Punkt", "Wald", "Sonne", "Stadt", "Fluss", "Brücke", "Markt", "Zeit")
+_FORMS = ("GmbH", "AG", "KG", "UG", "e.K.", "GbR")
+
+def seed_clients(store: DataStore, n: int, chunk: int = 50_000, seed: int = 1) -> float:
+    """n synthetische Kunden anlegen; liefert Sekunden."""
+    rnd = random.Random(seed)
+    start = store.query("SELECT COALESCE(MAX(id), 0) FROM clients")[0][0]
+    t0 = time.perf_counter()
+    now = time.time()
+    for base in range(start, start + n, chunk):
+        rows = [(f"K{i + 1:07d}", f"{rnd.choice(_PARTS)}{rnd.choice(_PARTS).lower()} {rnd.choice(_FORMS)}",
+                 rnd.choice(_CITIES), f"info{i + 1}@example.org", now, now - rnd.random() * 86400 * 365)
+                for i in range(base, min(base + chunk, start + n))]
+        with store.transaction() as db:
+            db.executemany("INSERT INTO clients (number, name, city, email, created_at, updated_at) "
+                           "VALUES (?, ?, ?, ?, ?, ?)", rows)
+    return time.perf_counter() - t0
+
+def seed_invoices(store: DataStore, n: int, chunk: int = 50_000, seed: int = 2) -> float:
+    """n synthetische Rechnungen (ca. 20 % offen, 10 % eigene) zu vorhandenen Kunden."""
+    rnd = random.Random(seed)
+    clients = store.query("SELECT COALESCE(MAX(id), 0) FROM clients")[0][0]
+    start = store.query("SELECT COALESCE(MAX(id), 0) FROM invoices")[0][0]
+    t0 = time.perf_counter()
+    now = time.time()
+    for base in range(start, start + n, chunk):
+        rows = []
+        for i in range(base, min(base + chunk, start + n)):
+            issued = now - rnd.random() * 86400 * 730
+            rows.append((f"R{i + 1:08d}", rnd.randint(1, clients) if clients else None,
+                         "own" if rnd.random() < 0.1 else "client",
+                         "open" if rnd.random() < 0.2 else "paid",
+                         rnd.randint(5_000, 500_000), issued, issued + 14 * 86400, issued))
+        with store.transaction() as db:
+            db.executemany("INSERT INTO invoices (number, client_id, kind, status, amount_cents, issued_at, "
+                           "due_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    return time.perf_counter() - t0
+
+def bench(store: DataStore, rounds: int = 20) -> dict:
+    def ms(fn):
+        t0 = time.perf_counter(); fn(); return (time.perf_counter() - t0) * 1000
+    res = {"clients": store.count_clients()}
+    for sort in ("name", "city", "updated_at"):
+        after, times = None, []
+        for _ in range(rounds):
+            rows = []
+            times.append(ms(lambda: rows.extend(store.client_page(sort=sort, after=after))))
+            after = (rows[-1][CLIENT_COLUMNS.index(sort) + 1], rows[-1][0])
+        res[f"page_{sort}_ms"] = round(max(times), 2)
+    for text in ("Nova", "Ber", "K00999"):
+        res[f"filter_{text}_ms"] = round(ms(lambda: store.client_page(text=text)), 2)
+        res[f"count_{text}_ms"] = round(ms(lambda: store.count_clients(text)), 2)
+    for text in ("K0099", "novaberg", "sonne köln", "R0000012"):
+        res[f"search_{text}_ms"] = round(ms(lambda: store.search(text)), 2)
+    return res
+
+def _cli(argv=None) -> int:
+    import argparse, json
+    ap = argparse.ArgumentParser(prog="data_store.py", description="Geschäftsdaten Digitale Alchemy Studio")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sd = sub.add_parser("seed", help="synthetische Kunden anlegen")
+    sd.add_argument("--clients", type=int, default=100_000)
+    sd.add_argument("--invoices", type=int, default=0)
+    sub.add_parser("bench", help="Seiten-/Filter-Latenzen messen")
+    chk = sub.add_parser("check-counters", help="Dashboard-Zähler per Vollscan prüfen")
+    chk.add_argument("--fix", action="store_true", help="Abweichungen korrigieren")
+    sub.add_parser("reindex", help="Volltextindex neu aufbauen")
+    se = sub.add_parser("search", help="Volltextsuche")
+    se.add_argument("text")
+    args = ap.parse_args(argv)
+
+    store = data_store()
+    if args.cmd == "seed":
+        secs = seed_clients(store, args.clients)
+        print(f"{args.clients} Kunden in {secs:.1f} s angelegt ({store.path})")
+        if args.invoices:
+            secs = seed_invoices(store, args.invoices)
+            print(f"{args.invoices} Rechnungen in {secs:.1f} s angelegt")
+    elif args.cmd == "bench":
+        print(json.dumps(bench(store), indent=2))
+    elif args.cmd == "check-counters":
+        diff = store.rebuild_counters(fix=args.fix)
+        for name, (stored, actual) in diff.items():
+            print(f"{name}: gespeichert {stored}, tatsächlich {actual}")
+        print("Zähler konsistent" if not diff else ("korrigiert" if args.fix else "ABWEICHUNG"))
+        return 1 if diff and not args.fix else 0
+    elif args.cmd == "reindex":
+        t0 = time.perf_counter()
+        n = store.rebuild_search()
+        print(f"{n} Einträge in {time.perf_counter() - t0:.1f} s indiziert")
+    elif args.cmd == "search":
+        for kind, ref, title, body in store.search(args.text):
+            print(f"{kind:9} {ref:>8}  {title}  ·  {body}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(_cli())
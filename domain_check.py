@@ -0,0 +1,423 @@
+# domain_check.py
+"""Domain-Verfügbarkeit im Stapel: asyncio, begrenzte Parallelität je Registry,
+austauschbare Resolver (RDAP, DNS) und Ergebnis-Cache mit getrennten TTLs.
+
+RDAP meldet 404 auch für TLDs ohne RDAP-Dienst (z. B. .de, DENIC); als frei
+gilt ein Name daher nur, wenn seine TLD im IANA-Bootstrap steht.
+
+    python domain_check.py stub --port 8765 --latency-ms 30
+    DA_RDAP_URL=http://127.0.0.1:8765 python domain_check.py check --file namen.txt
+"""
+from __future__ import annotations
+import asyncio, hashlib, json, os, socket, ssl, threading, time, urllib.parse, urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional
+
+from PySide6.QtCore import QObject, Signal
+
+from auth import app_data_dir, load_config
+from data_store import data_store
+from tracing import span
+from workers import submit
+
+AVAILABLE, TAKEN, UNKNOWN, INVALID = "available", "taken", "unknown", "invalid"
+LIKELY_AVAILABLE = "likely_available"   # nur DNS-Heuristik, wird nicht gecacht
+DEFAULT_TLDS = ("de", "com", "net", "eu", "io")
+BOOTSTRAP_URL = "https://data.iana.org/rdap/dns.json"
+BOOTSTRAP_MAX_AGE = 7 * 86_400
+
+def settings() -> dict:
+    cfg = {"resolver": "rdap", "rdap_url": "https://rdap.org", "rdap_bootstrap": BOOTSTRAP_URL,
+           "per_registry": 8, "positive_ttl": 86_400, "negative_ttl": 3_600, "timeout": 10.0}
+    cfg.update(load_config().get("domain_check", {}))
+    if os.getenv("DA_RDAP_URL"):
+        cfg["rdap_url"] = os.getenv("DA_RDAP_URL")
+        # Der Stub liefert seinen eigenen Bootstrap
+        cfg["rdap_bootstrap"] = cfg["rdap_url"].rstrip("/") + "/dns.json"
+    if os.getenv("DA_RDAP_BOOTSTRAP"):
+        cfg["rdap_bootstrap"] = os.getenv("DA_RDAP_BOOTSTRAP")
+    return cfg
+
+def normalize(name: str) -> Optional[str]:
+    name = name.strip().lower().rstrip(".")
+    if name.startswith(("http://", "https://")):
+        name = urllib.parse.urlsplit(name).hostname or ""
+    if name.startswith("www."):
+        name = name[4:]
+    try:
+        name = name.encode("idna").decode("ascii")
+    except UnicodeError:
+        return None
+    labels = name.split(".")
+    if len(labels) < 2 or len(name) > 253 or not all(
+            0 < len(lb) <= 63 and lb[0] != "-" and lb[-1] != "-"
+            and all(c.isalnum() or c == "-" for c in lb) for lb in labels):
+        return None
+    return name
+
+def expand(lines: Iterable[str], tlds: Iterable[str] = DEFAULT_TLDS) -> list[str]:
+    """Zeilen mit Punkt bleiben, Stichwörter werden mit allen TLDs kombiniert."""
+    out, seen = [], set()
+    for line in lines:
+        word = line.strip()
+        if not word:
+            continue
+        for cand in ([word] if "." in word else [f"{word}.{t}" for t in tlds]):
+            if cand.lower() not in seen:
+                seen.add(cand.lower())
+                out.append(cand)
+    return out
+
+# ---------------- Resolver ----------------
+
+async def _http_status(url: str, timeout: float, redirects: int = 3) -> int:
+    u = urllib.parse.urlsplit(url)
+    https = u.scheme == "https"
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(
+        u.hostname, u.port or (443 if https else 80), ssl=ssl.create_default_context() if https else None), timeout)
+    try:
+        path = (u.path or "/") + (f"?{u.query}" if u.query else "")
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {u.netloc}\r\nAccept: application/rdap+json\r\n"
+                     f"User-Agent: DigitaleAlchemyStudio\r\nConnection: close\r\n\r\n".encode("ascii"))
+        await writer.drain()
+        status = int((await asyncio.wait_for(reader.readline(), timeout)).split()[1])
+        location = None
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            k, _, v = line.decode("latin-1").partition(":")
+            if k.strip().lower() == "location":
+                location = v.strip()
+    finally:
+        writer.close()
+    if status in (301, 302, 303, 307, 308) and location and redirects:
+        return await _http_status(urllib.parse.urljoin(url, location), timeout, redirects - 1)
+    return status
+
+
+def rdap_tlds(url: str = BOOTSTRAP_URL, timeout: float = 10.0) -> set[str]:
+    """TLDs mit RDAP-Dienst laut Bootstrap-Datei (RFC 9224), eine Woche lokal gecacht.
+
+    Ohne Netz gilt eine ältere Kopie, ohne Kopie die leere Menge.
+    """
+    path = app_data_dir() / f"rdap_bootstrap_{hashlib.sha1(url.encode()).hexdigest()[:8]}.json"
+    data = None
+    try:
+        if time.time() - path.stat().st_mtime < BOOTSTRAP_MAX_AGE:
+            data = path.read_bytes()
+    except OSError:
+        pass
+    if data is None:
+        try:
+            with urllib.request.urlopen(url, timeout=timeout) as r:
+                data = r.read()
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except (OSError, ValueError):
+            try:
+                data = path.read_bytes()
+            except OSError:
+                return set()
+    try:
+        return {t.lower() for tlds, _ in json.loads(data)["services"] for t in tlds}
+    except (ValueError, KeyError, TypeError):
+        return set()
+
+
+class RdapResolver:
+    """RDAP: 200 = vergeben, 404 = frei – aber nur für TLDs mit RDAP-Dienst,
+    sonst unbekannt. base_url kann auf einen lokalen Stub zeigen."""
+
+    name = "rdap"
+
+    def __init__(self, base_url: str = "https://rdap.org", timeout: float = 10.0,
+                 bootstrap_url: str = BOOTSTRAP_URL, tlds: Optional[Iterable[str]] = None):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.bootstrap_url = bootstrap_url
+        self._tlds: Optional[set[str]] = set(tlds) if tlds is not None else None
+        self._tlds_lock = threading.Lock()
+
+    def tlds(self) -> set[str]:
+        with self._tlds_lock:
+            if self._tlds is None:
+                self._tlds = rdap_tlds(self.bootstrap_url, self.timeout)
+            return self._tlds
+
+    async def check(self, domain: str) -> str:
+        try:
+            status = await _http_status(f"{self.base_url}/domain/{domain}", self.timeout)
+        except (OSError, asyncio.TimeoutError, ValueError, IndexError):
+            return UNKNOWN
+        if status == 200:
+            return TAKEN
+        if status != 404:
+            return UNKNOWN
+        tlds = self._tlds if self._tlds is not None else \
+            await asyncio.get_running_loop().run_in_executor(None, self.tlds)
+        return AVAILABLE if domain.rsplit(".", 1)[1] in tlds else UNKNOWN
+
+
+class DnsResolver:
+    """Heuristik über den System-Resolver: NXDOMAIN gilt nur als wahrscheinlich
+    frei – registrierte Domains ohne DNS-Einträge liefern dasselbe."""
+
+    name = "dns"
+
+    def __init__(self, timeout: float = 5.0):
+        self.timeout = timeout
+
+    async def check(self, domain: str) -> str:
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(loop.getaddrinfo(domain, None), self.timeout)
+            return TAKEN
+        except socket.gaierror as e:
+            return LIKELY_AVAILABLE if e.errno == socket.EAI_NONAME else UNKNOWN
+        except asyncio.TimeoutError:
+            return UNKNOWN
+
+RESOLVERS = {"rdap": RdapResolver, "dns": DnsResolver}
+
+def make_resolver(cfg: Optional[dict] = None):
+    cfg = cfg or settings()
+    if cfg["resolver"] == "rdap":
+        return RdapResolver(cfg["rdap_url"], cfg["timeout"], cfg["rdap_bootstrap"])
+    return RESOLVERS[cfg["resolver"]]()
+
+# ---------------- Cache ----------------
+
+class ResultCache:
+    """Ergebnis-Cache im Speicher, dauerhaft in der Tabelle domain_checks.
+
+    Vergebene Domains (positiv) und freie (negativ) haben eigene TTLs;
+    unbekannte Ergebnisse werden nicht gecacht. Eigene Domains (Tabelle
+    domains) bekommen den neuen Status, neue Namen landen dort nicht.
+    """
+
+    def __init__(self, positive_ttl: float, negative_ttl: float, persist: bool = True):
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.persist = persist
+        self._mem: dict[str, tuple[str, float]] = {}
+
+    def _valid(self, status: str, checked_at: float, now: float) -> bool:
+        ttl = self.positive_ttl if status == TAKEN else self.negative_ttl if status == AVAILABLE else 0
+        return now - checked_at < ttl
+
+    def lookup(self, names: list[str]) -> dict[str, str]:
+        now = time.time()
+        missing = [n for n in names if n not in self._mem]
+        if self.persist and missing:
+            self._mem.update(data_store().domain_checks(missing))
+        return {n: self._mem[n][0] for n in names if n in self._mem and self._valid(*self._mem[n], now)}
+
+    def store(self, results: dict[str, str]):
+        now = time.time()
+        rows = {n: s for n, s in results.items() if s in (AVAILABLE, TAKEN)}
+        self._mem.update((n, (s, now)) for n, s in rows.items())
+        if self.persist and rows:
+            expire = now - max(self.positive_ttl, self.negative_ttl)
+            data_store().save_domain_checks(rows, now, expire_before=expire)
+
+# ---------------- Engine ----------------
+
+@dataclass
+class BatchResult:
+    results: dict = field(default_factory=dict)     # Name -> Status
+    cached: int = 0
+    checked: int = 0
+    seconds: float = 0.0
+    cancelled: bool = False
+
+    def count(self, status: str) -> int:
+        return sum(1 for s in self.results.values() if s == status)
+
+
+class DomainChecker:
+    def __init__(self, resolver=None, cache: Optional[ResultCache] = None,
+                 per_registry: Optional[int] = None, flush_every: int = 100):
+        cfg = settings()
+        self.resolver = resolver or make_resolver(cfg)
+        self.cache = cache or ResultCache(cfg["positive_ttl"], cfg["negative_ttl"])
+        self.per_registry = per_registry or cfg["per_registry"]
+        self.flush_every = flush_every
+        self._cancel = False
+
+    def cancel(self):
+        self._cancel = True
+
+    async def check_many(self, names: Iterable[str],
+                         progress: Optional[Callable[[int, int, str, str], None]] = None) -> BatchResult:
+        t0 = time.perf_counter()
+        res = BatchResult()
+        seen, todo = set(), []
+        for raw in names:
+            n = normalize(raw)
+            key = n or raw.strip()
+            if key in seen:
+                continue
+            seen.add(key)
+            if n is None:
+                res.results[key] = INVALID
+            else:
+                todo.append(n)
+        total = len(seen)
+        done = 0
+
+        def report(name, status):
+            nonlocal done
+            done += 1
+            if progress:
+                progress(done, total, name, status)
+
+        for name, status in list(res.results.items()):
+            report(name, status)
+        hits = self.cache.lookup(todo)
+        res.cached = len(hits)
+        for name in todo:
+            if name in hits:
+                res.results[name] = hits[name]
+                report(name, hits[name])
+        todo = [n for n in todo if n not in hits]
+
+        # Eine Semaphore je Registry (TLD) – fremde Registries bremsen sich nicht aus
+        sems: dict[str, asyncio.Semaphore] = {}
+        pending: dict[str, str] = {}
+        # SQLite-Commits laufen in einem eigenen Thread, der Loop bedient weiter Resolver
+        loop = asyncio.get_running_loop()
+        writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="da-domain-store")
+        writes = []
+
+        def flush():
+            if pending:
+                writes.append(loop.run_in_executor(writer, self.cache.store, dict(pending)))
+                pending.clear()
+
+        async def one(name: str):
+            tld = name.rsplit(".", 1)[1]
+            sem = sems.setdefault(tld, asyncio.Semaphore(self.per_registry))
+            async with sem:
+                if self._cancel:
+                    return
+                status = await self.resolver.check(name)
+            res.results[name] = status
+            res.checked += 1
+            pending[name] = status
+            if len(pending) >= self.flush_every:
+                flush()
+            report(name, status)
+
+        try:
+            with span("domains.check_many", names=len(todo), resolver=self.resolver.name):
+                await asyncio.gather(*(one(n) for n in todo))
+            flush()
+            await asyncio.gather(*writes)
+        finally:
+            writer.shutdown(wait=True)
+        res.cancelled = self._cancel
+        res.seconds = time.perf_counter() - t0
+        return res
+
+    def run(self, names: Iterable[str], progress=None) -> BatchResult:
+        return asyncio.run(self.check_many(names, progress))
+
+# ---------------- Qt-Anbindung ----------------
+
+class DomainCheckJob(QObject):
+    """Prüft einen Stapel im Worker-Thread (eigener asyncio-Loop) und meldet
+    Fortschritt per Signal an den GUI-Thread."""
+
+    progress = Signal(int, int, str, str)   # erledigt, gesamt, Name, Status
+    finished = Signal(object)               # BatchResult
+    failed = Signal(str)
+
+    def __init__(self, names: list[str], checker: Optional[DomainChecker] = None, parent=None):
+        super().__init__(parent)
+        self.names = names
+        self.checker = checker
+        self.task = None
+
+    def start(self):
+        def work():
+            self.checker = self.checker or DomainChecker()
+            return self.checker.run(self.names, self.progress.emit)
+        self.task = submit(work, on_done=self.finished.emit, on_error=self.failed.emit)
+
+    def cancel(self):
+        if self.checker:
+            self.checker.cancel()
+
+# ---------------- Stub-Server / CLI ----------------
+
+# Wie in echt: .de hat keinen RDAP-Dienst, der Stub antwortet dort trotzdem mit 404
+STUB_RDAP_TLDS = ("com", "net", "eu", "io", "org")
+
+async def serve_stub(port: int = 8765, latency_ms: float = 30.0, host: str = "127.0.0.1"):
+    """Minimaler RDAP-Stub: Namen mit 'frei' oder gerader Prüfsumme sind verfügbar (404).
+
+    /dns.json liefert einen Bootstrap mit STUB_RDAP_TLDS.
+    """
+    async def handle(reader, writer):
+        try:
+            line = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            path = line.split()[1].decode()
+            name = path.rsplit("/", 1)[-1]
+            if path == "/dns.json":
+                body = json.dumps({"version": "1.0", "services": [
+                    [list(STUB_RDAP_TLDS), [f"http://{host}:{port}/"]]]}).encode()
+                status = "200 OK"
+            else:
+                await asyncio.sleep(latency_ms / 1000)
+                free = "frei" in name or sum(name.encode()) % 2 == 0
+                body = b"" if free else b'{"objectClassName":"domain","ldhName":"%s"}' % name.encode()
+                status = "404 Not Found" if free else "200 OK"
+            writer.write(f"HTTP/1.1 {status}\r\nContent-Type: application/rdap+json\r\n"
+                         f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port, backlog=1024)
+    async with server:
+        await server.serve_forever()
+
+def _cli(argv=None) -> int:
+    import argparse
+    from pathlib import Path
+    ap = argparse.ArgumentParser(prog="domain_check.py", description="Domain-Verfügbarkeit prüfen")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    st = sub.add_parser("stub", help="lokalen RDAP-Stub starten")
+    st.add_argument("--port", type=int, default=8765)
+    st.add_argument("--latency-ms", type=float, default=30.0)
+    ck = sub.add_parser("check", help="Namen/Stichwörter prüfen")
+    ck.add_argument("names", nargs="*")
+    ck.add_argument("--file", type=Path)
+    ck.add_argument("--resolver", choices=sorted(RESOLVERS))
+    ck.add_argument("--per-registry", type=int)
+    ck.add_argument("--no-cache", action="store_true")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "stub":
+        print(f"RDAP-Stub auf http://127.0.0.1:{args.port}")
+        asyncio.run(serve_stub(args.port, args.latency_ms))
+        return 0
+    lines = list(args.names) + (args.file.read_text(encoding="utf-8").splitlines() if args.file else [])
+    cfg = settings()
+    if args.resolver:
+        cfg["resolver"] = args.resolver
+    cache = ResultCache(0, 0, persist=False) if args.no_cache else None
+    checker = DomainChecker(make_resolver(cfg), cache, args.per_registry)
+    res = checker.run(expand(lines))
+    print(f"{len(res.results)} Namen in {res.seconds:.2f} s: {res.count(AVAILABLE)} frei, "
+          f"{res.count(LIKELY_AVAILABLE)} wahrscheinlich frei, {res.count(TAKEN)} vergeben, {res.count(UNKNOWN)} unbekannt, {res.count(INVALID)} ungültig, "
+          f"{res.cached} aus dem Cache")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(_cli())
@@ -0,0 +1,116 @@
+# domains_page.py
+from __future__ import annotations
+from typing import Optional
+
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import (
+    QAbstractItemView, QHBoxLayout, QHeaderView, QLabel, QLineEdit, QPlainTextEdit,
+    QProgressBar, QPushButton, QTableWidget, QTableWidgetItem, QVBoxLayout, QWidget,
+)
+
+from data_provider import provider
+from domain_check import (
+    AVAILABLE, DEFAULT_TLDS, INVALID, LIKELY_AVAILABLE, TAKEN, UNKNOWN, DomainCheckJob, expand,
+)
+
+STATUS_TEXT = {AVAILABLE: "frei", LIKELY_AVAILABLE: "wahrscheinlich frei", TAKEN: "vergeben",
+               UNKNOWN: "unbekannt", INVALID: "ungültig"}
+STATUS_COLOR = {AVAILABLE: "#10B981", LIKELY_AVAILABLE: "#84CC16", TAKEN: "#9CA3AF",
+                UNKNOWN: "#F59E0B", INVALID: "#EF4444"}
+
+class DomainsPage(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        lay = QVBoxLayout(self); lay.setContentsMargins(0, 0, 0, 0); lay.setSpacing(8)
+        header = QLabel("Domains"); header.setObjectName("PageHeader"); lay.addWidget(header)
+        self.names = QPlainTextEdit(); self.names.setObjectName("FilterEdit"); self.names.setMaximumHeight(120)
+        self.names.setPlaceholderText("Ein Name oder Stichwort pro Zeile (Stichwörter werden mit allen TLDs kombiniert)")
+        lay.addWidget(self.names)
+        row = QHBoxLayout()
+        self.tlds = QLineEdit(", ".join(DEFAULT_TLDS)); self.tlds.setObjectName("FilterEdit"); self.tlds.setMaximumWidth(260)
+        self.btnCheck = QPushButton("Prüfen"); self.btnCancel = QPushButton("Abbrechen"); self.btnCancel.setEnabled(False)
+        self.progress = QProgressBar(); self.progress.setTextVisible(True)
+        row.addWidget(QLabel("TLDs")); row.addWidget(self.tlds); row.addWidget(self.btnCheck); row.addWidget(self.btnCancel)
+        row.addWidget(self.progress, 1)
+        lay.addLayout(row)
+        self.summary = QLabel(""); self.summary.setObjectName("PanelTitle"); lay.addWidget(self.summary)
+
+        self.table = QTableWidget(0, 2); self.table.setObjectName("DataTable")
+        self.table.setHorizontalHeaderLabels(["Domain", "Status"])
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.verticalHeader().hide()
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        lay.addWidget(self.table, 1)
+
+        self.job: Optional[DomainCheckJob] = None
+        self._buffer: list[tuple[str, str]] = []
+        # Fortschritt gebündelt einpflegen statt pro Ergebnis
+        self._flush = QTimer(self); self._flush.setInterval(100); self._flush.timeout.connect(self._flush_rows)
+        self.btnCheck.clicked.connect(self.start)
+        self.btnCancel.clicked.connect(self.cancel)
+
+    def evictable(self) -> bool:
+        # PageRegistry: laufenden Job nicht durch Eviction verlieren
+        return self.job is None
+
+    def start(self):
+        tlds = [t.strip().lstrip(".") for t in self.tlds.text().split(",") if t.strip()]
+        names = expand(self.names.toPlainText().splitlines(), tlds or DEFAULT_TLDS)
+        if not names or self.job is not None:
+            return
+        self.table.setRowCount(0)
+        # Endgültige Gesamtzahl (ohne Dubletten) kommt mit dem ersten Fortschritt
+        self.progress.setRange(0, len(names)); self.progress.setValue(0)
+        self.summary.setText(f"Prüfe {len(names)} Namen …")
+        self.btnCheck.setEnabled(False); self.btnCancel.setEnabled(True)
+        self.job = DomainCheckJob(names, parent=self)
+        self.job.progress.connect(self._on_progress)
+        self.job.finished.connect(self._on_finished)
+        self.job.failed.connect(self._on_failed)
+        self._flush.start()
+        self.job.start()
+
+    def cancel(self):
+        if self.job:
+            self.job.cancel()
+
+    def _on_progress(self, done: int, total: int, name: str, status: str):
+        if self.progress.maximum() != total:
+            self.progress.setMaximum(total)
+        self.progress.setValue(done)
+        self._buffer.append((name, status))
+
+    def _flush_rows(self):
+        if not self._buffer:
+            return
+        rows, self._buffer = self._buffer, []
+        self.table.setUpdatesEnabled(False)
+        start = self.table.rowCount()
+        self.table.setRowCount(start + len(rows))
+        for i, (name, status) in enumerate(rows):
+            self.table.setItem(start + i, 0, QTableWidgetItem(name))
+            item = QTableWidgetItem(STATUS_TEXT.get(status, status))
+            item.setForeground(QColor(STATUS_COLOR.get(status, "#9CA3AF")))
+            self.table.setItem(start + i, 1, item)
+        self.table.setUpdatesEnabled(True)
+
+    def _done(self):
+        self._flush.stop(); self._flush_rows()
+        self.btnCheck.setEnabled(True); self.btnCancel.setEnabled(False)
+        self.job = None
+        # VERFÜGBARE DOMAINS zählt per Trigger die freien Prüfergebnisse -> Dashboard neu laden
+        provider().invalidate("dashboard")
+
+    def _on_finished(self, res):
+        self._done()
+        self.summary.setText(
+            f"{len(res.results)} Namen in {res.seconds:.2f} s: {res.count(AVAILABLE)} frei, "
+            f"{res.count(LIKELY_AVAILABLE)} wahrscheinlich frei, {res.count(TAKEN)} vergeben, "
+            f"{res.count(UNKNOWN)} unbekannt, {res.count(INVALID)} ungültig · {res.cached} aus dem Cache"
+            + (" · abgebrochen" if res.cancelled else ""))
+
+    def _on_failed(self, msg: str):
+        self._done()
+        self.summary.setText(f"Fehler: {msg}")
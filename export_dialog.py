@@ -0,0 +1,139 @@
+# export_dialog.py
+from __future__ import annotations
+import time
+from pathlib import Path
+from typing import Optional
+
+from PySide6.QtCore import Qt, QUrl
+from PySide6.QtGui import QDesktopServices
+from PySide6.QtWidgets import (
+    QComboBox, QDialog, QFileDialog, QFormLayout, QHBoxLayout, QLabel, QLineEdit, QListWidget, QListWidgetItem,
+    QProgressBar, QPushButton, QVBoxLayout,
+)
+
+import auth
+from data_export import DATASETS, ExportJob, Exporter, ExportStats
+
+STATUS_CHOICES = (("Alle", None), ("offen", "open"), ("bezahlt", "paid"), ("storniert", "cancelled"))
+
+class ExportDialog(QDialog):
+    """Spalten und Filter wählen, Export im Hintergrund nach CSV oder XLSX."""
+
+    def __init__(self, dataset: str, parent=None, text: str = ""):
+        super().__init__(parent)
+        self.dataset = dataset
+        ds = DATASETS[dataset]
+        self.setWindowTitle(f"{ds['title']} exportieren")
+        self.resize(480, 520)
+        v = QVBoxLayout(self); v.setContentsMargins(20, 20, 20, 14); v.setSpacing(10)
+
+        v.addWidget(QLabel("Spalten"))
+        self.columns = QListWidget()
+        for key, (label, _, _) in ds["columns"].items():
+            item = QListWidgetItem(label); item.setData(Qt.UserRole, key)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable); item.setCheckState(Qt.Checked)
+            self.columns.addItem(item)
+        v.addWidget(self.columns, 1)
+
+        form = QFormLayout()
+        self.text: Optional[QLineEdit] = None
+        if dataset == "clients":
+            self.text = QLineEdit(text); self.text.setPlaceholderText("Präfix auf Name, Kd.-Nr. oder Ort")
+            form.addRow("Filter", self.text)
+        else:
+            self.month_from, self.month_to = QComboBox(), QComboBox()
+            y, m = time.localtime()[:2]
+            for box in (self.month_from, self.month_to):
+                box.addItem("–", None)
+                for i in range(36):
+                    yy, mm = divmod(y * 12 + m - 1 - i, 12)
+                    box.addItem(f"{mm + 1:02d}/{yy}", f"{yy}-{mm + 1:02d}")
+            self.status = QComboBox()
+            for label, value in STATUS_CHOICES:
+                self.status.addItem(label, value)
+            form.addRow("Von Monat", self.month_from); form.addRow("Bis Monat", self.month_to)
+            form.addRow("Status", self.status)
+        self.format = QComboBox(); self.format.addItem("Excel (XLSX)", ".xlsx"); self.format.addItem("CSV", ".csv")
+        form.addRow("Format", self.format)
+        v.addLayout(form)
+
+        self.progress = QProgressBar(); v.addWidget(self.progress)
+        self.info = QLabel(""); v.addWidget(self.info)
+        h = QHBoxLayout()
+        self.btnOpen = QPushButton("Datei öffnen"); self.btnOpen.setEnabled(False)
+        self.btnExport = QPushButton("Exportieren …"); self.btnCancel = QPushButton("Abbrechen")
+        self.btnCancel.setEnabled(False); self.btnClose = QPushButton("Schließen")
+        h.addWidget(self.btnOpen); h.addStretch(1); h.addWidget(self.btnExport); h.addWidget(self.btnCancel); h.addWidget(self.btnClose)
+        v.addLayout(h)
+
+        self.job: Optional[ExportJob] = None
+        self._path: Optional[Path] = None
+        self.btnExport.clicked.connect(self.start)
+        self.btnCancel.clicked.connect(self.cancel)
+        self.btnClose.clicked.connect(self.close)
+        self.btnOpen.clicked.connect(lambda: QDesktopServices.openUrl(QUrl.fromLocalFile(str(self._path))))
+
+    def selected_columns(self) -> list[str]:
+        return [self.columns.item(i).data(Qt.UserRole) for i in range(self.columns.count())
+                if self.columns.item(i).checkState() == Qt.Checked]
+
+    def filters(self) -> dict:
+        if self.text is not None:
+            return {"text": self.text.text()}
+        return {"month_from": self.month_from.currentData(), "month_to": self.month_to.currentData(),
+                "status": self.status.currentData()}
+
+    def start(self, path: Optional[Path] = None):
+        if self.job is not None:
+            return
+        columns = self.selected_columns()
+        if not columns:
+            self.info.setText("Bitte mindestens eine Spalte wählen.")
+            return
+        suffix = self.format.currentData()
+        if not path:
+            default = auth.DATA_DIR / f"{DATASETS[self.dataset]['title']}_{time.strftime('%Y-%m-%d')}{suffix}"
+            name, _ = QFileDialog.getSaveFileName(self, "Export speichern", str(default), f"*{suffix}")
+            if not name:
+                return
+            path = Path(name)
+        path = Path(path)
+        if path.suffix.lower() != suffix:
+            path = path.with_name(path.name + suffix)
+        self._path = path
+        self.job = ExportJob(Exporter(self.dataset, path, columns, self.filters()), parent=self)
+        self.job.progress.connect(self._on_progress)
+        self.job.finished.connect(self._on_finished)
+        self.job.failed.connect(self._on_failed)
+        self.btnExport.setEnabled(False); self.btnCancel.setEnabled(True); self.btnOpen.setEnabled(False)
+        self.info.setText("Zähle Zeilen …")
+        self.job.start()
+
+    def cancel(self):
+        if self.job:
+            self.job.cancel()
+
+    def closeEvent(self, e):
+        self.cancel()
+        super().closeEvent(e)
+
+    def _on_progress(self, done: int, total: int, rate: float):
+        self.progress.setRange(0, max(total, 1)); self.progress.setValue(done)
+        self.info.setText(f"{done:,} / {total:,} Zeilen · {rate:,.0f} Zeilen/s".replace(",", "."))
+
+    def _done(self):
+        self.job = None
+        self.btnExport.setEnabled(True); self.btnCancel.setEnabled(False)
+
+    def _on_finished(self, st: ExportStats):
+        self._done()
+        if st.cancelled:
+            self.info.setText("Export abgebrochen – keine Datei geschrieben.")
+            return
+        self.btnOpen.setEnabled(True)
+        self.info.setText(f"{st.rows:,} Zeilen · {st.bytes / 1e6:.1f} MB · {st.seconds:.1f} s · "
+                          f"{st.per_second:,.0f} Zeilen/s".replace(",", "."))
+
+    def _on_failed(self, msg: str):
+        self._done()
+        self.info.setText(f"Export fehlgeschlagen: {msg}")
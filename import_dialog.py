@@ -0,0 +1,134 @@
+# import_dialog.py
+from __future__ import annotations
+from itertools import islice
+from pathlib import Path
+from typing import Optional
+
+from PySide6.QtCore import QUrl, Signal
+from PySide6.QtGui import QDesktopServices
+from PySide6.QtWidgets import (
+    QCheckBox, QDialog, QFileDialog, QHBoxLayout, QLabel, QPlainTextEdit, QProgressBar, QPushButton, QVBoxLayout,
+)
+
+from data_import import ImportJob, Importer, ImportStats
+from data_provider import provider
+
+TITLES = {"clients": "Kunden importieren", "invoices": "Rechnungen importieren"}
+
+class ImportDialog(QDialog):
+    """Datei wählen, Import im Hintergrund verfolgen, Fehler anzeigen."""
+
+    imported = Signal(object)       # ImportStats
+
+    MAX_SHOWN_ERRORS = 200
+
+    def __init__(self, kind: str, parent=None):
+        super().__init__(parent)
+        self.kind = kind
+        self.setWindowTitle(TITLES[kind])
+        self.resize(560, 420)
+        v = QVBoxLayout(self); v.setContentsMargins(20, 20, 20, 14); v.setSpacing(10)
+
+        row = QHBoxLayout()
+        self.file = QLabel("Keine Datei gewählt"); self.file.setWordWrap(True)
+        self.btnFile = QPushButton("Datei …")
+        row.addWidget(self.file, 1); row.addWidget(self.btnFile)
+        v.addLayout(row)
+        self.info = QLabel(""); self.info.setObjectName("StatusLabel"); v.addWidget(self.info)
+        self.resume = QCheckBox("Abgebrochenen Import fortsetzen"); self.resume.hide(); v.addWidget(self.resume)
+        self.progress = QProgressBar(); self.progress.setRange(0, 1000); v.addWidget(self.progress)
+        self.status = QLabel(""); v.addWidget(self.status)
+        self.errors = QPlainTextEdit(); self.errors.setReadOnly(True)
+        self.errors.setPlaceholderText("Fehlerhafte Zeilen erscheinen hier (vollständig in der .fehler.csv)")
+        v.addWidget(self.errors, 1)
+
+        h = QHBoxLayout()
+        self.btnErrors = QPushButton("Fehlerdatei öffnen"); self.btnErrors.setEnabled(False)
+        self.btnStart = QPushButton("Importieren"); self.btnStart.setEnabled(False)
+        self.btnCancel = QPushButton("Abbrechen"); self.btnClose = QPushButton("Schließen")
+        self.btnCancel.setEnabled(False)
+        h.addWidget(self.btnErrors); h.addStretch(1)
+        h.addWidget(self.btnStart); h.addWidget(self.btnCancel); h.addWidget(self.btnClose)
+        v.addLayout(h)
+
+        self.importer: Optional[Importer] = None
+        self.job: Optional[ImportJob] = None
+        self.btnFile.clicked.connect(self.choose_file)
+        self.btnStart.clicked.connect(self.start)
+        self.btnCancel.clicked.connect(self.cancel)
+        self.btnClose.clicked.connect(self.close)
+        self.btnErrors.clicked.connect(
+            lambda: QDesktopServices.openUrl(QUrl.fromLocalFile(str(self.importer.error_file))))
+
+    def choose_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, TITLES[self.kind], "", "CSV / DATEV (*.csv *.txt);;Alle Dateien (*)")
+        if path:
+            self.set_file(Path(path))
+
+    def set_file(self, path: Path):
+        try:
+            self.importer = Importer(self.kind, path)
+        except (OSError, ValueError) as e:
+            self.info.setText(f"Datei nicht lesbar: {e}")
+            return
+        src = self.importer.source
+        self.file.setText(str(path))
+        self.info.setText(f"{src.size / 1e6:.1f} MB · {'DATEV' if src.datev else 'CSV'} · {src.encoding} · "
+                          f"Trennzeichen {src.delimiter!r}")
+        cp = self.importer.checkpoint()
+        self.resume.setVisible(bool(cp)); self.resume.setChecked(bool(cp))
+        if cp:
+            self.resume.setText(f"Abgebrochenen Import ab Zeile {cp['line']:,} fortsetzen".replace(",", "."))
+        self.btnStart.setEnabled(True)
+
+    def start(self):
+        if self.importer is None or self.job is not None:
+            return
+        self.errors.clear()
+        self.job = ImportJob(self.importer, resume=not self.resume.isHidden() and self.resume.isChecked(), parent=self)
+        self.job.progress.connect(self._on_progress)
+        self.job.finished.connect(self._on_finished)
+        self.job.failed.connect(self._on_failed)
+        self.btnStart.setEnabled(False); self.btnFile.setEnabled(False); self.btnCancel.setEnabled(True)
+        self.status.setText("Lese Datei …")
+        self.job.start()
+
+    def cancel(self):
+        if self.job:
+            self.job.cancel()
+            self.status.setText("Breche nach dem laufenden Block ab …")
+
+    def closeEvent(self, e):
+        self.cancel()       # Prüfpunkt bleibt erhalten
+        super().closeEvent(e)
+
+    def _on_progress(self, pos: int, size: int, imported: int, errors: int, rate: float):
+        self.progress.setValue(int(pos * 1000 / size) if size else 0)
+        self.status.setText(f"{imported:,} importiert · {errors:,} Fehler · {rate:,.0f} Zeilen/s".replace(",", "."))
+
+    def _done(self):
+        self.job = None
+        self.btnFile.setEnabled(True); self.btnCancel.setEnabled(False)
+        self.btnStart.setEnabled(True)
+
+    def _on_finished(self, st: ImportStats):
+        self._done()
+        self.resume.setVisible(st.cancelled); self.resume.setChecked(st.cancelled)
+        text = (f"{st.imported:,} importiert · {st.errors:,} Fehler · {st.seconds:.1f} s · "
+                f"{st.per_second:,.0f} Zeilen/s").replace(",", ".")
+        if st.resumed_at:
+            text += f" · fortgesetzt ab Zeile {st.resumed_at}"
+        if st.cancelled:
+            text += " · abgebrochen, kann fortgesetzt werden"
+        self.status.setText(text)
+        if st.errors:
+            # Nur den Anfang anzeigen – die Datei kann beliebig groß sein
+            with open(st.error_file, encoding="utf-8") as f:
+                self.errors.setPlainText("".join(islice(f, 1, self.MAX_SHOWN_ERRORS + 1)))
+            self.btnErrors.setEnabled(True)
+        provider().invalidate("dashboard")
+        self.imported.emit(st)
+
+    def _on_failed(self, msg: str):
+        self._done()
+        self.status.setText(f"Import fehlgeschlagen: {msg}")
@@ -0,0 +1,353 @@
+# invoice_pdf.py
+"""Rechnungs-PDFs im Stapel – parallel in einem Prozess-Pool.
+
+Die Vorlage (Briefkopf, Fußzeile, feste PDF-Objekte) wird pro Worker
+einmal kompiliert; je Rechnung wird nur noch der variable Textteil
+erzeugt und hinter die vorberechneten Bytes gehängt. Fertige Dateien
+landen sofort auf der Platte, ein Erledigt-Protokoll im Zielordner
+erlaubt Abbruch und Fortsetzen.
+
+    python invoice_pdf.py render --month 2026-09
+    python invoice_pdf.py bench --count 2000
+"""
+from __future__ import annotations
+import multiprocessing, os, threading, time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+import auth
+from data_store import data_store
+from tracing import span
+
+DONE_LOG = ".erledigt"
+VAT = 0.19
+
+def settings() -> dict:
+    """Absenderdaten aus der Konfiguration (Schlüssel "invoice")."""
+    cfg = {"company": "Digitale Alchemy Studio", "street": "", "city": "", "email": "",
+           "iban": "", "tax_id": "", "payment_days": 14}
+    cfg.update(auth.load_config().get("invoice") or {})
+    return cfg
+
+# ---------------- PDF ----------------
+
+# Breiten (1/1000 em) der Standardschrift Helvetica für rechtsbündige Beträge
+_WIDTHS = {**dict.fromkeys("0123456789€", 556), ".": 278, ",": 278, " ": 278, "-": 333}
+
+def _width(text: str, size: float) -> float:
+    return sum(_WIDTHS.get(c, 556) for c in text) * size / 1000
+
+def _pdf_str(text: str) -> bytes:
+    raw = text.encode("cp1252", errors="replace")
+    return b"(" + raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+def _text(x: float, y: float, text: str, size: float = 10, bold: bool = False) -> bytes:
+    return b"BT /%s %g Tf %g %g Td %s Tj ET\n" % (b"F2" if bold else b"F1", size, x, y, _pdf_str(text))
+
+def _text_right(x: float, y: float, text: str, size: float = 10, bold: bool = False) -> bytes:
+    return _text(x - _width(text, size), y, text, size, bold)
+
+def euro(cents: int) -> str:
+    s = f"{abs(cents) / 100:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+    return f"{'-' if cents < 0 else ''}{s} €"
+
+def _date(ts: Optional[float]) -> str:
+    return time.strftime("%d.%m.%Y", time.localtime(ts)) if ts else ""
+
+
+class InvoiceTemplate:
+    """Vorkompilierte Vorlage: feste Objekte samt Offsets und der statische Seiteninhalt.
+
+    render() setzt nur noch Inhaltsstrom, xref und Trailer zusammen.
+    """
+
+    def __init__(self, cfg: dict):
+        self.cfg = cfg
+        objs = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 4 0 R /F2 5 0 R >> >> /Contents 6 0 R >>",
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+        ]
+        head = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self.offsets = []
+        for i, body in enumerate(objs, 1):
+            self.offsets.append(len(head))
+            head += b"%d 0 obj\n%s\nendobj\n" % (i, body)
+        self.head = bytes(head)
+
+        sender = " · ".join(v for v in (cfg["company"], cfg["street"], cfg["city"]) if v)
+        footer = " · ".join(v for v in (cfg["company"], cfg["email"] and f"E-Mail {cfg['email']}",
+                                        cfg["iban"] and f"IBAN {cfg['iban']}",
+                                        cfg["tax_id"] and f"USt-IdNr. {cfg['tax_id']}") if v)
+        self.static = b"".join((
+            b"0.10 0.45 0.55 rg 0 802 595 40 re f 0 g\n",
+            b"1 g ", _text(56, 816, cfg["company"], 16, True), b"0 g\n",
+            _text(56, 742, sender, 7),
+            b"0.5 w 56 738 m 300 738 l S\n",
+            _text(56, 470, "Pos.", 9, True), _text(96, 470, "Beschreibung", 9, True),
+            _text_right(539, 470, "Betrag", 9, True),
+            b"0.5 w 56 464 m 539 464 l S\n",
+            b"0.5 w 56 60 m 539 60 l S\n",
+            _text(56, 46, footer, 7),
+        ))
+
+    def content(self, inv: dict) -> bytes:
+        net = round(inv["amount_cents"] / (1 + VAT))
+        vat = inv["amount_cents"] - net
+        days = self.cfg["payment_days"]
+        return b"".join((
+            self.static,
+            _text(56, 720, inv["client_name"], 11), _text(56, 706, inv["client_city"], 11),
+            _text(56, 640, f"Rechnung {inv['number']}", 18, True),
+            _text(360, 720, "Rechnungsnr.", 9), _text_right(539, 720, inv["number"], 9),
+            _text(360, 706, "Kundennr.", 9), _text_right(539, 706, inv["client_number"], 9),
+            _text(360, 692, "Datum", 9), _text_right(539, 692, _date(inv["issued_at"]), 9),
+            _text(360, 678, "Fällig am", 9), _text_right(539, 678, _date(inv["due_at"]), 9),
+            _text(56, 600, "Für unsere Leistungen stellen wir Ihnen folgenden Betrag in Rechnung:", 10),
+            _text(56, 448, "1", 10), _text(96, 448, "Leistungen laut Vereinbarung", 10),
+            _text_right(539, 448, euro(net), 10),
+            _text(360, 410, "Nettobetrag", 10), _text_right(539, 410, euro(net), 10),
+            _text(360, 394, f"USt. {VAT:.0%}", 10), _text_right(539, 394, euro(vat), 10),
+            b"0.5 w 360 386 m 539 386 l S\n",
+            _text(360, 370, "Gesamtbetrag", 11, True), _text_right(539, 370, euro(inv["amount_cents"]), 11, True),
+            _text(56, 320, f"Bitte überweisen Sie den Betrag innerhalb von {days} Tagen"
+                           f" unter Angabe der Rechnungsnummer.", 10),
+        ))
+
+    def render(self, inv: dict) -> bytes:
+        stream = self.content(inv)
+        out = bytearray(self.head)
+        offsets = self.offsets + [len(out)]
+        out += b"6 0 obj\n<< /Length %d >>\nstream\n%s\nendstream\nendobj\n" % (len(stream) + 1, stream)
+        xref = len(out)
+        out += b"xref\n0 7\n0000000000 65535 f \n" + b"".join(b"%010d 00000 n \n" % o for o in offsets)
+        out += b"trailer\n<< /Size 7 /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % xref
+        return bytes(out)
+
+# ---------------- Worker (eigener Prozess) ----------------
+
+_template: Optional[InvoiceTemplate] = None
+
+def _init_worker(cfg: dict):
+    # Einmal pro Worker-Prozess statt einmal pro Rechnung
+    global _template
+    _template = InvoiceTemplate(cfg)
+
+_UNSAFE = str.maketrans({c: "_" for c in '/\\:*?"<>|' + "".join(map(chr, range(32)))})
+_RESERVED = {"CON", "PRN", "AUX", "NUL", *(f"{p}{i}" for p in ("COM", "LPT") for i in range(1, 10))}
+
+def pdf_filename(number: str) -> str:
+    """Rechnungsnummer -> Dateiname im Zielordner ("RE/2026/7" -> "RE_2026_7.pdf")."""
+    name = str(number).translate(_UNSAFE).rstrip(". ")
+    if not name or ".." in name or name.split(".")[0].upper() in _RESERVED:
+        raise ValueError(f"Rechnungsnummer {number!r} taugt nicht als Dateiname")
+    return f"{name}.pdf"
+
+def _render_chunk(invoices: list[dict], out_dir: str) -> tuple[list[tuple[str, int]], list[tuple[str, str]]]:
+    """Rendert und schreibt einen Block; liefert ([(Rechnungsnr., Bytes)], [(Rechnungsnr., Fehler)])."""
+    done, failed = [], []
+    for inv in invoices:
+        # Eine kaputte Rechnung darf den Rest des Blocks nicht mitreißen
+        try:
+            data = _template.render(inv)
+            path = os.path.join(out_dir, pdf_filename(inv["number"]))
+            tmp = path + ".part"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)       # nie halbe Dateien unter dem Endnamen
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            failed.append((str(inv.get("number")), str(e) or e.__class__.__name__))
+            continue
+        done.append((inv["number"], len(data)))
+    return done, failed
+
+# ---------------- Stapel ----------------
+
+def _invoice_filter(month: Optional[str], kind: str) -> tuple[list[str], list]:
+    conds, params = ["i.kind = ?"], [kind]
+    if month:
+        start = time.mktime(time.strptime(month, "%Y-%m"))
+        y, m = map(int, month.split("-"))
+        end = time.mktime(time.strptime(f"{y + m // 12}-{m % 12 + 1}", "%Y-%m"))
+        conds.append("i.issued_at >= ? AND i.issued_at < ?")
+        params += [start, end]
+    return conds, params
+
+def count_invoices(month: Optional[str] = None, kind: str = "client") -> int:
+    conds, params = _invoice_filter(month, kind)
+    return data_store().query(f"SELECT COUNT(*) FROM invoices i WHERE {' AND '.join(conds)}", params)[0][0]
+
+def iter_invoices(month: Optional[str] = None, kind: str = "client", page: int = 1000) -> Iterator[dict]:
+    """Rechnungen (optional eines Monats "JJJJ-MM") seitenweise per Keyset aus dem Store."""
+    conds, params = _invoice_filter(month, kind)
+    sql = ("SELECT i.id, i.number, i.amount_cents, i.issued_at, i.due_at, "
+           "COALESCE(c.number, ''), COALESCE(c.name, ''), COALESCE(c.city, '') "
+           "FROM invoices i LEFT JOIN clients c ON c.id = i.client_id "
+           f"WHERE {' AND '.join(conds)} AND i.id > ? ORDER BY i.id LIMIT ?")
+    last = 0
+    while True:
+        rows = data_store().query(sql, params + [last, page])
+        for r in rows:
+            yield {"number": r[1], "amount_cents": r[2], "issued_at": r[3], "due_at": r[4],
+                   "client_number": r[5], "client_name": r[6], "client_city": r[7]}
+        if len(rows) < page:
+            return
+        last = rows[-1][0]
+
+@dataclass
+class BatchStats:
+    rendered: int = 0
+    skipped: int = 0            # schon im Erledigt-Protokoll
+    bytes: int = 0
+    seconds: float = 0.0
+    cancelled: bool = False
+    out_dir: str = ""
+    errors: list = field(default_factory=list)
+
+    @property
+    def per_second(self) -> float:
+        return self.rendered / self.seconds if self.seconds else 0.0
+
+
+class BatchRenderer:
+    """Verteilt Rechnungen blockweise auf einen Prozess-Pool.
+
+    Es sind höchstens 2 Blöcke je Worker unterwegs, der Speicher bleibt also
+    unabhängig von der Stapelgröße. Erledigte Rechnungsnummern werden je
+    Block an DONE_LOG angehängt; ein neuer Lauf überspringt sie.
+    """
+
+    def __init__(self, out_dir: Path, workers: Optional[int] = None, chunk: int = 50):
+        self.out_dir = Path(out_dir)
+        self.workers = workers or max(1, min(8, (os.cpu_count() or 2) - 1))
+        self.chunk = chunk
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def done_numbers(self) -> set[str]:
+        log = self.out_dir / DONE_LOG
+        if not log.exists():
+            return set()
+        with open(log, "r", encoding="utf-8") as f:
+            return {line.strip() for line in f if line.strip()}
+
+    def reset(self):
+        (self.out_dir / DONE_LOG).unlink(missing_ok=True)
+
+    def run(self, invoices: Iterator[dict], total: int = 0,
+            progress: Optional[Callable[[int, int, float], None]] = None) -> BatchStats:
+        """progress(erledigt, gesamt, Rechnungen/s) nach jedem Block."""
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        stats = BatchStats(out_dir=str(self.out_dir))
+        done = self.done_numbers()
+        t0 = time.perf_counter()
+        # spawn auch unter Linux: fork aus einem Prozess mit Qt-Threads ist nicht sicher
+        ctx = multiprocessing.get_context("spawn")
+        with span("invoices.render_batch", workers=self.workers), \
+                open(self.out_dir / DONE_LOG, "a", encoding="utf-8") as log, \
+                ProcessPoolExecutor(self.workers, mp_context=ctx, initializer=_init_worker,
+                                    initargs=(settings(),)) as pool:
+            pending = set()
+
+            def collect(block: bool):
+                finished, rest = wait(pending, return_when=FIRST_COMPLETED) if block else (
+                    {f for f in pending if f.done()}, None)
+                for fut in finished:
+                    pending.discard(fut)
+                    if fut.cancelled():
+                        continue
+                    try:
+                        rows, failed = fut.result()
+                    except Exception as e:
+                        stats.errors.append(str(e) or e.__class__.__name__)
+                        continue
+                    # Fehlgeschlagene fehlen im Protokoll und werden beim nächsten Lauf erneut versucht
+                    stats.errors += [f"{n}: {msg}" for n, msg in failed]
+                    log.write("".join(f"{n}\n" for n, _ in rows)); log.flush()
+                    stats.rendered += len(rows)
+                    stats.bytes += sum(size for _, size in rows)
+                    if progress:
+                        elapsed = time.perf_counter() - t0
+                        progress(stats.rendered + stats.skipped, total, stats.rendered / elapsed if elapsed else 0.0)
+
+            block: list[dict] = []
+            for inv in invoices:
+                if self._cancel.is_set():
+                    break
+                if inv["number"] in done:
+                    stats.skipped += 1
+                    continue
+                block.append(inv)
+                if len(block) >= self.chunk:
+                    pending.add(pool.submit(_render_chunk, block, str(self.out_dir)))
+                    block = []
+                    while len(pending) >= 2 * self.workers:
+                        collect(block=True)
+            if block and not self._cancel.is_set():
+                pending.add(pool.submit(_render_chunk, block, str(self.out_dir)))
+            if self._cancel.is_set():
+                for fut in pending:
+                    fut.cancel()        # laufende Blöcke werden noch fertig geschrieben
+            while pending:
+                collect(block=True)
+        stats.cancelled = self._cancel.is_set()
+        stats.seconds = time.perf_counter() - t0
+        return stats
+
+
+def default_out_dir(month: Optional[str]) -> Path:
+    return auth.DATA_DIR / "Rechnungen" / (month or "alle")
+
+# ---------------- CLI ----------------
+
+def _cli(argv=None) -> int:
+    import argparse, tempfile
+    ap = argparse.ArgumentParser(prog="invoice_pdf.py", description="Rechnungs-PDFs im Stapel erzeugen")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    rd = sub.add_parser("render", help="PDFs für einen Monat (oder alle) schreiben")
+    rd.add_argument("--month", help="JJJJ-MM")
+    rd.add_argument("--out", type=Path)
+    rd.add_argument("--workers", type=int)
+    rd.add_argument("--restart", action="store_true", help="Erledigt-Protokoll ignorieren")
+    bn = sub.add_parser("bench", help="Durchsatz mit N Rechnungen messen (temporärer Ordner)")
+    bn.add_argument("--count", type=int, default=2000)
+    bn.add_argument("--workers", type=int, nargs="*", default=[1, 2, 4])
+    args = ap.parse_args(argv)
+
+    def report(done, total, rate):
+        print(f"\r{done}/{total}  {rate:.0f} Rechnungen/s", end="", flush=True)
+
+    if args.cmd == "render":
+        r = BatchRenderer(args.out or default_out_dir(args.month), args.workers)
+        if args.restart:
+            r.reset()
+        total = count_invoices(args.month)
+        st = r.run(iter_invoices(args.month), total, report)
+        print(f"\n{st.rendered} geschrieben, {st.skipped} übersprungen, {st.bytes / 1e6:.1f} MB in "
+              f"{st.seconds:.1f} s ({st.per_second:.0f}/s) -> {st.out_dir}")
+        return 1 if st.errors else 0
+    if args.cmd == "bench":
+        invs = [inv for _, inv in zip(range(args.count), iter_invoices())]
+        t0 = time.perf_counter()
+        tpl = InvoiceTemplate(settings())
+        print(f"Vorlage kompilieren: {(time.perf_counter() - t0) * 1000:.2f} ms")
+        t0 = time.perf_counter()
+        for inv in invs[:500]:
+            tpl.render(inv)
+        print(f"Rendern im Prozess: {(time.perf_counter() - t0) * 1000 / min(500, len(invs)):.3f} ms/Rechnung")
+        for n in args.workers:
+            with tempfile.TemporaryDirectory() as tmp:
+                st = BatchRenderer(Path(tmp), n).run(iter(invs), len(invs))
+                print(f"{n} Worker: {st.rendered} in {st.seconds:.2f} s = {st.per_second:.0f} Rechnungen/s "
+                      f"({st.bytes / st.rendered / 1024:.1f} KB/PDF)")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(_cli())
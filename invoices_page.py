@@ -0,0 +1,143 @@
+# invoices_page.py
+from __future__ import annotations
+import time
+from pathlib import Path
+from typing import Optional
+
+from PySide6.QtCore import QObject, QUrl, Signal
+from PySide6.QtGui import QDesktopServices
+from PySide6.QtWidgets import (
+    QCheckBox, QComboBox, QFileDialog, QHBoxLayout, QLabel, QProgressBar, QPushButton, QVBoxLayout, QWidget,
+)
+
+from export_dialog import ExportDialog
+from import_dialog import ImportDialog
+from invoice_pdf import BatchRenderer, BatchStats, count_invoices, default_out_dir, iter_invoices
+from workers import submit
+
+class InvoiceBatchJob(QObject):
+    """Koordiniert einen PDF-Stapel im Worker-Thread; gerendert wird im Prozess-Pool."""
+
+    progress = Signal(int, int, float)      # erledigt, gesamt, Rechnungen/s
+    finished = Signal(object)               # BatchStats
+    failed = Signal(str)
+
+    def __init__(self, month: Optional[str], out_dir: Path, restart: bool = False, parent=None):
+        super().__init__(parent)
+        self.month = month
+        self.renderer = BatchRenderer(out_dir)
+        self.restart = restart
+        self.task = None
+
+    def start(self):
+        def work():
+            if self.restart:
+                self.renderer.reset()
+            total = count_invoices(self.month)
+            self.progress.emit(0, total, 0.0)
+            return self.renderer.run(iter_invoices(self.month), total, self.progress.emit)
+        self.task = submit(work, on_done=self.finished.emit, on_error=self.failed.emit)
+
+    def cancel(self):
+        self.renderer.cancel()
+
+
+class InvoicesPage(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        lay = QVBoxLayout(self); lay.setContentsMargins(0, 0, 0, 0); lay.setSpacing(8)
+        header = QLabel("Rechnungen"); header.setObjectName("PageHeader"); lay.addWidget(header)
+
+        row = QHBoxLayout()
+        self.month = QComboBox()
+        y, m = time.localtime()[:2]
+        for i in range(24):
+            yy, mm = divmod(y * 12 + m - 1 - i, 12)
+            self.month.addItem(f"{mm + 1:02d}/{yy}", f"{yy}-{mm + 1:02d}")
+        self.month.addItem("Alle Monate", None)
+        self.btnDir = QPushButton("Ordner …")
+        self.restart = QCheckBox("Neu erzeugen")
+        self.restart.setToolTip("Erledigt-Protokoll verwerfen und alle PDFs neu schreiben")
+        self.btnRender = QPushButton("PDFs erzeugen"); self.btnCancel = QPushButton("Abbrechen"); self.btnCancel.setEnabled(False)
+        row.addWidget(QLabel("Monat")); row.addWidget(self.month); row.addWidget(self.btnDir); row.addWidget(self.restart)
+        row.addStretch(1); row.addWidget(self.btnRender); row.addWidget(self.btnCancel)
+        lay.addLayout(row)
+        self.target = QLabel(""); self.target.setObjectName("PageBody"); lay.addWidget(self.target)
+        self.progress = QProgressBar(); lay.addWidget(self.progress)
+        self.summary = QLabel("Abgebrochene Stapel werden beim nächsten Start fortgesetzt."); self.summary.setObjectName("PanelTitle")
+        lay.addWidget(self.summary)
+        bottom = QHBoxLayout()
+        self.btnOpen = QPushButton("Ordner öffnen"); self.btnOpen.setEnabled(False)
+        self.btnImport = QPushButton("Rechnungen importieren …")
+        self.btnExport = QPushButton("Rechnungen exportieren …")
+        bottom.addWidget(self.btnOpen); bottom.addStretch(1); bottom.addWidget(self.btnImport); bottom.addWidget(self.btnExport)
+        lay.addLayout(bottom)
+        lay.addStretch(1)
+
+        self.job: Optional[InvoiceBatchJob] = None
+        self._custom_dir: Optional[Path] = None
+        self.month.currentIndexChanged.connect(self._update_target)
+        self.btnDir.clicked.connect(self._choose_dir)
+        self.btnRender.clicked.connect(self.start)
+        self.btnCancel.clicked.connect(self.cancel)
+        self.btnOpen.clicked.connect(lambda: QDesktopServices.openUrl(QUrl.fromLocalFile(str(self.out_dir()))))
+        self.btnImport.clicked.connect(lambda: ImportDialog("invoices", self).show())
+        self.btnExport.clicked.connect(lambda: ExportDialog("invoices", self).show())
+        self._update_target()
+
+    def out_dir(self) -> Path:
+        month = self.month.currentData()
+        return self._custom_dir / (month or "alle") if self._custom_dir else default_out_dir(month)
+
+    def _update_target(self):
+        self.target.setText(f"Ziel: {self.out_dir()}")
+
+    def _choose_dir(self):
+        path = QFileDialog.getExistingDirectory(self, "Zielordner wählen", str(self.out_dir().parent))
+        if path:
+            self._custom_dir = Path(path)
+            self._update_target()
+
+    def evictable(self) -> bool:
+        # PageRegistry: laufenden Job nicht durch Eviction verlieren
+        return self.job is None
+
+    def start(self):
+        if self.job is not None:
+            return
+        self.job = InvoiceBatchJob(self.month.currentData(), self.out_dir(), self.restart.isChecked(), parent=self)
+        self.job.progress.connect(self._on_progress)
+        self.job.finished.connect(self._on_finished)
+        self.job.failed.connect(self._on_failed)
+        self.btnRender.setEnabled(False); self.btnCancel.setEnabled(True); self.month.setEnabled(False)
+        self.summary.setText("Zähle Rechnungen …")
+        self.job.start()
+
+    def cancel(self):
+        if self.job:
+            self.job.cancel()
+            self.summary.setText("Breche ab – laufende Blöcke werden noch geschrieben …")
+
+    def _on_progress(self, done: int, total: int, rate: float):
+        self.progress.setRange(0, max(total, 1)); self.progress.setValue(done)
+        if rate:
+            self.summary.setText(f"{done:,} / {total:,} Rechnungen · {rate:,.0f}/s".replace(",", "."))
+
+    def _done(self):
+        self.btnRender.setEnabled(True); self.btnCancel.setEnabled(False); self.month.setEnabled(True)
+        self.btnOpen.setEnabled(True)
+        self.job = None
+
+    def _on_finished(self, st: BatchStats):
+        self._done()
+        text = (f"{st.rendered:,} PDFs ({st.bytes / 1e6:.1f} MB) in {st.seconds:.1f} s · {st.per_second:,.0f}/s"
+                f" · {st.skipped:,} bereits vorhanden").replace(",", ".")
+        if st.errors:
+            text += f" · {len(st.errors)} Fehler: {st.errors[0]}"
+        if st.cancelled:
+            text += " · abgebrochen, beim nächsten Start wird fortgesetzt"
+        self.summary.setText(text)
+
+    def _on_failed(self, msg: str):
+        self._done()
+        self.summary.setText(f"Fehler: {msg}")
@@ -6,9 +6,29 @@ from PySide6.QtWidgets import (
     QPushButton, QMessageBox
 )
 from auth import (
-    authenticate, change_password, load_users, ensure_default_admin,
-    new_remember_token, attach_token, load_config, save_config
+    authenticate, change_password, bootstrap_admin, get_user,
+    issue_remember_token, load_config, save_config
 )
+from workers import submit_auth
+
+# ---------------- Hintergrund-Schritte (laufen im Auth-Pool) ----------------
+
+def _bootstrap_admin() -> bool:
+    return bootstrap_admin().must_change_pw
+
+def _check_login(username: str, password: str) -> tuple[bool, str, bool]:
+    ok, msg = authenticate(username, password)
+    if not ok:
+        return False, msg, False
+    return True, "", get_user(username).must_change_pw
+
+def _remember_login(username: str):
+    token = issue_remember_token(username)
+    cfg = load_config()
+    cfg["remember_user"] = username
+    cfg["remember_token"] = token
+    save_config(cfg)
+
 
 class LoginDialog(QDialog):
     def __init__(self, parent=None):
@@ -28,9 +48,13 @@ class LoginDialog(QDialog):
         self.pw = QLineEdit(self); self.pw.setPlaceholderText("Passwort"); self.pw.setEchoMode(QLineEdit.Password)
         self.remember = QCheckBox("Angemeldet bleiben", self)
 
+        self.status = QLabel("", self)
+        self.status.setObjectName("StatusLabel")
+
         v.addWidget(self.user)
         v.addWidget(self.pw)
         v.addWidget(self.remember)
+        v.addWidget(self.status)
 
         h = QHBoxLayout()
         h.addStretch(1)
@@ -39,42 +63,109 @@ class LoginDialog(QDialog):
         h.addWidget(self.btn_cancel); h.addWidget(self.btn_login)
         v.addLayout(h)
 
-        self.btn_cancel.clicked.connect(self.reject)
+        self.btn_cancel.clicked.connect(self.cancel_or_reject)
         self.btn_login.clicked.connect(self.try_login)
 
-        # Default-Admin sicherstellen (falls erste Ausführung)
-        users = ensure_default_admin(load_users())
-        if "admin" in users and users["admin"].must_change_pw:
+        self._task = None
+        self._cancellable = True
+        self._gen = 0       # verwirft Ergebnisse, deren Signal vor dem Abbruch schon unterwegs war
+
+        # Default-Admin sicherstellen (falls erste Ausführung) – hasht ggf.
+        # das Startpasswort, daher im Hintergrund
+        self._run(_bootstrap_admin, self._on_bootstrap, "Initialisiere …")
+
+    # ----- Busy-Zustand -----
+
+    def _run(self, fn, on_done, message: str, *args, cancellable: bool = True):
+        self._set_busy(True, message)
+        self._gen += 1
+        gen = self._gen
+        self._cancellable = cancellable
+        self._task = submit_auth(fn, *args,
+                                 on_done=lambda r: gen == self._gen and on_done(r),
+                                 on_error=lambda m: gen == self._gen and self._on_error(m))
+
+    def _set_busy(self, busy: bool, message: str = ""):
+        for w in (self.user, self.pw, self.remember, self.btn_login):
+            w.setEnabled(not busy)
+        self.status.setText(message)
+        if busy:
+            self.setCursor(Qt.BusyCursor)
+        else:
+            self.unsetCursor()
+            self._task = None
+
+    def is_busy(self) -> bool:
+        return self._task is not None
+
+    def _cancel_task(self) -> bool:
+        # False: Schritt mit bleibender Wirkung läuft schon – abwarten
+        if not self._task.cancel() and not self._cancellable:
+            self.status.setText("Bitte warten, wird gerade gespeichert …")
+            return False
+        self._gen += 1
+        return True
+
+    def cancel_or_reject(self):
+        # Während einer Prüfung bricht "Abbrechen" nur die Prüfung ab
+        if self.is_busy():
+            if self._cancel_task():
+                self._set_busy(False, "Abgebrochen.")
+            return
+        self.reject()
+
+    def reject(self):
+        if self.is_busy():
+            if not self._cancel_task():
+                return
+            self._set_busy(False)
+        super().reject()
+
+    def _on_error(self, msg: str):
+        self._set_busy(False)
+        QMessageBox.warning(self, "Fehler", msg or "Unbekannter Fehler.")
+
+    # ----- Login-Flow -----
+
+    def _on_bootstrap(self, must_change_admin: bool):
+        self._set_busy(False)
+        if must_change_admin and not self.user.text():
             self.user.setText("admin")
+        (self.pw if self.user.text() else self.user).setFocus()
 
     def try_login(self):
+        if self.is_busy():
+            return
         u = self.user.text().strip()
         p = self.pw.text()
+        self._pending_user = u
+        self._run(_check_login, self._on_checked, "Anmeldung wird geprüft …", u, p)
 
-        ok, msg = authenticate(u, p)
+    def _on_checked(self, result: tuple[bool, str, bool]):
+        self._set_busy(False)
+        ok, msg, must_change = result
+        u = self._pending_user
         if not ok:
             if msg:
                 QMessageBox.warning(self, "Login fehlgeschlagen", msg)
             return
 
         # Passwortwechsel erforderlich?
-        users = ensure_default_admin(load_users())
-        if users[u].must_change_pw:
+        if must_change:
             dlg = ChangePasswordDialog(u, parent=self)
             if dlg.exec() != QDialog.Accepted:
                 return  # Abbruch -> zurück zu Login
 
         # Remember me Token
         if self.remember.isChecked():
-            cfg = load_config()
-            token = new_remember_token()
-            attach_token(users, u, token)
-            cfg["remember_user"] = u
-            cfg["remember_token"] = token
-            save_config(cfg)
+            self._run(_remember_login, lambda _: self._finish(u), "Speichere Anmeldung …", u, cancellable=False)
+            return
+        self._finish(u)
 
-        self.accept()
+    def _finish(self, u: str):
+        self._set_busy(False)
         self.username = u  # verfügbar für Aufrufer
+        self.accept()
 
 class ChangePasswordDialog(QDialog):
     def __init__(self, username: str, parent=None):
@@ -96,20 +187,55 @@ class ChangePasswordDialog(QDialog):
 
         v.addWidget(self.old); v.addWidget(self.new1); v.addWidget(self.new2)
 
+        self.status = QLabel("", self)
+        self.status.setObjectName("StatusLabel")
+        v.addWidget(self.status)
+
         h = QHBoxLayout(); h.addStretch(1)
-        ok = QPushButton("Speichern", self)
-        cancel = QPushButton("Abbrechen", self)
-        h.addWidget(cancel); h.addWidget(ok)
+        self.btn_ok = QPushButton("Speichern", self)
+        self.btn_cancel = QPushButton("Abbrechen", self)
+        h.addWidget(self.btn_cancel); h.addWidget(self.btn_ok)
         v.addLayout(h)
 
-        cancel.clicked.connect(self.reject)
-        ok.clicked.connect(self.save_pw)
+        self._task = None
+        self.btn_cancel.clicked.connect(self.reject)
+        self.btn_ok.clicked.connect(self.save_pw)
+
+    def _set_busy(self, busy: bool, message: str = ""):
+        # Auch "Abbrechen": ein laufender Passwortwechsel wird trotzdem gespeichert
+        for w in (self.old, self.new1, self.new2, self.btn_ok, self.btn_cancel):
+            w.setEnabled(not busy)
+        self.status.setText(message)
+        if busy:
+            self.setCursor(Qt.BusyCursor)
+        else:
+            self.unsetCursor()
+            self._task = None
+
+    def reject(self):
+        # Esc / Fenster schließen: nur solange der Wechsel noch nicht läuft
+        if self._task is not None:
+            if not self._task.cancel():
+                self.status.setText("Passwort wird bereits gespeichert – bitte warten …")
+                return
+            self._set_busy(False)
+        super().reject()
 
     def save_pw(self):
+        if self._task is not None:
+            return
         if self.new1.text() != self.new2.text():
             QMessageBox.warning(self, "Fehler", "Die neuen Passwörter stimmen nicht überein.")
             return
-        ok, msg = change_password(self.username, self.old.text(), self.new1.text())
+        self._set_busy(True, "Passwort wird gespeichert …")
+        self._task = submit_auth(
+            change_password, self.username, self.old.text(), self.new1.text(),
+            on_done=self._on_saved, on_error=lambda m: self._on_saved((False, m)),
+        )
+
+    def _on_saved(self, result: tuple[bool, str]):
+        self._set_busy(False)
+        ok, msg = result
         if not ok:
             QMessageBox.warning(self, "Fehler", msg or "Unbekannter Fehler.")
             return
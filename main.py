@@ -1,23 +1,29 @@
 # main.py
+import sys
+
 from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QTimer, QPoint
-from PySide6.QtGui import QFont, QAction
+from PySide6.QtGui import QAction
 from PySide6.QtWidgets import (
     QApplication, QWidget, QMainWindow, QVBoxLayout, QHBoxLayout, QFrame,
-    QPushButton, QLabel, QStackedWidget, QSizePolicy, QGraphicsOpacityEffect,
+    QPushButton, QLabel, QStackedWidget,
     QDialog, QLineEdit, QDialogButtonBox, QGridLayout, QMessageBox, QRadioButton, QButtonGroup
 )
 
 import auth  # Sicherheits-Backend
-
-# ======= Theme / Farben =======
-ACCENT   = "#8B5CF6"
-BG_DARK  = "#0F172A"
-BG_PANEL = "#111827"
-FG_TEXT  = "#E5E7EB"
-FG_MUTED = "#9CA3AF"
-SUCCESS  = "#10B981"
-WARN     = "#F59E0B"
-ERROR    = "#EF4444"
+import animation
+import tracing
+import stall_watchdog
+from tracing import traced
+from page_registry import PageRegistry
+from clients_page import ClientsPage
+from dashboard_page import DashboardPage
+from domains_page import DomainsPage
+from invoices_page import InvoicesPage
+from search_box import SearchBox
+from data_provider import provider
+
+# ======= Theme (Stylesheet zentral in theme.py) =======
+from theme import engine as theme_engine
 
 # ----------------------------- Erststart/Setup Dialog -----------------------------
 class FirstRunDialog(QDialog):
@@ -34,11 +40,11 @@ class FirstRunDialog(QDialog):
         root.setSpacing(12)
 
         title = QLabel("Zugang einrichten")
-        title.setStyleSheet(f"color: {FG_TEXT}; font-size: 18px; font-weight: 600;")
+        title.setObjectName("DialogTitle")
         root.addWidget(title)
 
         info = QLabel("Wähle, wo dein Passwort-Hash gespeichert wird, und setze ein Startpasswort.")
-        info.setStyleSheet(f"color: {FG_MUTED}; font-size: 12px;")
+        info.setObjectName("DialogInfo")
         info.setWordWrap(True)
         root.addWidget(info)
 
@@ -62,7 +68,6 @@ class FirstRunDialog(QDialog):
             self.rbFile.setChecked(True)
 
         for rb in (self.rbCredman, self.rbFile):
-            rb.setStyleSheet(f"color: {FG_TEXT}; font-size: 13px;")
             bLay.addWidget(rb)
 
         root.addWidget(backendFrame)
@@ -75,19 +80,19 @@ class FirstRunDialog(QDialog):
         grid.setVerticalSpacing(10)
 
         lblUser = QLabel("Benutzername")
-        lblUser.setStyleSheet(f"color: {FG_MUTED}; font-size: 12px;")
+        lblUser.setObjectName("FieldLabel")
         self.txtUser = QLineEdit()
         self.txtUser.setText(auth.DEFAULT_USER)
         self.txtUser.setReadOnly(True)
         self.txtUser.setMinimumWidth(280)
 
         lblPw1 = QLabel("Passwort")
-        lblPw1.setStyleSheet(f"color: {FG_MUTED}; font-size: 12px;")
+        lblPw1.setObjectName("FieldLabel")
         self.txtPw1 = QLineEdit()
         self.txtPw1.setEchoMode(QLineEdit.Password)
 
         lblPw2 = QLabel("Passwort wiederholen")
-        lblPw2.setStyleSheet(f"color: {FG_MUTED}; font-size: 12px;")
+        lblPw2.setObjectName("FieldLabel")
         self.txtPw2 = QLineEdit()
         self.txtPw2.setEchoMode(QLineEdit.Password)
 
@@ -101,7 +106,7 @@ class FirstRunDialog(QDialog):
         root.addWidget(form)
 
         self.errorLabel = QLabel("")
-        self.errorLabel.setStyleSheet("color: #FCA5A5; font-size: 12px;")
+        self.errorLabel.setObjectName("ErrorLabel")
         root.addWidget(self.errorLabel)
 
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
@@ -111,34 +116,6 @@ class FirstRunDialog(QDialog):
         buttons.rejected.connect(self.reject)
         root.addWidget(buttons)
 
-        self.setStyleSheet(f"""
-            QDialog {{ background-color: {BG_DARK}; }}
-            QFrame {{
-                background-color: {BG_PANEL};
-                border: 1px solid rgba(255,255,255,0.06);
-                border-radius: 12px;
-            }}
-            QLineEdit {{
-                background: rgba(255,255,255,0.06);
-                border: 1px solid rgba(255,255,255,0.12);
-                border-radius: 8px;
-                padding: 8px 10px;
-                color: {FG_TEXT};
-            }}
-            QLineEdit:focus {{
-                border: 1px solid rgba(139, 92, 246, 0.65);
-                background: rgba(255,255,255,0.09);
-            }}
-            QPushButton {{
-                background-color: rgba(139, 92, 246, 0.85);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 8px 12px;
-            }}
-            QPushButton:hover {{ background-color: rgba(139, 92, 246, 1.0); }}
-        """)
-
     def save_creds(self):
         pw1 = self.txtPw1.text()
         pw2 = self.txtPw2.text()
@@ -168,7 +145,7 @@ class LoginDialog(QDialog):
         root.setSpacing(12)
 
         title = QLabel("Bitte anmelden")
-        title.setStyleSheet(f"color: {FG_TEXT}; font-size: 18px; font-weight: 600;")
+        title.setObjectName("DialogTitle")
         root.addWidget(title)
 
         form = QFrame()
@@ -178,7 +155,7 @@ class LoginDialog(QDialog):
         grid.setVerticalSpacing(10)
 
         lblUser = QLabel("Benutzername")
-        lblUser.setStyleSheet(f"color: {FG_MUTED}; font-size: 12px;")
+        lblUser.setObjectName("FieldLabel")
         self.txtUser = QLineEdit()
         self.txtUser.setPlaceholderText("z. B. Timo.Hertling")
         self.txtUser.setText(auth.DEFAULT_USER)
@@ -186,7 +163,7 @@ class LoginDialog(QDialog):
         self.txtUser.returnPressed.connect(lambda: self.txtPwd.setFocus())
 
         lblPwd = QLabel("Passwort")
-        lblPwd.setStyleSheet(f"color: {FG_MUTED}; font-size: 12px;")
+        lblPwd.setObjectName("FieldLabel")
         self.txtPwd = QLineEdit()
         self.txtPwd.setPlaceholderText("Passwort")
         self.txtPwd.setEchoMode(QLineEdit.Password)
@@ -200,7 +177,7 @@ class LoginDialog(QDialog):
         root.addWidget(form)
 
         self.errorLabel = QLabel("")
-        self.errorLabel.setStyleSheet("color: #FCA5A5; font-size: 12px;")
+        self.errorLabel.setObjectName("ErrorLabel")
         root.addWidget(self.errorLabel)
 
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
@@ -210,34 +187,6 @@ class LoginDialog(QDialog):
         buttons.rejected.connect(self.reject)
         root.addWidget(buttons)
 
-        self.setStyleSheet(f"""
-            QDialog {{ background-color: {BG_DARK}; }}
-            QFrame {{
-                background-color: {BG_PANEL};
-                border: 1px solid rgba(255,255,255,0.06);
-                border-radius: 12px;
-            }}
-            QLineEdit {{
-                background: rgba(255,255,255,0.06);
-                border: 1px solid rgba(255,255,255,0.12);
-                border-radius: 8px;
-                padding: 8px 10px;
-                color: {FG_TEXT};
-            }}
-            QLineEdit:focus {{
-                border: 1px solid rgba(139, 92, 246, 0.65);
-                background: rgba(255,255,255,0.09);
-            }}
-            QPushButton {{
-                background-color: rgba(139, 92, 246, 0.85);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 8px 12px;
-            }}
-            QPushButton:hover {{ background-color: rgba(139, 92, 246, 1.0); }}
-        """)
-
     def try_login(self):
         user = self.txtUser.text().strip()
         pwd  = self.txtPwd.text()
@@ -259,86 +208,77 @@ class LoginDialog(QDialog):
         anim.setKeyValueAt(1.0, start)
         anim.start()
 
-# ----------------------------- UI Komponenten (Dashboard etc.) -----------------------------
-class StatsCard(QFrame):
-    def __init__(self, title: str, value: int|str = "—", color: str = ACCENT, parent=None):
-        super().__init__(parent)
-        self.setObjectName("StatsCard")
-        self.titleLabel = QLabel(title); self.titleLabel.setObjectName("CardTitle")
-        self.valueLabel = QLabel(str(value)); self.valueLabel.setObjectName("CardValue")
-        lay = QVBoxLayout(self); lay.setContentsMargins(16, 16, 16, 16); lay.setSpacing(6)
-        lay.addWidget(self.titleLabel); lay.addWidget(self.valueLabel, 0, Qt.AlignLeft|Qt.AlignVCenter)
-        self.setStyleSheet(f"""
-            QFrame#StatsCard {{ background-color: {BG_PANEL}; border: 1px solid rgba(255,255,255,0.06); border-radius: 12px; }}
-            QLabel#CardTitle {{ color: {FG_MUTED}; font-size: 12px; letter-spacing: 0.5px; }}
-            QLabel#CardValue {{ color: {FG_TEXT}; font-size: 28px; font-weight: 600; }}
-        """)
-
-    def animate_to(self, target_value: int, duration_ms: int = 700):
-        try: current = int(self.valueLabel.text())
-        except ValueError: current = 0
-        steps = max(1, int(duration_ms / 16))
-        delta = (target_value - current) / steps
-        i = 0
-        def tick():
-            nonlocal i, current
-            i += 1; current += delta
-            if i >= steps:
-                self.valueLabel.setText(str(target_value)); timer.stop()
-            else:
-                self.valueLabel.setText(str(int(current)))
-        timer = QTimer(self); timer.timeout.connect(tick); timer.start(16)
-
-class DashboardPage(QWidget):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        wrapper = QVBoxLayout(self); wrapper.setContentsMargins(0, 0, 0, 0); wrapper.setSpacing(12)
-        header = QLabel("Dashboard"); header.setObjectName("PageHeader")
-        row = QHBoxLayout(); row.setSpacing(12)
-        self.cardClients = StatsCard("KUNDEN", 0, ACCENT)
-        self.cardInvoicesOpen = StatsCard("OFFENE KUNDENRECHNUNGEN", 0, WARN)
-        self.cardOwnOpen = StatsCard("EIGENE OFFENE RECHNUNGEN", 0, ERROR)
-        self.cardDomains = StatsCard("VERFÜGBARE DOMAINS", "—", SUCCESS)
-        for c in (self.cardClients, self.cardInvoicesOpen, self.cardOwnOpen, self.cardDomains): c.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-        row.addWidget(self.cardClients); row.addWidget(self.cardInvoicesOpen); row.addWidget(self.cardOwnOpen); row.addWidget(self.cardDomains)
-        wrapper.addWidget(header); rowWidget = QWidget(); rowWidget.setLayout(row); wrapper.addWidget(rowWidget)
-        placeholder = QFrame(); placeholder.setObjectName("Placeholder"); placeholder.setMinimumHeight(280)
-        placeholder.setStyleSheet(f"QFrame#Placeholder {{ background-color: {BG_PANEL}; border: 1px solid rgba(255,255,255,0.06); border-radius: 12px; }}")
-        phLay = QVBoxLayout(placeholder); phLay.setContentsMargins(16, 16, 16, 16)
-        phTitle = QLabel("Kürzlich aktualisiert (Platzhalter)"); phTitle.setStyleSheet(f"color: {FG_MUTED}; font-size: 13px;")
-        phLay.addWidget(phTitle); wrapper.addWidget(placeholder)
-        self.setStyleSheet(f"QLabel#PageHeader {{ color: {FG_TEXT}; font-size: 20px; font-weight: 600; padding: 4px 8px; }}")
-        QTimer.singleShot(300, lambda: self.cardClients.animate_to(12))
-        QTimer.singleShot(400, lambda: self.cardInvoicesOpen.animate_to(3))
-        QTimer.singleShot(500, lambda: self.cardOwnOpen.animate_to(1))
-
+# ----------------------------- UI Komponenten -----------------------------
 class PlaceholderPage(QWidget):
     def __init__(self, title: str, parent=None):
         super().__init__(parent)
         lay = QVBoxLayout(self); lay.setContentsMargins(0, 0, 0, 0)
-        header = QLabel(title); header.setStyleSheet(f"color: {FG_TEXT}; font-size: 20px; font-weight: 600; padding: 4px 8px;")
-        lay.addWidget(header); body = QLabel("Inhalt folgt …"); body.setStyleSheet(f"color: {FG_MUTED}; font-size: 14px; padding: 8px;"); lay.addWidget(body)
+        header = QLabel(title); header.setObjectName("PageHeader")
+        lay.addWidget(header); body = QLabel("Inhalt folgt …"); body.setObjectName("PageBody"); lay.addWidget(body)
+
+class SettingsPage(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        lay = QVBoxLayout(self); lay.setContentsMargins(0, 0, 0, 0); lay.setSpacing(12)
+        header = QLabel("Einstellungen"); header.setObjectName("PageHeader"); lay.addWidget(header)
+        panel = QFrame(); panel.setObjectName("Placeholder")
+        pLay = QVBoxLayout(panel); pLay.setContentsMargins(16, 16, 16, 16)
+        title = QLabel("Event-Loop-Latenz"); title.setObjectName("PanelTitle"); pLay.addWidget(title)
+        self.latency = QLabel(); self.latency.setObjectName("Histogram"); self.latency.setTextFormat(Qt.PlainText)
+        pLay.addWidget(self.latency)
+        title = QLabel("Datenquellen"); title.setObjectName("PanelTitle"); pLay.addWidget(title)
+        self.providers = QLabel(); self.providers.setObjectName("Histogram"); self.providers.setTextFormat(Qt.PlainText)
+        pLay.addWidget(self.providers); pLay.addStretch(1)
+        lay.addWidget(panel); lay.addStretch(1)
+        # Nur aktualisieren, solange die Seite sichtbar ist
+        self._refresh = QTimer(self); self._refresh.setInterval(1000); self._refresh.timeout.connect(self.refresh)
+        self.refresh()
+
+    def showEvent(self, e):
+        super().showEvent(e); self.refresh(); self._refresh.start()
+
+    def hideEvent(self, e):
+        super().hideEvent(e); self._refresh.stop()
+
+    def refresh(self):
+        self.update_latency(); self.update_providers()
+
+    def update_latency(self):
+        wd = stall_watchdog.watchdog()
+        if wd is None:
+            self.latency.setText("Watchdog aus (DA_WATCHDOG=1 oder \"watchdog_ms\" in config.json)")
+            return
+        hist = wd.histogram(); total = sum(n for _, n in hist) or 1
+        lines = [f"{label:>10}  {'█' * round(40 * n / total):<40}  {n}" for label, n in hist]
+        st = wd.stats()
+        lines.append(f"\nStalls > {wd.threshold * 1000:.0f} ms: {st['stalls']}   max. Verspätung: {st['max_latency_ms']} ms")
+        if wd.stalls:
+            lines.append(f"Letzter Stall: {wd.stalls[-1][1]:.0f} ms")
+        self.latency.setText("\n".join(lines))
+
+    def update_providers(self):
+        lines = [f"{name:<20} Trefferquote {s['hit_rate'] if s['hit_rate'] is not None else '–':<6} "
+                 f"Ladevorgänge {s['loads']:<5} Ø {s['avg_load_ms'] or 0:.1f} ms"
+                 for name, s in provider().stats().items()]
+        self.providers.setText("\n".join(lines) or "Noch keine Datenquellen aktiv")
 
 class SideButton(QPushButton):
     def __init__(self, text: str, parent=None):
         super().__init__(text, parent)
+        self.setObjectName("SideButton")
         self.setCheckable(True); self.setCursor(Qt.PointingHandCursor); self.setMinimumHeight(40)
-        self.setStyleSheet(f"""
-            QPushButton {{ color: {FG_TEXT}; background-color: transparent; border: none; text-align: left; padding: 8px 12px; border-radius: 8px; font-size: 14px; }}
-            QPushButton:hover {{ background-color: rgba(255,255,255,0.06); }}
-            QPushButton:checked {{ background-color: rgba(139, 92, 246, 0.18); border: 1px solid rgba(139, 92, 246, 0.45); }}
-        """)
 
 class MainWindow(QMainWindow):
+    @traced("main.MainWindow.__init__")
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Digitale Alchemy Studio"); self.resize(1180, 740)
-        self._fadeAnims = []
+        animation.clock().reduced_motion |= bool(auth.load_config().get("reduced_motion"))
         central = QFrame(); central.setObjectName("Central"); self.setCentralWidget(central)
         root = QHBoxLayout(central); root.setContentsMargins(0, 0, 0, 0); root.setSpacing(0)
         sidebar = QFrame(); sidebar.setObjectName("Sidebar"); sidebar.setFixedWidth(220)
         sideLay = QVBoxLayout(sidebar); sideLay.setContentsMargins(12, 16, 12, 16); sideLay.setSpacing(6)
-        appTitle = QLabel("Digitale\nAlchemy Studio"); appTitle.setStyleSheet(f"color: {FG_TEXT}; font-size: 18px; font-weight: 700;"); appTitle.setWordWrap(True)
+        appTitle = QLabel("Digitale\nAlchemy Studio"); appTitle.setObjectName("AppTitle"); appTitle.setWordWrap(True)
         sideLay.addWidget(appTitle); sideLay.addSpacing(8)
         self.btnDashboard = SideButton("Dashboard"); self.btnClients = SideButton("Kunden"); self.btnInvoices = SideButton("Rechnungen")
         self.btnDomains = SideButton("Domains"); self.btnContracts = SideButton("Verträge"); self.btnSettings = SideButton("Einstellungen")
@@ -346,11 +286,18 @@ class MainWindow(QMainWindow):
         sideLay.addStretch(1)
         mainArea = QFrame(); mainArea.setObjectName("MainArea"); mainLay = QVBoxLayout(mainArea); mainLay.setContentsMargins(16, 16, 16, 16); mainLay.setSpacing(12)
         header = QFrame(); header.setObjectName("Header"); headerLay = QHBoxLayout(header); headerLay.setContentsMargins(12, 12, 12, 12); headerLay.setSpacing(8)
-        hdrTitle = QLabel("Übersicht"); hdrTitle.setStyleSheet(f"color: {FG_TEXT}; font-size: 16px; font-weight: 600;"); headerLay.addWidget(hdrTitle); headerLay.addStretch(1)
+        hdrTitle = QLabel("Übersicht"); hdrTitle.setObjectName("HeaderTitle"); headerLay.addWidget(hdrTitle); headerLay.addStretch(1)
+        self.search = SearchBox(); headerLay.addWidget(self.search)
         self.stack = QStackedWidget()
-        self.pageDashboard = DashboardPage(); self.pageClients = PlaceholderPage("Kunden"); self.pageInvoices = PlaceholderPage("Rechnungen")
-        self.pageDomains = PlaceholderPage("Domains"); self.pageContracts = PlaceholderPage("Verträge"); self.pageSettings = PlaceholderPage("Einstellungen")
-        for p in (self.pageDashboard, self.pageClients, self.pageInvoices, self.pageDomains, self.pageContracts, self.pageSettings): self.stack.addWidget(p)
+        # Seiten werden erst beim ersten Anzeigen gebaut (bzw. im Leerlauf vorgebaut)
+        self.pages = PageRegistry(self.stack, memory_budget_mb=auth.load_config().get("page_memory_budget_mb"))
+        self.pages.register("Dashboard", DashboardPage)
+        self.pages.register("Kunden", ClientsPage)
+        self.pages.register("Rechnungen", InvoicesPage, prefetch=True)
+        self.pages.register("Domains", DomainsPage, prefetch=True)
+        self.pages.register("Verträge", lambda: PlaceholderPage("Verträge"), prefetch=True)
+        self.pages.register("Einstellungen", SettingsPage, prefetch=True)
+        self.pages.show(0)
         mainLay.addWidget(header); mainLay.addWidget(self.stack)
         root.addWidget(sidebar); root.addWidget(mainArea, 1)
         self.btnDashboard.clicked.connect(lambda: self.switch_page(0, self.btnDashboard))
@@ -360,38 +307,41 @@ class MainWindow(QMainWindow):
         self.btnContracts.clicked.connect(lambda: self.switch_page(4, self.btnContracts))
         self.btnSettings.clicked.connect(lambda: self.switch_page(5, self.btnSettings))
         self.btnDashboard.setChecked(True)
+        self.search.resultActivated.connect(self.open_search_result)
         self.apply_theme()
         viewMenu = self.menuBar().addMenu("Ansicht")
         toggleAct = QAction("Dunkles Theme (Standard)", self, checkable=True, checked=True); toggleAct.triggered.connect(self.toggle_theme)
         viewMenu.addAction(toggleAct)
+        self.pages.prefetch_idle()
 
     def apply_theme(self, dark: bool = True):
-        base_bg = BG_DARK if dark else "#F5F7FB"; base_text = FG_TEXT if dark else "#111827"; panel = BG_PANEL if dark else "#FFFFFF"
-        border = "rgba(0,0,0,0.08)" if not dark else "rgba(255,255,255,0.06)"
-        self.setStyleSheet(f"""
-            QMainWindow {{ background-color: {base_bg}; }}
-            QFrame#Sidebar {{ background-color: {panel}; border-right: 1px solid {border}; }}
-            QFrame#MainArea {{ background-color: {base_bg}; }}
-            QFrame#Header {{ background-color: {panel}; border: 1px solid {border}; border-radius: 12px; }}
-            QMenuBar, QMenu {{ background-color: {panel}; color: {base_text}; }}
-            QMenu::item:selected {{ background: rgba(139, 92, 246, 0.15); }}
-        """)
-        font = QFont(); font.setPointSize(10); QApplication.instance().setFont(font)
+        # Ein Stylesheet für die ganze App (kompiliert + gecacht in theme.py)
+        theme_engine.apply(QApplication.instance(), dark=dark)
 
     def toggle_theme(self, checked: bool):
         self.apply_theme(dark=checked)
 
+    @traced("main.MainWindow.switch_page")
     def switch_page(self, index: int, btn: QPushButton):
         for b in (self.btnDashboard, self.btnClients, self.btnInvoices, self.btnDomains, self.btnContracts, self.btnSettings):
             b.setChecked(b is btn)
-        self.stack.setCurrentIndex(index)
-        page = self.stack.currentWidget()
-        eff = QGraphicsOpacityEffect(page); page.setGraphicsEffect(eff); eff.setOpacity(0.0)
-        anim = QPropertyAnimation(eff, b"opacity", self); anim.setDuration(200); anim.setStartValue(0.0); anim.setEndValue(1.0); anim.setEasingCurve(QEasingCurve.InOutCubic); anim.start()
+        page = self.pages.show(index)
+        animation.fade_in(page, 200)  # Effekt wird nach dem Einblenden wieder entfernt
+
+    def open_search_result(self, kind: str, ref: int, title: str):
+        index, btn = {"client": (1, self.btnClients), "invoice": (2, self.btnInvoices),
+                      "domain": (3, self.btnDomains), "contract": (4, self.btnContracts)}[kind]
+        self.switch_page(index, btn)
+        page = self.pages.page(index)
+        if kind == "client" and isinstance(page, ClientsPage):
+            page.filter.setText(title.split()[0])     # Kd.-Nr.
 
 # ----------------------------- App Start -----------------------------
 def main():
+    tracing.init_from_env(sys.argv)
     app = QApplication([])
+    theme_engine.apply(app, dark=True)
+    stall_watchdog.start_from_config(auth.load_config(), auth.DATA_DIR / "stalls.log")
 
     # Erststart? -> Setup Dialog (Passwort setzen + Backend wählen)
     if not auth.credentials_exist(auth.DEFAULT_USER):
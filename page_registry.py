@@ -0,0 +1,221 @@
+# page_registry.py
+from __future__ import annotations
+import os, sys, time
+from typing import Callable, Optional
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtWidgets import QStackedWidget, QTabWidget, QWidget
+
+from tracing import span
+
+# ---------------- Speicherverbrauch ----------------
+
+def process_rss_mb() -> Optional[float]:
+    """Aktuelles Working Set / RSS des Prozesses in MB (None, falls unbekannt)."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2**20
+    except Exception:
+        pass
+    if sys.platform == "win32":
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class PMC(ctypes.Structure):
+                _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                    (n, ctypes.c_size_t) for n in (
+                        "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                        "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage",
+                        "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+
+            pmc = PMC()
+            pmc.cb = ctypes.sizeof(PMC)
+            proc = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(proc, ctypes.byref(pmc), pmc.cb):
+                return pmc.WorkingSetSize / 2**20
+        except Exception:
+            return None
+        return None
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except Exception:
+        return None
+
+# ---------------- Page registry ----------------
+
+class _Entry:
+    __slots__ = ("title", "factory", "prefetch", "widget", "build_ms", "builds", "hidden_since")
+
+    def __init__(self, title: str, factory: Callable[[], QWidget], prefetch: bool):
+        self.title = title
+        self.factory = factory
+        self.prefetch = prefetch
+        self.widget: Optional[QWidget] = None
+        self.build_ms = 0.0
+        self.builds = 0
+        self.hidden_since = time.monotonic()
+
+
+class PageRegistry(QObject):
+    """Baut Seiten eines QStackedWidget/QTabWidget erst beim ersten Anzeigen.
+
+    Bis dahin steht ein leeres QWidget an der Stelle. Seiten mit prefetch=True
+    werden im Leerlauf einzeln vorgebaut. Liegt der Prozess über
+    memory_budget_mb, werden Seiten, die länger als evict_after_s verborgen
+    sind, wieder durch Platzhalter ersetzt (ältere zuerst). Seiten mit
+    evictable() -> False (z. B. während eines laufenden Jobs) bleiben stehen.
+    """
+
+    pageBuilt = Signal(int, str, float)     # Index, Titel, Bauzeit in ms
+
+    def __init__(self, host: QStackedWidget | QTabWidget, memory_budget_mb: Optional[float] = None,
+                 evict_after_s: float = 300.0, parent: Optional[QObject] = None):
+        super().__init__(parent or host)
+        self.host = host
+        self.memory_budget_mb = memory_budget_mb
+        self.evict_after_s = evict_after_s
+        self._entries: list[_Entry] = []
+        self._current = -1
+        self._swapping = False
+        host.currentChanged.connect(self._on_current_changed)
+
+        self._idle = QTimer(self)
+        self._idle.setInterval(50)
+        self._idle.setSingleShot(True)
+        self._idle.timeout.connect(self._prefetch_next)
+
+        self._evict_timer = QTimer(self)
+        self._evict_timer.setInterval(60_000)
+        self._evict_timer.timeout.connect(self.maybe_evict)
+        if memory_budget_mb:
+            self._evict_timer.start()
+
+    # ----- Registrierung -----
+
+    def register(self, title: str, factory: Callable[[], QWidget], prefetch: bool = False) -> int:
+        self._entries.append(_Entry(title, factory, prefetch))
+        placeholder = QWidget()
+        self._swapping = True
+        try:
+            if isinstance(self.host, QTabWidget):
+                index = self.host.addTab(placeholder, title)
+            else:
+                index = self.host.addWidget(placeholder)
+        finally:
+            self._swapping = False
+        return index
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def is_built(self, index: int) -> bool:
+        return self._entries[index].widget is not None
+
+    # ----- Bauen / Tauschen -----
+
+    def _swap(self, index: int, widget: QWidget):
+        old = self.host.widget(index)
+        current = self.host.currentIndex()
+        self._swapping = True
+        try:
+            if isinstance(self.host, QTabWidget):
+                self.host.insertTab(index, widget, self._entries[index].title)
+                self.host.removeTab(index + 1)
+            else:
+                self.host.insertWidget(index, widget)
+                self.host.removeWidget(old)
+            self.host.setCurrentIndex(current)
+        finally:
+            self._swapping = False
+        old.deleteLater()
+
+    def page(self, index: int) -> QWidget:
+        e = self._entries[index]
+        if e.widget is None:
+            t0 = time.perf_counter()
+            with span("pages.build", page=e.title):
+                e.widget = e.factory()
+            e.build_ms = (time.perf_counter() - t0) * 1000
+            e.builds += 1
+            self._swap(index, e.widget)
+            self.pageBuilt.emit(index, e.title, e.build_ms)
+        return e.widget
+
+    def show(self, index: int) -> QWidget:
+        w = self.page(index)
+        self.host.setCurrentIndex(index)
+        # Ohne Indexwechsel (erste Seite beim Start) kommt kein currentChanged
+        self._track(index)
+        return w
+
+    def _track(self, index: int):
+        if index == self._current:
+            return
+        if 0 <= self._current < len(self._entries):
+            self._entries[self._current].hidden_since = time.monotonic()
+        self._current = index
+
+    def _on_current_changed(self, index: int):
+        if self._swapping or index < 0:
+            return
+        self._track(index)
+        if not self.is_built(index):
+            self.page(index)
+        self.maybe_evict()
+
+    # ----- Prefetch im Leerlauf -----
+
+    def prefetch_idle(self, delay_ms: int = 500):
+        QTimer.singleShot(delay_ms, self._idle.start)
+
+    def _prefetch_next(self):
+        # Eine Seite pro Tick, damit der Event-Loop dazwischen atmen kann
+        for i, e in enumerate(self._entries):
+            if e.prefetch and e.widget is None and e.builds == 0:
+                self.page(i)
+                self._idle.start()
+                return
+
+    # ----- Eviction -----
+
+    @staticmethod
+    def _evictable(widget: QWidget) -> bool:
+        check = getattr(widget, "evictable", None)
+        return check() if callable(check) else True
+
+    def evict(self, index: int) -> bool:
+        e = self._entries[index]
+        if e.widget is None or index == self.host.currentIndex() or not self._evictable(e.widget):
+            return False
+        e.widget = None
+        self._swap(index, QWidget())
+        return True
+
+    def maybe_evict(self) -> int:
+        if not self.memory_budget_mb:
+            return 0
+        rss = process_rss_mb()
+        if rss is None or rss <= self.memory_budget_mb:
+            return 0
+        now = time.monotonic()
+        current = self.host.currentIndex()
+        candidates = sorted(
+            (e.hidden_since, i) for i, e in enumerate(self._entries)
+            if e.widget is not None and i != current and now - e.hidden_since >= self.evict_after_s)
+        evicted = 0
+        for _, i in candidates:
+            if not self.evict(i):
+                continue
+            evicted += 1
+            rss = process_rss_mb()
+            if rss is not None and rss <= self.memory_budget_mb:
+                break
+        return evicted
+
+    # ----- Bericht -----
+
+    def stats(self) -> list[dict]:
+        return [{"page": e.title, "built": e.widget is not None, "builds": e.builds,
+                 "build_ms": round(e.build_ms, 2)} for e in self._entries]
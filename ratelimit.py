@@ -0,0 +1,205 @@
+# ratelimit.py
+from __future__ import annotations
+import json, os, threading, time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+# ---------------- Token bucket ----------------
+
+class TokenBucket:
+    def __init__(self, capacity: float, refill_per_s: float):
+        self.capacity = capacity
+        self.refill_per_s = refill_per_s
+        self.tokens = capacity
+        self.stamp = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.refill_per_s)
+        self.stamp = now
+
+    def take(self, now: Optional[float] = None) -> bool:
+        self._refill(now or time.monotonic())
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def full(self, now: Optional[float] = None) -> bool:
+        self._refill(now or time.monotonic())
+        return self.tokens >= self.capacity
+
+# ---------------- Login limiter ----------------
+
+class LoginLimiter:
+    """Fehlversuche im Speicher, Protokoll als Append-only-Journal.
+
+    Ein Fehlversuch kostet eine angehängte Zeile statt eines Rewrites der
+    Benutzerdatei. Das Journal wird beim Zugriff inkrementell nachgelesen
+    (auch Einträge anderer Prozesse) und ab compact_every Zeilen auf einen
+    Schnappschuss der noch relevanten Zähler eingedampft.
+
+    Zeilenformat (JSON): ["F"|"O", user, ts, pid] bzw. ["S", user, failed, lock_until];
+    ein Schnappschuss beginnt mit ["C", time_ns, pid].
+
+    Anhängen und Kompaktieren laufen unter einer Dateisperre (<journal>.lock),
+    damit keine Zeile eines anderen Prozesses zwischen Lesen und Ersetzen
+    verloren geht.
+    """
+
+    def __init__(self, path: Path, max_failed: int, lock_minutes: float,
+                 user_rate: tuple = (5, 0.5), process_rate: tuple = (20, 2.0),
+                 compact_every: int = 500):
+        self.path = path
+        self.lock_path = path.with_name(path.name + ".lock")
+        self.max_failed = max_failed
+        self.lock_seconds = lock_minutes * 60
+        self.user_rate = user_rate          # (Kapazität, Tokens/s) pro Benutzername
+        self.compact_every = compact_every
+        self._state: Dict[str, list] = {}   # user -> [failed, lock_until]
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._process_bucket = TokenBucket(*process_rate)
+        self._offset = 0
+        self._ident = None
+        self._lines = 0
+        self._base = 0                      # Zeilen direkt nach der letzten Kompaktierung
+        self._lock = threading.RLock()
+
+    # ----- Journal -----
+
+    def _apply(self, rec: list):
+        kind, user = rec[0], rec[1]
+        if kind == "C":
+            return
+        if kind == "S":
+            self._state[user] = [int(rec[2]), float(rec[3])]
+            return
+        st = self._state.setdefault(user, [0, 0.0])
+        if kind == "O":
+            st[0], st[1] = 0, 0.0
+        elif kind == "F":
+            ts = float(rec[2])
+            if st[1] and ts < st[1]:
+                return  # Versuch während einer Sperre zählt nicht
+            st[0] += 1
+            if st[0] >= self.max_failed:
+                st[0], st[1] = 0, ts + self.lock_seconds
+
+    def _sync(self):
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            self._state.clear()
+            self._offset, self._ident, self._lines = 0, None, 0
+            return
+        with f:
+            # fstat statt stat: Identität und Inhalt stammen sicher aus derselben Datei,
+            # auch wenn ein anderer Prozess sie gerade ersetzt. Inode-Nummern werden
+            # nach os.replace wiederverwendet -> erste Zeile gehört zur Identität
+            st = os.fstat(f.fileno())
+            ident = (st.st_dev, st.st_ino, f.readline(128))
+            if ident != self._ident or st.st_size < self._offset:
+                # Datei wurde (von uns oder anderen) kompaktiert -> komplett neu lesen
+                self._state.clear()
+                self._offset, self._ident, self._lines, self._base = 0, ident, 0, 0
+            if st.st_size == self._offset:
+                return
+            f.seek(self._offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1     # unvollständige letzte Zeile später lesen
+        for line in data[:end].splitlines():
+            try:
+                self._apply(json.loads(line))
+            except (ValueError, IndexError, TypeError):
+                continue
+            self._lines += 1
+        self._offset += end
+
+    @contextmanager
+    def _file_lock(self):
+        # Prozessübergreifend, exklusiv; Anhängen ist selten genug
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.name == "nt":
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            else:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if os.name == "nt":
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+    def _append(self, rec: list):
+        line = (json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._file_lock():
+            # Erst unter der Sperre öffnen: nach einer Kompaktierung die neue Datei
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+
+    def compact(self):
+        with self._lock, self._file_lock():
+            self._sync()
+            now = time.time()
+            keep = [["C", time.time_ns(), os.getpid()]]
+            keep += [["S", u, f, l] for u, (f, l) in self._state.items() if f or l > now]
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                for rec in keep:
+                    f.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
+            os.replace(tmp, self.path)
+            self._ident = None  # erzwingt Neuaufbau aus dem Schnappschuss
+            self._sync()
+            self._base = self._lines
+
+    # ----- API -----
+
+    def status(self, username: str) -> tuple[int, float]:
+        with self._lock:
+            self._sync()
+            failed, lock_until = self._state.get(username, (0, 0.0))
+            return failed, lock_until
+
+    def check(self, username: str, now: Optional[float] = None) -> tuple[bool, str]:
+        """Vor der Passwortprüfung: Sperre und Drosselung prüfen (keine KDF-Kosten)."""
+        now = now or time.time()
+        with self._lock:
+            self._sync()
+            _, lock_until = self._state.get(username, (0, 0.0))
+            if lock_until and now < lock_until:
+                mins = int((lock_until - now) // 60) + 1
+                return False, f"Konto gesperrt. Bitte in {mins} Min. erneut versuchen."
+            if not self._process_bucket.take():
+                return False, "Zu viele Anmeldeversuche. Bitte kurz warten."
+            bucket = self._buckets.get(username)
+            if bucket is None:
+                if len(self._buckets) > 1000:
+                    self._buckets = {u: b for u, b in self._buckets.items() if not b.full()}
+                bucket = self._buckets[username] = TokenBucket(*self.user_rate)
+            if not bucket.take():
+                return False, "Zu viele Anmeldeversuche. Bitte kurz warten."
+            return True, ""
+
+    def record(self, username: str, ok: bool, now: Optional[float] = None):
+        now = now or time.time()
+        with self._lock:
+            self._sync()
+            st = self._state.get(username)
+            if ok and not (st and (st[0] or st[1])):
+                return  # nichts zurückzusetzen -> nichts schreiben
+            rec = ["O" if ok else "F", username, round(now, 3), os.getpid()]
+            self._append(rec)
+            self._sync()
+            if self._lines - self._base >= self.compact_every:
+                self.compact()
@@ -0,0 +1,83 @@
+# search_box.py
+from __future__ import annotations
+import time
+
+from PySide6.QtCore import QModelIndex, Qt, QTimer, Signal
+from PySide6.QtGui import QStandardItem, QStandardItemModel
+from PySide6.QtWidgets import QCompleter, QLineEdit
+
+from data_store import data_store
+from workers import data_pool, submit
+
+KIND_LABEL = {"client": "Kunde", "invoice": "Rechnung", "domain": "Domain", "contract": "Vertrag"}
+
+class SearchBox(QLineEdit):
+    """Globale Suche im Header: entprellt, Abfrage im Daten-Pool, Treffer als Popup.
+
+    Überholte Antworten (der Nutzer hat weitergetippt) werden verworfen.
+    """
+
+    resultActivated = Signal(str, int, str)     # Art, id, Titel
+    searched = Signal(str, int, float)          # Text, Treffer, Latenz in ms
+
+    MIN_CHARS = 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("SearchBox")
+        self.setPlaceholderText("Suchen (Kunden, Rechnungen, Domains, Verträge) …")
+        self.setClearButtonEnabled(True)
+        self.setMinimumWidth(320)
+        self._model = QStandardItemModel(self)
+        self._completer = QCompleter(self._model, self)
+        # Kein setCompleter(): der Text im Feld soll beim Auswählen stehen bleiben
+        self._completer.setWidget(self)
+        self._completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self._completer.setMaxVisibleItems(12)
+        self._completer.activated[QModelIndex].connect(self._activated)
+        self._gen = 0
+        self._task = None
+        self._debounce = QTimer(self); self._debounce.setSingleShot(True); self._debounce.setInterval(150)
+        self._debounce.timeout.connect(self._query)
+        self.textEdited.connect(self._debounce.start)
+        self.returnPressed.connect(self._query)
+
+    def _query(self):
+        self._debounce.stop()
+        text = self.text().strip()
+        self._gen += 1
+        if self._task is not None:
+            self._task.cancel()
+        if len(text) < self.MIN_CHARS:
+            self._model.clear(); self._completer.popup().hide()
+            return
+        gen, t0 = self._gen, time.perf_counter()
+        self._task = submit(lambda: data_store().search(text), pool=data_pool(),
+                            on_done=lambda rows: self._show(gen, text, rows, t0),
+                            on_error=lambda msg: self._failed(gen, msg))
+
+    def _show(self, gen: int, text: str, rows: list, t0: float):
+        if gen != self._gen:
+            return
+        self._task = None
+        self.setToolTip("")
+        self.searched.emit(text, len(rows), (time.perf_counter() - t0) * 1000)
+        self._model.clear()
+        for kind, ref, title, body in rows:
+            item = QStandardItem(f"{KIND_LABEL[kind]} · {title}" + (f"  —  {body}" if body.strip() else ""))
+            item.setData(kind, Qt.UserRole); item.setData(ref, Qt.UserRole + 1); item.setData(title, Qt.UserRole + 2)
+            self._model.appendRow(item)
+        if rows:
+            self._completer.complete()
+        else:
+            self._completer.popup().hide()
+
+    def _failed(self, gen: int, msg: str):
+        if gen != self._gen:
+            return
+        self._task = None
+        self._model.clear(); self._completer.popup().hide()
+        self.setToolTip(f"Suche fehlgeschlagen: {msg}")
+
+    def _activated(self, index: QModelIndex):
+        self.resultActivated.emit(index.data(Qt.UserRole), index.data(Qt.UserRole + 1), index.data(Qt.UserRole + 2))
@@ -0,0 +1,97 @@
+# session.py
+from __future__ import annotations
+import time
+from typing import Callable, Optional
+
+from PySide6.QtCore import QEvent, QObject, QTimer, Signal
+from PySide6.QtWidgets import QApplication, QDialog, QMainWindow
+
+from auth import load_config, save_config, revoke_remember_token
+from login_dialog import LoginDialog
+from tracing import span
+
+# ---------------- Session manager ----------------
+
+def clear_remember_token():
+    cfg = load_config()
+    cfg.pop("remember_user", None)
+    token = cfg.pop("remember_token", None)
+    save_config(cfg)
+    if token:
+        revoke_remember_token(token)
+
+
+class SessionManager(QObject):
+    """Login → Hauptfenster → Logout → Login im selben Prozess.
+
+    Beim Logout werden nur das Fenster (samt Seiten) und das Remember-Token
+    verworfen; QApplication, Asset-Cache, Auth-Store und geladene Module
+    bleiben warm. relogin_ms hält die Zeit vom Logout bis zum neuen Fenster.
+    """
+
+    windowShown = Signal(object)    # neues Hauptfenster
+    loggedOut = Signal()
+
+    def __init__(self, app: QApplication, window_factory: Callable[[str], QMainWindow],
+                 auto_login: Optional[Callable[[], Optional[str]]] = None,
+                 parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.app = app
+        self.window_factory = window_factory
+        self.auto_login = auto_login
+        self.window: Optional[QMainWindow] = None
+        self.username: Optional[str] = None
+        self.relogin_ms: list[float] = []
+        self._logout_t0: Optional[float] = None
+        # Zwischen Logout und Login gibt es kurz kein sichtbares Fenster
+        app.setQuitOnLastWindowClosed(False)
+
+    def start(self, username: Optional[str] = None):
+        if username:
+            self.open(username)
+        else:
+            self.prompt(auto=False)     # Auto-Login wurde schon versucht
+
+    def prompt(self, auto: bool = True):
+        # Wie früher nach dem Neustart: erst Auto-Login, sonst Dialog
+        username = self.auto_login() if auto and self.auto_login else None
+        if not username:
+            dlg = LoginDialog()
+            with span("session.login_dialog"):
+                accepted = dlg.exec() == QDialog.Accepted
+            if not accepted:
+                self.app.quit()
+                return
+            username = getattr(dlg, "username", "unbekannt")
+        self.open(username)
+
+    def open(self, username: str):
+        with span("session.open_window", user=username):
+            win = self.window_factory(username)
+            win.logoutRequested.connect(self.logout)
+            win.installEventFilter(self)
+            self.window, self.username = win, username
+            win.show()
+        if self._logout_t0 is not None:
+            self.relogin_ms.append(round((time.perf_counter() - self._logout_t0) * 1000, 2))
+            self._logout_t0 = None
+        self.windowShown.emit(win)
+
+    def logout(self):
+        self._logout_t0 = time.perf_counter()
+        with span("session.logout", user=self.username):
+            clear_remember_token()
+            win, self.window, self.username = self.window, None, None
+            if win is not None:
+                win.removeEventFilter(self)
+                win.close()
+                win.deleteLater()
+        self.loggedOut.emit()
+        # Erst nach dem Abbau des alten Fensters neu anmelden
+        QTimer.singleShot(0, self.prompt)
+
+    def eventFilter(self, obj, event):
+        # Fenster vom Benutzer geschlossen (kein Logout) -> App beenden
+        if obj is self.window and event.type() == QEvent.Close:
+            QTimer.singleShot(0, self.app.quit)
+        return False
@@ -0,0 +1,142 @@
+# stall_watchdog.py
+from __future__ import annotations
+import bisect, logging, os, sys, threading, time, traceback
+from pathlib import Path
+from typing import Optional
+
+from PySide6.QtCore import QObject, Qt, QTimer, Signal
+
+from tracing import instant
+
+log = logging.getLogger("da.watchdog")
+
+# Obergrenzen der Histogramm-Buckets in ms (letzter Bucket: alles darüber)
+BUCKETS_MS = (1, 2, 4, 8, 16, 33, 50, 100, 250, 500, 1000)
+
+# ---------------- Stall watchdog ----------------
+
+class StallWatchdog(QObject):
+    """Heartbeat auf dem Qt-Event-Loop plus Wächter-Thread.
+
+    Der GUI-Thread setzt alle heartbeat_ms einen Zeitstempel. Bleibt er länger
+    als threshold_ms aus, nimmt der Wächter den Python-Stack des GUI-Threads
+    auf; sobald der Loop wieder läuft, wird der Stall mit Dauer geloggt.
+    Die Verspätung jedes Heartbeats landet im Latenz-Histogramm.
+
+    Muss im GUI-Thread erzeugt werden.
+    """
+
+    stallDetected = Signal(float, str)      # Dauer in ms, Stack
+
+    def __init__(self, threshold_ms: float = 50, heartbeat_ms: int = 10,
+                 log_path: Optional[Path] = None, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000
+        self.heartbeat = heartbeat_ms / 1000
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.max_latency_ms = 0.0
+        self.stalls: list[tuple[float, float, str]] = []   # (Zeitpunkt, Dauer ms, Stack)
+        self._gui_ident = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._pending: Optional[tuple[float, str]] = None   # (Beginn, Stack)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setInterval(heartbeat_ms)
+        self._timer.timeout.connect(self._beat)
+        if log_path is not None and not any(isinstance(h, logging.FileHandler) for h in log.handlers):
+            handler = logging.FileHandler(log_path, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+            log.addHandler(handler)
+            log.setLevel(logging.INFO)
+
+    # ----- Steuerung -----
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._timer.start()
+        self._thread = threading.Thread(target=self._watch, name="da-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._timer.stop()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None
+
+    # ----- GUI-Thread -----
+
+    def _beat(self):
+        now = time.monotonic()
+        with self._lock:
+            late_ms = max(0.0, (now - self._last_beat - self.heartbeat) * 1000)
+            self._last_beat = now
+            self.counts[bisect.bisect_left(BUCKETS_MS, late_ms)] += 1
+            self.max_latency_ms = max(self.max_latency_ms, late_ms)
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            start, stack = pending
+            duration_ms = (now - start) * 1000
+            self.stalls.append((time.time(), duration_ms, stack))
+            del self.stalls[:-50]
+            log.warning("Event-Loop blockiert für %.0f ms\n%s", duration_ms, stack)
+            instant("watchdog.stall", ms=round(duration_ms, 1))
+            self.stallDetected.emit(duration_ms, stack)
+
+    # ----- Wächter-Thread -----
+
+    def _watch(self):
+        interval = max(0.005, self.threshold / 4)
+        while not self._stop.wait(interval):
+            with self._lock:
+                last, pending = self._last_beat, self._pending
+            if pending is None and time.monotonic() - last > self.threshold:
+                frame = sys._current_frames().get(self._gui_ident)
+                stack = "".join(traceback.format_stack(frame)) if frame else "(kein Stack)"
+                with self._lock:
+                    if self._last_beat == last:
+                        self._pending = (last, stack)
+
+    # ----- Auswertung -----
+
+    def histogram(self) -> list[tuple[str, int]]:
+        labels = [f"≤ {b} ms" for b in BUCKETS_MS] + [f"> {BUCKETS_MS[-1]} ms"]
+        with self._lock:
+            return list(zip(labels, self.counts))
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = sum(self.counts)
+        return {"beats": total, "stalls": len(self.stalls), "max_latency_ms": round(self.max_latency_ms, 1)}
+
+
+_watchdog: Optional[StallWatchdog] = None
+
+def watchdog() -> Optional[StallWatchdog]:
+    return _watchdog
+
+def start_from_config(cfg: dict, log_path: Optional[Path] = None) -> Optional[StallWatchdog]:
+    """Opt-in über DA_WATCHDOG=1|<ms> oder config.json "watchdog_ms"."""
+    global _watchdog
+    env = os.getenv("DA_WATCHDOG")
+    threshold = cfg.get("watchdog_ms")
+    if env:
+        try:
+            threshold = 50 if env == "1" else float(env)
+        except ValueError:
+            log.warning("DA_WATCHDOG=%r ist keine Zahl – ignoriert", env)
+    if not threshold:
+        return None
+    if _watchdog is None:
+        _watchdog = StallWatchdog(float(threshold), log_path=log_path)
+        _watchdog.start()
+    return _watchdog
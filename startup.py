@@ -0,0 +1,95 @@
+# startup.py
+from __future__ import annotations
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Optional
+
+from PySide6.QtCore import QThread, QTimer
+
+from tracing import span
+
+# ---------------- Startup orchestrator ----------------
+
+class Startup:
+    """Führt unabhängige Start-Schritte (Datei-I/O, KDF, Bild-Decoding) in
+    Hintergrund-Threads aus, während der GUI-Thread Qt initialisiert.
+
+    Schritte werden per Name registriert und können auf andere warten
+    (after=...). when_ready() ruft einen Callback im GUI-Thread auf, sobald
+    die genannten Schritte fertig sind – statt nach einer festen Wartezeit.
+    """
+
+    def __init__(self, max_workers: int = 3):
+        # Qt-Hauptthread festnageln, bevor Worker QImage & Co. anfassen –
+        # sonst hält Qt den ersten Worker-Thread für den Hauptthread.
+        QThread.currentThread()
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="da-startup")
+        self.tasks: dict[str, Future] = {}
+        self.timings: dict[str, float] = {}
+        self._t0 = time.perf_counter()
+        self._pending: list[tuple[list, Callable, QTimer]] = []
+
+    def run(self, name: str, fn: Callable, *args, after: Iterable[str] = ()) -> Future:
+        deps = [self.tasks[d] for d in after]
+
+        def job():
+            # Abhängigkeiten wurden vorher eingereiht -> kein Deadlock im Pool
+            for d in deps:
+                d.result()
+            with span(f"startup.{name}"):
+                try:
+                    return fn(*args)
+                finally:
+                    self.timings[name] = round((time.perf_counter() - self._t0) * 1000, 2)
+
+        self.tasks[name] = self._pool.submit(job)
+        return self.tasks[name]
+
+    def result(self, name: str, timeout: Optional[float] = None):
+        return self.tasks[name].result(timeout)
+
+    def done(self, *names: str) -> bool:
+        return all(self.tasks[n].done() for n in names)
+
+    def error(self, name: str) -> Optional[BaseException]:
+        # Blockiert nie: None auch, solange der Schritt noch läuft
+        task = self.tasks[name]
+        return task.exception() if task.done() and not task.cancelled() else None
+
+    def when_ready(self, names: Iterable[str], callback: Callable,
+                   on_error: Optional[Callable[[str, BaseException], None]] = None, poll_ms: int = 5):
+        """callback(*results) im GUI-Thread, sobald alle Schritte fertig sind.
+
+        Ist ein Schritt fehlgeschlagen, kommt stattdessen on_error(name, exc);
+        ohne on_error wird die Ausnahme im Slot ausgelöst.
+        """
+        names = list(names)
+
+        def deliver():
+            if on_error is not None:
+                for n in names:
+                    exc = self.error(n)
+                    if exc is not None:
+                        on_error(n, exc)
+                        return
+            callback(*(self.result(n) for n in names))
+
+        if self.done(*names):
+            QTimer.singleShot(0, deliver)
+            return
+        timer = QTimer()
+        timer.setInterval(poll_ms)
+
+        def poll():
+            if self.done(*names):
+                timer.stop()
+                self._pending = [p for p in self._pending if p[2] is not timer]
+                deliver()
+
+        timer.timeout.connect(poll)
+        self._pending.append((names, callback, timer))
+        timer.start()
+
+    def shutdown(self):
+        # Nach dem Start nicht mehr gebraucht – Threads freigeben
+        self._pool.shutdown(wait=False, cancel_futures=True)
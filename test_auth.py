@@ -0,0 +1,82 @@
+# test_auth.py
+import json
+
+from auth import MAX_TOKENS_PER_USER, TokenIndex, User, UserStore
+
+
+def _user(name: str) -> User:
+    return User(name, {"algo": "pbkdf2_sha256", "hash": "x"}, ["user"])
+
+# ---------------- UserStore ----------------
+
+def test_user_store_reads_file_once(tmp_path):
+    store = UserStore(tmp_path / "users.json")
+    store.put(_user("anna"))
+    for _ in range(10):
+        assert store.get("anna").username == "anna"
+    assert store.stats() == {"hits": 10, "misses": 1, "writes": 1}
+
+
+def test_user_store_rereads_foreign_changes(tmp_path):
+    path = tmp_path / "users.json"
+    a, b = UserStore(path), UserStore(path)
+    a.put(_user("anna"))
+    assert b.get("anna") is not None
+    b.put(_user("ben"))
+    assert a.get("ben") is not None
+    assert a.stats()["misses"] == 2
+
+
+def test_transaction_writes_once(tmp_path):
+    store = UserStore(tmp_path / "users.json")
+    with store.transaction():
+        for i in range(50):
+            store.put(_user(f"u{i}"))
+        store.update_lockout("u1", 3, 0.0)
+        assert not store.path.exists()
+    assert store.stats()["writes"] == 1
+    assert len(json.loads(store.path.read_text(encoding="utf-8"))) == 50
+
+
+def test_transaction_rollback_discards_changes(tmp_path):
+    store = UserStore(tmp_path / "users.json")
+    store.put(_user("anna"))
+    try:
+        with store.transaction():
+            store.put(_user("ben"))
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert store.get("ben") is None
+    assert store.stats()["writes"] == 1
+
+# ---------------- Remember-Tokens ----------------
+
+def test_token_verify_and_expiry(tmp_path):
+    idx = TokenIndex(tmp_path / "tokens.json")
+    idx.issue("anna", "t1", ttl_days=1, now=1000.0)
+    assert idx.verify("anna", "t1", now=1000.0 + 3600)
+    assert not idx.verify("ben", "t1", now=1000.0 + 3600)
+    assert not idx.verify("anna", "t1", now=1000.0 + 86400)
+    # Abgelaufen wird beim Prüfen entfernt – auch für andere Prozesse
+    assert not TokenIndex(idx.path).verify("anna", "t1", now=1000.0)
+
+
+def test_token_revoke(tmp_path):
+    idx = TokenIndex(tmp_path / "tokens.json")
+    idx.issue("anna", "t1"); idx.issue("anna", "t2"); idx.issue("ben", "t3")
+    assert idx.revoke("t1")
+    assert not idx.revoke("t1")
+    assert not idx.verify("anna", "t1")
+    assert idx.revoke_user("anna") == 1
+    assert not idx.verify("anna", "t2")
+    assert idx.verify("ben", "t3")
+
+
+def test_token_limit_per_user(tmp_path):
+    idx = TokenIndex(tmp_path / "tokens.json")
+    for i in range(MAX_TOKENS_PER_USER + 2):
+        idx.issue("anna", f"t{i}", now=1000.0 + i)
+    now = 1000.0 + 10
+    assert not idx.verify("anna", "t0", now=now) and not idx.verify("anna", "t1", now=now)
+    assert all(idx.verify("anna", f"t{i}", now=now) for i in range(2, MAX_TOKENS_PER_USER + 2))
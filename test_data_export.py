@@ -0,0 +1,70 @@
+# test_data_export.py
+import csv
+import zipfile
+from xml.etree import ElementTree as ET
+
+from data_export import CsvWriter, Exporter, XlsxWriter
+from data_store import data_store
+
+NS = {"m": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+# ---------------- CSV ----------------
+
+def test_csv_escapes_formulas(tmp_path):
+    path = tmp_path / "out.csv"
+    w = CsvWriter(path, ["Name", "Betrag", "Anzahl"], ["text", "money", "int"])
+    w.write([("=HYPERLINK(\"x\")", 123456, -5), ("+49 30 123", None, 0), ("-Rabatt", -250, None),
+             ("@SUM(A1)", 1, 1), ("\tTab", 1, 1), ("Normal", 1, 1), (None, 1, 1)])
+    w.close()
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.reader(f, delimiter=";"))
+    assert rows[0] == ["Name", "Betrag", "Anzahl"]
+    assert [r[0] for r in rows[1:]] == ["'=HYPERLINK(\"x\")", "'+49 30 123", "'-Rabatt", "'@SUM(A1)",
+                                        "'\tTab", "Normal", ""]
+    # Zahlenspalten bleiben Zahlen
+    assert [r[1:] for r in rows[1:4]] == [["1234,56", "-5"], ["", "0"], ["-2,50", ""]]
+
+# ---------------- XLSX ----------------
+
+def _sheets(path):
+    with zipfile.ZipFile(path) as z:
+        names = [s.get("name") for s in ET.fromstring(z.read("xl/workbook.xml")).iter(f"{{{NS['m']}}}sheet")]
+        rows = [[[c.findtext(".//m:t", namespaces=NS) or c.findtext("m:v", namespaces=NS) for c in r]
+                 for r in ET.fromstring(z.read(f"xl/worksheets/sheet{i}.xml")).iter(f"{{{NS['m']}}}row")]
+                for i in range(1, len(names) + 1)]
+    return names, rows
+
+
+def test_xlsx_splits_sheets(tmp_path):
+    path = tmp_path / "out.xlsx"
+    w = XlsxWriter(path, ["Nr", "Text"], ["int", "text"], "Kunden")
+    w.MAX_ROWS = 4
+    w.write([(i, f"t{i}\x01") for i in range(5)])
+    w.write([(i, f"t{i}") for i in range(5, 10)])
+    w.close()
+    names, sheets = _sheets(path)
+    assert names == ["Kunden 1", "Kunden 2", "Kunden 3", "Kunden 4"]
+    # Jedes Blatt mit eigener Überschrift, höchstens MAX_ROWS Zeilen
+    assert [len(s) for s in sheets] == [4, 4, 4, 2]
+    assert all(s[0] == ["Nr", "Text"] for s in sheets)
+    assert [r[0] for s in sheets for r in s[1:]] == [str(i) for i in range(10)]
+    assert sheets[0][1][1] == "t0"          # Steuerzeichen entfernt
+
+
+def test_xlsx_single_sheet_keeps_title(tmp_path):
+    path = tmp_path / "out.xlsx"
+    w = XlsxWriter(path, ["Nr"], ["int"], "Rechnungen")
+    w.write([(1,), (2,)])
+    w.close()
+    assert _sheets(path)[0] == ["Rechnungen"]
+
+# ---------------- Exporter ----------------
+
+def test_export_clients_csv(data_dir):
+    data_store().upsert_clients([{"number": f"K{i}", "name": "=1+1" if i == 3 else f"Firma {i}"} for i in range(7)])
+    path = data_dir / "kunden.csv"
+    st = Exporter("clients", path, columns=["number", "name"], block=3).run()
+    assert st.rows == 7 and path.exists() and not path.with_name("kunden.csv.part").exists()
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.reader(f, delimiter=";"))
+    assert len(rows) == 8 and ["K3", "'=1+1"] in rows
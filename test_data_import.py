@@ -0,0 +1,67 @@
+# test_data_import.py
+import pytest
+
+from data_import import Importer, parse_amount
+from data_store import data_store
+
+# ---------------- Beträge ----------------
+
+@pytest.mark.parametrize("text, cents", [
+    ("1.234,56", 123456),
+    ("1.500", 150000),          # Tausenderpunkt ohne Komma
+    ("1.5", 150),
+    ("12.345.678", 1234567800),
+    ("1234.56", 123456),
+    ("1,234.56", 123456),       # englische Schreibweise
+    ("1234,5 €", 123450),
+    ("EUR 7", 700),
+    ("-12,30", -1230),
+    ("1\xa0000,00", 100000),
+    ("0,005", 1),               # kaufmännisch gerundet
+])
+def test_parse_amount(text, cents):
+    assert parse_amount(text) == cents
+
+
+@pytest.mark.parametrize("text", ["", " € ", "inf", "nan", "1e400", "1,2,3", "abc"])
+def test_parse_amount_rejects(text):
+    with pytest.raises(ValueError):
+        parse_amount(text)
+
+# ---------------- Abbrechen / Fortsetzen ----------------
+
+def _write_clients(path, n, bad=()):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("Kundennummer;Name;Ort\n")
+        for i in range(n):
+            f.write(f"K{i};{'' if i in bad else f'Firma {i}'};Berlin\n")
+
+
+def test_cancel_and_resume(data_dir):
+    path = data_dir / "kunden.csv"
+    _write_clients(path, 2000, bad={5, 1500})
+    first = Importer("clients", path, chunk=250, workers=1)
+    first.run(lambda *_: first.cancel())
+    cp = first.checkpoint()
+    assert cp and cp["rows"] == 500 and cp["line"] == 501
+    assert data_store().counters()["clients"] == 499
+
+    st = Importer("clients", path, chunk=250, workers=1).run()
+    assert not st.cancelled
+    assert (st.resumed_at, st.resumed_rows, st.rows) == (501, 500, 2000)
+    assert (st.imported, st.errors) == (1998, 2)
+    assert data_store().counters()["clients"] == 1998
+    # Fehlerdatei enthält beide Läufe, der Prüfpunkt ist nach dem Ende weg
+    assert (data_dir / "kunden.fehler.csv").read_text(encoding="utf-8").count("\n") == 3
+    assert first.checkpoint() is None
+
+
+def test_changed_file_starts_over(data_dir):
+    path = data_dir / "kunden.csv"
+    _write_clients(path, 1000)
+    imp = Importer("clients", path, chunk=250, workers=1)
+    imp.run(lambda *_: imp.cancel())
+    assert imp.checkpoint() is not None
+    _write_clients(path, 1001)
+    st = Importer("clients", path, chunk=250, workers=1).run()
+    assert (st.resumed_at, st.rows) == (0, 1001)
@@ -0,0 +1,101 @@
+# test_data_store.py
+import pytest
+
+from data_store import DataStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = DataStore(tmp_path / "studio.db")
+    yield s
+    s.close()
+
+
+def _ids(store, numbers):
+    return dict(store.query(f"SELECT number, id FROM clients WHERE number IN ({','.join('?' * len(numbers))})",
+                            numbers))
+
+
+def _clients(store, n):
+    store.upsert_clients([{"number": f"K{i}", "name": f"Firma {i}", "city": "Berlin"} for i in range(n)])
+    return _ids(store, [f"K{i}" for i in range(n)])
+
+
+def _invoices(store, rows):
+    # Per SQL statt über einen Store-Helfer: prüft nur die Trigger
+    with store.transaction() as db:
+        db.executemany(
+            "INSERT INTO invoices (number, client_id, kind, status, amount_cents, issued_at, updated_at) "
+            "VALUES (:number, :client_id, :kind, :status, :amount_cents, 1.0, 1.0) "
+            "ON CONFLICT(number) DO UPDATE SET status = excluded.status, amount_cents = excluded.amount_cents",
+            [{"kind": "client", "status": "open", **r} for r in rows])
+
+# ---------------- Zähler ----------------
+
+def test_counters_follow_upserts_and_deletes(store):
+    ids = _clients(store, 3)
+    _invoices(store, [
+        {"number": "R1", "client_id": ids["K0"], "amount_cents": 1000},
+        {"number": "R2", "client_id": ids["K1"], "amount_cents": 250},
+        {"number": "R3", "client_id": ids["K1"], "amount_cents": 99, "kind": "own"},
+    ])
+    assert store.counters() == {"clients": 3, "invoices_open_client": 2, "invoices_open_client_cents": 1250,
+                                "invoices_open_own": 1, "domains_available": 0}
+    # Upsert auf bestehende Nummer: Status- und Betragswechsel über den UPDATE-Trigger
+    _invoices(store, [{"number": "R1", "client_id": ids["K0"], "amount_cents": 1000, "status": "paid"},
+                      {"number": "R2", "client_id": ids["K1"], "amount_cents": 300}])
+    _clients(store, 3)
+    c = store.counters()
+    assert (c["clients"], c["invoices_open_client"], c["invoices_open_client_cents"]) == (3, 1, 300)
+    # Kaskade: Rechnungen von K1 verschwinden mit dem Kunden
+    with store.transaction() as db:
+        db.execute("DELETE FROM clients WHERE id = ?", (ids["K1"],))
+    c = store.counters()
+    assert (c["clients"], c["invoices_open_client"], c["invoices_open_own"]) == (2, 0, 0)
+    assert store.rebuild_counters(fix=False) == {}
+
+
+def test_domain_check_counter(store):
+    store.save_domain_checks({"a.de": "available", "b.de": "taken", "c.de": "available"}, 100.0)
+    assert store.counters()["domains_available"] == 2
+    # Erneute Prüfung überschreibt (UPSERT, kein REPLACE ohne DELETE-Trigger)
+    store.save_domain_checks({"a.de": "available", "c.de": "taken"}, 200.0)
+    assert store.counters()["domains_available"] == 1
+    store.save_domain_checks({"d.de": "available"}, 300.0, expire_before=150.0)
+    assert store.counters()["domains_available"] == 2
+    assert store.rebuild_counters(fix=False) == {}
+
+
+def test_rebuild_counters_repairs_drift(store):
+    _clients(store, 4)
+    with store.transaction() as db:
+        db.execute("UPDATE counters SET value = 99 WHERE name = 'clients'")
+    assert store.rebuild_counters() == {"clients": (99, 4)}
+    assert store.counters()["clients"] == 4
+    assert store.rebuild_counters(fix=False) == {}
+
+# ---------------- Volltextsuche ----------------
+
+def test_search_ranks_title_hits_first(store):
+    store.upsert_clients([
+        {"number": "K1", "name": "Muster GmbH", "city": "Berlin"},
+        {"number": "K2", "name": "Berliner Bau", "city": "Hamburg"},
+        {"number": "K3", "name": "Berlin Bau", "city": "Köln"},
+    ])
+    ids = _ids(store, ["K1", "K2", "K3"])
+    # Ganzes Wort im Titel, dann Präfix im Titel, dann Zusatz
+    assert [ref for _, ref, _, _ in store.search("berlin")] == [ids["K3"], ids["K2"], ids["K1"]]
+    kind, ref, title, body = store.search("muster")[0]
+    assert (kind, ref, title) == ("client", ids["K1"], "K1 Muster GmbH")
+    assert store.client_number(ref) == "K1"
+    assert store.search("  ") == []
+
+
+def test_search_falls_back_above_rank_limit(store, monkeypatch):
+    monkeypatch.setattr(store, "RANK_LIMIT", 5)
+    store.upsert_clients([{"number": f"K{i}", "name": f"Alpha Beta Gamma {i} GmbH"} for i in range(20)]
+                         + [{"number": "K99", "name": "GmbH"}])
+    rows = store.search("gmbh", limit=8)
+    assert len(rows) == 8 and len({ref for _, ref, _, _ in rows}) == 8
+    # Ersatzrangfolge (_score): kürzester Titel zuerst
+    assert rows[0][2] == "K99 GmbH"
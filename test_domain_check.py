@@ -0,0 +1,80 @@
+# test_domain_check.py
+import asyncio
+import socket
+import threading
+
+import pytest
+
+from domain_check import (
+    AVAILABLE, INVALID, TAKEN, UNKNOWN, DomainChecker, RdapResolver, ResultCache, rdap_tlds, serve_stub,
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture(scope="module")
+def stub_url():
+    port = _free_port()
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(serve_stub(port, latency_ms=0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            break
+        except OSError:
+            threading.Event().wait(0.02)
+    yield url
+
+    async def _shutdown():
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run_coroutine_threadsafe(_shutdown(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+def _resolver(url: str) -> RdapResolver:
+    return RdapResolver(url, timeout=5, bootstrap_url=url + "/dns.json")
+
+
+def _taken(tld: str) -> str:
+    # Stub: ungerade Bytesumme ohne »frei« ist vergeben
+    return next(n for n in (f"x{i}.{tld}" for i in range(10)) if sum(n.encode()) % 2)
+
+
+def test_bootstrap_from_stub(stub_url):
+    assert rdap_tlds(stub_url + "/dns.json") == {"com", "net", "eu", "io", "org"}
+
+
+def test_rdap_status_mapping(stub_url):
+    r = _resolver(stub_url)
+    check = lambda name: asyncio.run(r.check(name))
+    assert check("frei.com") == AVAILABLE
+    assert check(_taken("com")) == TAKEN
+    # 404 ohne RDAP-Dienst für die TLD (.de) heißt nicht frei
+    assert check("frei.de") == UNKNOWN
+    assert check(_taken("de")) == TAKEN
+
+
+def test_rdap_unreachable_is_unknown():
+    r = RdapResolver(f"http://127.0.0.1:{_free_port()}", timeout=1, tlds=["com"])
+    assert asyncio.run(r.check("frei.com")) == UNKNOWN
+
+
+def test_checker_against_stub(stub_url):
+    checker = DomainChecker(_resolver(stub_url), ResultCache(3600, 3600, persist=False), per_registry=4)
+    taken = _taken("net")
+    res = checker.run(["frei.com", "frei.de", taken, "FREI.com", "nicht gültig"])
+    assert res.results == {"frei.com": AVAILABLE, "frei.de": UNKNOWN, taken: TAKEN, "nicht gültig": INVALID}
+    # Unbekannt wird nicht gecacht, der Rest schon
+    again = checker.run(["frei.com", taken, "frei.de"])
+    assert again.cached == 2 and again.checked == 1
@@ -0,0 +1,81 @@
+# test_ratelimit.py
+import json
+import multiprocessing
+
+from ratelimit import LoginLimiter
+
+
+def _limiter(path, **kw) -> LoginLimiter:
+    kw.setdefault("user_rate", (1e9, 1e9))
+    kw.setdefault("process_rate", (1e9, 1e9))
+    return LoginLimiter(path, 3, 5, **kw)
+
+
+def test_lockout_after_threshold(tmp_path):
+    lim = _limiter(tmp_path / "attempts.log")
+    for i in range(2):
+        lim.record("anna", False, now=1000.0 + i)
+    assert lim.check("anna", now=1002.0)[0]
+    lim.record("anna", False, now=1002.0)
+    ok, msg = lim.check("anna", now=1003.0)
+    assert not ok and "gesperrt" in msg
+    assert lim.status("anna") == (0, 1002.0 + 300)
+    # Versuche während der Sperre verlängern sie nicht
+    lim.record("anna", False, now=1100.0)
+    assert lim.status("anna") == (0, 1302.0)
+    assert lim.check("anna", now=1302.0)[0]
+
+
+def test_success_resets_counter(tmp_path):
+    lim = _limiter(tmp_path / "attempts.log")
+    lim.record("anna", False, now=1000.0)
+    lim.record("anna", True, now=1001.0)
+    assert lim.status("anna") == (0, 0.0)
+    # Erfolg ohne offene Fehlversuche schreibt nichts
+    lines = (tmp_path / "attempts.log").read_text(encoding="utf-8").count("\n")
+    lim.record("anna", True, now=1002.0)
+    assert (tmp_path / "attempts.log").read_text(encoding="utf-8").count("\n") == lines
+
+
+def test_journal_replay_in_other_instance(tmp_path):
+    path = tmp_path / "attempts.log"
+    a, b = _limiter(path), _limiter(path)
+    a.record("anna", False, now=1000.0)
+    b.record("anna", False, now=1001.0)
+    a.record("anna", False, now=1002.0)
+    assert b.status("anna") == (0, 1302.0)
+    assert _limiter(path).status("anna") == (0, 1302.0)
+
+
+def test_compaction_keeps_state(tmp_path):
+    path = tmp_path / "attempts.log"
+    lim = _limiter(path, compact_every=10)
+    other = _limiter(path)
+    other.status("anna")
+    for i in range(25):
+        lim.record(f"u{i % 4}", False, now=float(10**10 + i))
+    lim.record("anna", False, now=float(10**10))
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert len(records) < 26
+    assert records[0][0] == "C"
+    expected = {f"u{i}": lim.status(f"u{i}") for i in range(4)} | {"anna": (1, 0.0)}
+    # Nach der Kompaktierung liest auch eine ältere Instanz korrekt neu
+    assert {u: other.status(u) for u in expected} == expected
+    assert {u: _limiter(path).status(u) for u in expected} == expected
+
+
+def _fail_many(path, user, n):
+    lim = LoginLimiter(path, 10**9, 5, user_rate=(1e9, 1e9), process_rate=(1e9, 1e9), compact_every=20)
+    for _ in range(n):
+        lim.record(user, False)
+
+
+def test_compaction_keeps_concurrent_appends(tmp_path):
+    path = tmp_path / "attempts.log"
+    procs = [multiprocessing.Process(target=_fail_many, args=(path, f"u{i}", 150)) for i in range(3)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    lim = LoginLimiter(path, 10**9, 5)
+    assert [lim.status(f"u{i}")[0] for i in range(3)] == [150, 150, 150]
@@ -0,0 +1,210 @@
+# theme.py
+"""Zentrales Theme: ein kompiliertes Stylesheet pro Variante (hell/dunkel/studio, Akzent).
+
+Widgets setzen nur noch objectName; das Stylesheet wird einmal pro Variante
+erzeugt, gecacht und auf Anwendungsebene gesetzt. Ein Theme-Wechsel ist damit
+ein einziges setStyleSheet() + Repolish statt eines pro Widget.
+
+    QT_QPA_PLATFORM=offscreen python theme.py --widgets 100 500 2000
+"""
+from __future__ import annotations
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import QApplication, QFrame, QLabel, QPushButton, QVBoxLayout, QWidget
+
+# ======= Theme / Farben =======
+ACCENT   = "#8B5CF6"
+BG_DARK  = "#0F172A"
+BG_PANEL = "#111827"
+FG_TEXT  = "#E5E7EB"
+FG_MUTED = "#9CA3AF"
+SUCCESS  = "#10B981"
+WARN     = "#F59E0B"
+ERROR    = "#EF4444"
+
+# Markenfarben des ausgelieferten Studios (app.py)
+STUDIO_ACCENT  = "#A8FF00"
+STUDIO_ACCENT2 = "#21C7F7"
+
+@dataclass(frozen=True)
+class Palette:
+    bg: str
+    panel: str
+    text: str
+    muted: str
+    border: str
+    field: str
+    field_border: str
+    field_focus: str
+    hover: str
+    accent2: str = ""       # gesetzt: Buttons mit Verlauf accent -> accent2
+    on_accent: str = "white"
+    font: str = ""          # gesetzt: Schrift für alle Widgets
+
+PALETTES = {
+    "dark": Palette(BG_DARK, BG_PANEL, FG_TEXT, FG_MUTED, "rgba(255,255,255,0.06)",
+                    "rgba(255,255,255,0.06)", "rgba(255,255,255,0.12)", "rgba(255,255,255,0.09)",
+                    "rgba(255,255,255,0.06)"),
+    "light": Palette("#F5F7FB", "#FFFFFF", "#111827", "#6B7280", "rgba(0,0,0,0.08)",
+                     "rgba(0,0,0,0.04)", "rgba(0,0,0,0.14)", "rgba(0,0,0,0.02)",
+                     "rgba(0,0,0,0.05)"),
+    "studio": Palette("#0E1116", "#141923", "#E8F0F2", "#8F9FB2", "#243041",
+                      "#141923", "#243041", "#18202C", "rgba(255,255,255,0.06)",
+                      accent2=STUDIO_ACCENT2, on_accent="#081015",
+                      font="font-family: 'Segoe UI', 'Inter', 'Roboto', sans-serif; font-size: 13px;"),
+}
+
+def _rgba(hex_color: str, alpha: float) -> str:
+    h = hex_color.lstrip("#")
+    r, g, b = int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16)
+    return f"rgba({r}, {g}, {b}, {alpha})"
+
+# ---------------- Compiler ----------------
+
+def _button(p: Palette, accent: str) -> str:
+    if p.accent2:
+        return (f"background: qlineargradient(x1:0,y1:0,x2:1,y2:0, stop:0 {accent}, stop:1 {p.accent2}); "
+                f"color: {p.on_accent}; font-weight: 600;")
+    return f"background-color: {_rgba(accent, 0.85)}; color: {p.on_accent};"
+
+@lru_cache(maxsize=None)
+def stylesheet(dark: bool = True, accent: str = ACCENT, variant: Optional[str] = None) -> str:
+    p = PALETTES[variant or ("dark" if dark else "light")]
+    button = _button(p, accent)
+    return (f"QWidget {{ {p.font} }}" if p.font else "") + f"""
+        QMainWindow {{ background-color: {p.bg}; }}
+        QFrame#Sidebar {{ background-color: {p.panel}; border-right: 1px solid {p.border}; }}
+        QFrame#MainArea {{ background-color: {p.bg}; }}
+        QFrame#Header {{ background-color: {p.panel}; border: 1px solid {p.border}; border-radius: 12px; }}
+        QMenuBar, QMenu {{ background-color: {p.panel}; color: {p.text}; }}
+        QMenu::item:selected {{ background: {_rgba(accent, 0.15)}; }}
+
+        QLabel#AppTitle {{ color: {p.text}; font-size: 18px; font-weight: 700; }}
+        QLabel#HeaderTitle {{ color: {p.text}; font-size: 16px; font-weight: 600; }}
+        QLabel#PageHeader {{ color: {p.text}; font-size: 20px; font-weight: 600; padding: 4px 8px; }}
+        QLabel#PageBody {{ color: {p.muted}; font-size: 14px; padding: 8px; }}
+        QLabel#PanelTitle {{ color: {p.muted}; font-size: 13px; }}
+        QLabel#Histogram {{ color: {p.text}; font-family: monospace; font-size: 12px; padding: 8px; }}
+
+        QPushButton#SideButton {{ color: {p.text}; background-color: transparent; border: none; text-align: left; padding: 8px 12px; border-radius: 8px; font-size: 14px; }}
+        QPushButton#SideButton:hover {{ background-color: {p.hover}; }}
+        QPushButton#SideButton:checked {{ background-color: {_rgba(accent, 0.18)}; border: 1px solid {_rgba(accent, 0.45)}; }}
+
+        QFrame#StatsCard, QFrame#Placeholder {{ background-color: {p.panel}; border: 1px solid {p.border}; border-radius: 12px; }}
+        QLabel#CardTitle {{ color: {p.muted}; font-size: 12px; letter-spacing: 0.5px; }}
+        QLabel#CardValue {{ color: {p.text}; font-size: 28px; font-weight: 600; }}
+
+        QLineEdit#FilterEdit, QPlainTextEdit#FilterEdit, QLineEdit#SearchBox {{ background: {p.field}; border: 1px solid {p.field_border}; border-radius: 8px; padding: 8px 10px; color: {p.text}; }}
+        QLineEdit#FilterEdit:focus, QPlainTextEdit#FilterEdit:focus, QLineEdit#SearchBox:focus {{ border: 1px solid {_rgba(accent, 0.65)}; background: {p.field_focus}; }}
+        QTableView#DataTable {{ background-color: {p.panel}; alternate-background-color: {p.bg}; color: {p.text}; border: 1px solid {p.border}; border-radius: 8px; gridline-color: {p.border}; selection-background-color: {_rgba(accent, 0.25)}; selection-color: {p.text}; }}
+        QTableView#DataTable QHeaderView::section {{ background-color: {p.panel}; color: {p.muted}; border: none; border-bottom: 1px solid {p.border}; padding: 6px 8px; }}
+
+        QMainWindow QWidget {{ color: {p.text}; }}
+        QTabWidget::pane {{ border: none; }}
+        QTabBar::tab {{ color: {p.muted}; background: transparent; padding: 8px 14px; border-bottom: 2px solid transparent; }}
+        QTabBar::tab:selected {{ color: {p.text}; border-bottom-color: {accent}; }}
+        QMainWindow QPushButton {{ {button} border: none; border-radius: 8px; padding: 8px 12px; }}
+        QMainWindow QPushButton:hover {{ background-color: {_rgba(accent, 1.0)}; }}
+        QMainWindow QPushButton:disabled {{ background: {p.field}; color: {p.muted}; }}
+        QMainWindow QLineEdit, QMainWindow QComboBox, QMainWindow QTextEdit {{ background: {p.field}; border: 1px solid {p.field_border}; border-radius: 6px; padding: 8px 10px; color: {p.text}; }}
+
+        QDialog {{ background-color: {p.bg}; }}
+        QDialog QFrame {{ background-color: {p.panel}; border: 1px solid {p.border}; border-radius: 12px; }}
+        QDialog QLabel#DialogTitle {{ color: {p.text}; font-size: 18px; font-weight: 600; }}
+        QDialog QLabel#DialogInfo, QDialog QLabel#FieldLabel {{ color: {p.muted}; font-size: 12px; }}
+        QDialog QLabel#ErrorLabel {{ color: #FCA5A5; font-size: 12px; }}
+        QDialog QRadioButton {{ color: {p.text}; font-size: 13px; }}
+        QDialog QLabel, QDialog QCheckBox {{ color: {p.text}; background: transparent; border: none; }}
+        QDialog QLabel#StatusLabel {{ color: {p.muted}; }}
+        QDialog QLineEdit {{
+            background: {p.field};
+            border: 1px solid {p.field_border};
+            border-radius: 8px;
+            padding: 8px 10px;
+            color: {p.text};
+        }}
+        QDialog QLineEdit:focus {{
+            border: 1px solid {_rgba(accent, 0.65)};
+            background: {p.field_focus};
+        }}
+        QDialog QPushButton {{
+            {button}
+            border: none;
+            border-radius: 8px;
+            padding: 8px 12px;
+        }}
+        QDialog QPushButton:hover {{ background-color: {_rgba(accent, 1.0)}; }}
+        QDialog QPushButton:disabled {{ background: {p.field}; color: {p.muted}; }}
+    """
+
+# ---------------- Engine ----------------
+
+class ThemeEngine:
+    def __init__(self):
+        self.current: Optional[tuple] = None
+        self.last_switch_ms = 0.0
+        self._font_set = False
+
+    def apply(self, app, dark: bool = True, accent: str = ACCENT, variant: Optional[str] = None) -> float:
+        """Setzt das Stylesheet der Variante auf app; liefert die Dauer in ms.
+
+        variant wählt eine Palette aus PALETTES direkt (z. B. "studio") statt über dark.
+        """
+        if self.current == (dark, accent, variant):
+            return 0.0
+        t0 = time.perf_counter()
+        if not self._font_set:
+            font = QFont(); font.setPointSize(10); app.setFont(font)
+            self._font_set = True
+        app.setStyleSheet(stylesheet(dark, accent, variant))
+        self.current = (dark, accent, variant)
+        self.last_switch_ms = (time.perf_counter() - t0) * 1000
+        return self.last_switch_ms
+
+engine = ThemeEngine()
+
+# ---------------- Messung ----------------
+
+def measure_switch(n_widgets: int, rounds: int = 5) -> dict:
+    """Dauer eines Theme-Wechsels mit n_widgets Karten/Buttons (inkl. Polish + Layout)."""
+    app = QApplication.instance() or QApplication([])
+    root = QWidget()
+    lay = QVBoxLayout(root)
+    for i in range(n_widgets):
+        if i % 2:
+            card = QFrame(); card.setObjectName("StatsCard")
+            cl = QVBoxLayout(card)
+            t = QLabel("TITEL"); t.setObjectName("CardTitle"); cl.addWidget(t)
+            v = QLabel(str(i)); v.setObjectName("CardValue"); cl.addWidget(v)
+            lay.addWidget(card)
+        else:
+            b = QPushButton(f"Button {i}"); b.setObjectName("SideButton"); b.setCheckable(True)
+            lay.addWidget(b)
+    root.show()
+    eng = ThemeEngine()
+    eng.apply(app, dark=True)
+    app.processEvents()
+    times = []
+    for r in range(rounds * 2):
+        t0 = time.perf_counter()
+        eng.apply(app, dark=bool(r % 2))
+        app.processEvents()
+        times.append((time.perf_counter() - t0) * 1000)
+    root.close()
+    root.deleteLater()
+    app.processEvents()
+    times.sort()
+    return {"widgets": n_widgets, "median_ms": round(times[len(times) // 2], 2), "max_ms": round(times[-1], 2)}
+
+if __name__ == "__main__":
+    import argparse, json
+    ap = argparse.ArgumentParser(description="Theme-Wechsel messen")
+    ap.add_argument("--widgets", type=int, nargs="+", default=[100, 500, 2000])
+    ap.add_argument("--rounds", type=int, default=5)
+    args = ap.parse_args()
+    for n in args.widgets:
+        print(json.dumps(measure_switch(n, args.rounds)))
@@ -0,0 +1,134 @@
+# tracing.py
+"""Leichtgewichtige Trace-Spans mit Export im Chrome-Trace-Event-Format.
+
+Aktivierung per Umgebungsvariable DA_TRACE=<datei.json> oder CLI-Flag
+--trace <datei.json>. Die Datei lässt sich in chrome://tracing oder
+https://ui.perfetto.dev laden. Ohne Aktivierung sind span()/traced()
+praktisch kostenlos (ein Flag-Check, geteiltes No-op-Objekt).
+"""
+from __future__ import annotations
+import atexit, functools, json, os, threading, time
+from pathlib import Path
+from typing import Optional
+
+_enabled = False
+_out_path: Optional[Path] = None
+_events: list = []
+_threads: dict = {}
+_lock = threading.Lock()
+_t0 = time.perf_counter_ns()
+
+# ---------------- Spans ----------------
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+_NULL = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name: str, args: dict):
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        _record({
+            "name": self.name, "ph": "X",
+            "ts": (self.start - _t0) / 1000, "dur": (end - self.start) / 1000,
+            "args": self.args,
+        })
+        return False
+
+    def set(self, **args):
+        self.args.update(args)
+
+
+def _record(ev: dict):
+    t = threading.current_thread()
+    ev["pid"] = os.getpid()
+    ev["tid"] = t.ident
+    with _lock:
+        _threads.setdefault(t.ident, t.name)
+        _events.append(ev)
+
+
+def enabled() -> bool:
+    return _enabled
+
+def span(name: str, **args):
+    if not _enabled:
+        return _NULL
+    return _Span(name, args)
+
+def instant(name: str, **args):
+    if _enabled:
+        _record({"name": name, "ph": "i", "s": "t", "ts": (time.perf_counter_ns() - _t0) / 1000, "args": args})
+
+def traced(name: Optional[str] = None):
+    """Decorator: Funktion als Span aufzeichnen (Name default: modul.funktion)."""
+    def deco(fn):
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*a, **kw):
+            if not _enabled:
+                return fn(*a, **kw)
+            with _Span(label, {}):
+                return fn(*a, **kw)
+        return wrapper
+    return deco
+
+# ---------------- Aktivierung / Export ----------------
+
+def enable(path: Optional[Path] = None):
+    global _enabled, _out_path
+    if path is not None:
+        _out_path = Path(path)
+    if not _enabled:
+        _enabled = True
+        atexit.register(export)
+
+def export(path: Optional[Path] = None) -> Optional[Path]:
+    path = Path(path) if path else _out_path
+    if path is None:
+        return None
+    with _lock:
+        meta = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": tname}}
+                for tid, tname in _threads.items()]
+        data = {"traceEvents": meta + list(_events), "displayTimeUnit": "ms"}
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return path
+
+def init_from_env(argv: Optional[list] = None) -> bool:
+    """DA_TRACE bzw. --trace <datei> auswerten; entfernt das Flag aus argv."""
+    path = os.getenv("DA_TRACE")
+    if argv is not None and "--trace" in argv:
+        i = argv.index("--trace")
+        if i + 1 < len(argv):
+            path = argv[i + 1]
+            del argv[i:i + 2]
+        else:
+            del argv[i]
+    if path:
+        enable(Path(path))
+        return True
+    return False
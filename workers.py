@@ -0,0 +1,109 @@
+# workers.py
+from __future__ import annotations
+import threading
+from typing import Callable, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+# ---------------- Hintergrund-Tasks (QThreadPool) ----------------
+#
+# Blockierende Arbeit (PBKDF2, Datei-I/O) darf nicht auf dem Qt-Event-Loop
+# laufen. Ein Task führt eine Funktion im Pool aus und meldet das Ergebnis
+# per Signal zurück; die Slots laufen wieder im GUI-Thread.
+
+class _TaskSignals(QObject):
+    finished = Signal(object)   # Rückgabewert der Funktion
+    failed = Signal(str)        # Fehlermeldung
+
+
+class Task(QRunnable):
+    def __init__(self, fn: Callable, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = _TaskSignals()
+        self._cancelled = threading.Event()
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._started = False
+
+    def cancel(self) -> bool:
+        """True, wenn die Funktion nie laufen wird.
+
+        Eine laufende KDF lässt sich nicht unterbrechen – das Ergebnis wird
+        verworfen und kein Signal mehr gesendet, ihre Wirkung (z. B. ein
+        gespeichertes Passwort) bleibt aber. Dann kommt False zurück.
+        """
+        with self._lock:
+            self._cancelled.set()
+            return not self._started
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def run(self):
+        try:
+            with self._lock:
+                if self.cancelled:
+                    return
+                self._started = True
+            try:
+                result = self.fn(*self.args, **self.kwargs)
+            except Exception as e:
+                if not self.cancelled:
+                    self.signals.failed.emit(str(e) or e.__class__.__name__)
+                return
+            if not self.cancelled:
+                self.signals.finished.emit(result)
+        finally:
+            self._done.set()
+
+
+_auth_pool: Optional[QThreadPool] = None
+
+def auth_pool() -> QThreadPool:
+    # Ein Thread genügt: Auth-Operationen schreiben users.json und sollen
+    # sich nicht gegenseitig überholen.
+    global _auth_pool
+    if _auth_pool is None:
+        _auth_pool = QThreadPool()
+        _auth_pool.setMaxThreadCount(1)
+    return _auth_pool
+
+
+_data_pool: Optional[QThreadPool] = None
+
+def data_pool() -> QThreadPool:
+    # Lesende Abfragen für Dashboard & Co. – getrennt vom globalen Pool,
+    # damit Asset-Rendering sie nicht ausbremst.
+    global _data_pool
+    if _data_pool is None:
+        _data_pool = QThreadPool()
+        _data_pool.setMaxThreadCount(2)
+    return _data_pool
+
+
+def submit(fn: Callable, *args, on_done: Optional[Callable] = None,
+           on_error: Optional[Callable] = None, pool: Optional[QThreadPool] = None,
+           **kwargs) -> Task:
+    task = Task(fn, *args, **kwargs)
+    if on_done:
+        task.signals.finished.connect(on_done)
+    if on_error:
+        task.signals.failed.connect(on_error)
+    (pool or QThreadPool.globalInstance()).start(task)
+    return task
+
+
+def submit_auth(fn: Callable, *args, **kwargs) -> Task:
+    return submit(fn, *args, pool=auth_pool(), **kwargs)